@@ -0,0 +1,164 @@
+import re
+from collections import deque
+from functools import lru_cache
+from typing import Dict, List, Any, Iterable, Tuple
+
+# Always rejected, whatever the brand profile says
+DEFAULT_BANNED_TERMS = ["fake", "scam", "guaranteed", "instant", "get rich quick"]
+
+# "Banned: a, b" / "Required terms: #ad" style lines inside free-text brand rules
+RULE_PATTERN = re.compile(
+    r"\b(banned|avoid|never use|required|must include|always include)(?:\s+(?:terms|words|phrases))?\s*:\s*([^\n.]+)",
+    re.IGNORECASE
+)
+REQUIRED_LABELS = {"required", "must include", "always include"}
+
+def _fold(text: str) -> Tuple[str, List[int]]:
+    """Lowercase text and collapse whitespace runs to one space
+
+    Returns the folded text and, for each of its characters, the index of
+    the original character it came from. Lowercasing goes character by
+    character because some characters (e.g. "İ") lower to two.
+    """
+    chars: List[str] = []
+    origins: List[int] = []
+    for index, char in enumerate(text):
+        if char.isspace():
+            if chars and chars[-1] == " ":
+                continue
+            char = " "
+        for lowered in char.lower():
+            chars.append(lowered)
+            origins.append(index)
+    return "".join(chars), origins
+
+def normalize_term(term: str) -> str:
+    """Lowercase a term and collapse internal whitespace"""
+    return _fold(term.strip().strip("\"'").strip())[0]
+
+def parse_brand_rules(brand_rules: str) -> Tuple[List[str], List[str]]:
+    """Extract banned and required terms from brand rules text"""
+    banned: List[str] = []
+    required: List[str] = []
+
+    for match in RULE_PATTERN.finditer(brand_rules or ""):
+        label = match.group(1).lower()
+        terms = [normalize_term(term) for term in re.split(r"[,;]", match.group(2))]
+        target = required if label in REQUIRED_LABELS else banned
+        target.extend(term for term in terms if term)
+
+    return banned, required
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+class ComplianceEngine:
+    """Aho-Corasick automaton over banned and required terms
+
+    Every caption is scanned once, left to right, and each whole-word
+    occurrence of any term is reported with its position.
+    """
+
+    def __init__(self, banned_terms: Iterable[str], required_terms: Iterable[str] = ()):
+        self.banned_terms = sorted({normalize_term(term) for term in banned_terms if normalize_term(term)})
+        self.required_terms = sorted({normalize_term(term) for term in required_terms if normalize_term(term)})
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[List[Tuple[str, str]]] = [[]]
+
+        for term in self.banned_terms:
+            self._add(term, "banned")
+        for term in self.required_terms:
+            self._add(term, "required")
+        self._build_failure_links()
+
+    def _add(self, term: str, kind: str):
+        """Insert a term into the trie"""
+        node = 0
+        for char in term:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            node = next_node
+        self._output[node].append((term, kind))
+
+    def _build_failure_links(self):
+        """Breadth-first pass linking each node to its longest proper suffix"""
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+
+                fallback = self._fail[node]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+
+                self._fail[child] = self._goto[fallback].get(char, 0)
+                self._output[child] = self._output[child] + self._output[self._fail[child]]
+
+    def scan(self, text: str) -> List[Dict[str, Any]]:
+        """Return every whole-word term occurrence, with offsets into the original text
+
+        The text is folded the same way as the terms, so case and runs of
+        whitespace do not affect matching.
+        """
+        text, origins = _fold(text)
+        goto, fail, output = self._goto, self._fail, self._output
+        matches = []
+        node = 0
+
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+
+            for term, kind in output[node]:
+                start = index - len(term) + 1
+                end = index + 1
+
+                # Only whole words: a term edge that is a word character
+                # must not sit next to another word character
+                if _is_word_char(term[0]) and start > 0 and _is_word_char(text[start - 1]):
+                    continue
+                if _is_word_char(term[-1]) and end < len(text) and _is_word_char(text[end]):
+                    continue
+
+                matches.append({
+                    "term": term, "kind": kind, "start": origins[start], "end": origins[end - 1] + 1
+                })
+
+        return matches
+
+    def check(self, caption: str) -> Dict[str, Any]:
+        """Check a caption for banned terms and missing required terms"""
+        matches = self.scan(caption)
+
+        banned = [match for match in matches if match["kind"] == "banned"]
+        found_required = {match["term"] for match in matches if match["kind"] == "required"}
+        missing_required = [term for term in self.required_terms if term not in found_required]
+
+        issues = []
+        if banned:
+            issues.append("Contains banned terms: " + ", ".join(sorted({match["term"] for match in banned})))
+        if missing_required:
+            issues.append("Missing required terms: " + ", ".join(missing_required))
+
+        return {
+            "status": "failed" if issues else "passed",
+            "issues": "; ".join(issues),
+            "matches": matches,
+            "missing_required": missing_required
+        }
+
+@lru_cache(maxsize=128)
+def get_compliance_engine(brand_rules: str) -> ComplianceEngine:
+    """Compile (once per distinct brand rules text) the engine for a brand profile"""
+    banned, required = parse_brand_rules(brand_rules)
+    return ComplianceEngine(DEFAULT_BANNED_TERMS + banned, required)
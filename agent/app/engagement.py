@@ -0,0 +1,160 @@
+import os
+from typing import Dict, List, Any, Iterable, Optional, Tuple
+import numpy as np
+from .ranking import parse_weights
+
+# Columns of the engagement matrix, shared by every platform
+ACTIONS = ("likes", "comments", "shares", "quotes", "saves")
+
+# Where each platform keeps each action in its post payloads
+FIELD_MAP = {
+    "x": {"likes": "like_count", "comments": "reply_count", "shares": "retweet_count", "quotes": "quote_count"},
+    "instagram": {"likes": "like_count", "comments": "comments_count", "saves": "saved"},
+    "linkedin": {"likes": "likes", "comments": "comments", "shares": "reposts"},
+}
+
+DEFAULT_WEIGHTS = {
+    "x": {"likes": 1.0, "comments": 1.5, "shares": 2.0, "quotes": 2.5, "saves": 0.0},
+    "instagram": {"likes": 1.0, "comments": 3.0, "shares": 0.0, "quotes": 0.0, "saves": 2.0},
+    "linkedin": {"likes": 1.0, "comments": 3.0, "shares": 2.0, "quotes": 0.0, "saves": 0.0},
+}
+
+# Typical weighted engagement of a post on each platform, used until enough
+# real posts have been seen to form a baseline
+DEFAULT_PRIORS = {"x": 25.0, "instagram": 250.0, "linkedin": 60.0}
+
+# Spread of log engagement assumed by the prior
+PRIOR_LOG_STD = 1.5
+
+def _counts(post: Dict[str, Any]) -> Dict[str, Any]:
+    """The dict holding a post's counters, whichever shape the platform uses"""
+    for key in ("public_metrics", "engagement"):
+        if isinstance(post.get(key), dict):
+            return post[key]
+    return post
+
+def engagement_matrix(posts: Iterable[Dict[str, Any]], platform: str) -> np.ndarray:
+    """Build an (n, len(ACTIONS)) float matrix of action counts from raw posts"""
+    fields = FIELD_MAP.get(platform, {action: action for action in ACTIONS})
+    columns = [fields.get(action) for action in ACTIONS]
+    rows = [
+        [(counts.get(field) or 0) if field else 0 for field in columns]
+        for counts in map(_counts, posts)
+    ]
+    return np.array(rows, dtype=np.float64).reshape(-1, len(ACTIONS))
+
+class EngagementScorer:
+    """Scores whole batches of posts against a rolling per-platform baseline
+
+    A post's raw engagement is the dot product of its action counts with
+    the platform's weight vector. Raw values are then placed against the
+    last ``baseline_size`` raw values seen on that platform, either as a
+    percentile (``method="percentile"``) or as a squashed z-score of
+    log engagement (``method="log"``). Until a platform has
+    ``min_baseline`` values, posts are scored on a log scale around a fixed
+    per-platform prior instead. Scores land in (0, 1) and keep rising
+    past the baseline's maximum, so very popular posts keep their order.
+    """
+
+    def __init__(
+        self,
+        weights: Optional[Dict[str, Dict[str, float]]] = None,
+        method: str = "percentile",
+        baseline_size: int = 10000,
+        min_baseline: int = 20,
+        priors: Optional[Dict[str, float]] = None
+    ):
+        if method not in ("percentile", "log"):
+            raise ValueError(f"Unknown normalization method: {method}")
+
+        weights = weights or DEFAULT_WEIGHTS
+        self.weights = {
+            platform: np.array([values.get(action, 0.0) for action in ACTIONS], dtype=np.float64)
+            for platform, values in weights.items()
+        }
+        self.method = method
+        self.baseline_size = baseline_size
+        self.min_baseline = min_baseline
+        self.priors = priors or DEFAULT_PRIORS
+        self._baselines: Dict[str, np.ndarray] = {}
+        self._sorted: Dict[str, np.ndarray] = {}
+        self._log_stats: Dict[str, Tuple[float, float]] = {}
+
+    @classmethod
+    def from_env(cls) -> "EngagementScorer":
+        """Build a scorer from environment settings (ENGAGEMENT_WEIGHTS_X='likes=1,shares=2', ...)"""
+        weights = {
+            platform: parse_weights(os.environ.get(f"ENGAGEMENT_WEIGHTS_{platform.upper()}", ""), defaults)
+            for platform, defaults in DEFAULT_WEIGHTS.items()
+        }
+        return cls(
+            weights=weights,
+            method=os.environ.get("ENGAGEMENT_NORMALIZATION", "percentile"),
+            baseline_size=int(os.environ.get("ENGAGEMENT_BASELINE_SIZE", "10000")),
+            min_baseline=int(os.environ.get("ENGAGEMENT_MIN_BASELINE", "20"))
+        )
+
+    def raw_scores(self, counts: np.ndarray, platform: str) -> np.ndarray:
+        """Weighted engagement for each row of an engagement matrix"""
+        weights = self.weights.get(platform)
+        if weights is None:
+            weights = np.ones(len(ACTIONS), dtype=np.float64)
+        return counts @ weights
+
+    def update_baseline(self, platform: str, raw: np.ndarray):
+        """Roll a sample of ``raw`` into the platform's baseline"""
+        if raw.size == 0:
+            return
+        # Stride-sample large batches so one refresh cannot dominate the baseline
+        step = max(1, raw.size // self.baseline_size)
+        sample = raw[::step][:self.baseline_size]
+
+        previous = self._baselines.get(platform)
+        combined = sample if previous is None else np.concatenate((previous, sample))
+        baseline = combined[-self.baseline_size:]
+
+        self._baselines[platform] = baseline
+        self._sorted[platform] = np.sort(baseline)
+        logs = np.log1p(baseline)
+        self._log_stats[platform] = (float(logs.mean()), float(logs.std()))
+
+    def normalize(self, raw: np.ndarray, platform: str) -> np.ndarray:
+        """Map raw engagement to (0, 1) against the platform's baseline"""
+        reference = self._sorted.get(platform)
+        if reference is None or reference.size < self.min_baseline:
+            # Too little history to rank against: log scale around the prior
+            z = (np.log1p(raw) - np.log1p(self.priors.get(platform, 10.0))) / PRIOR_LOG_STD
+            return 1.0 / (1.0 + np.exp(-z))
+
+        if self.method == "percentile":
+            # Past the baseline's maximum, climb the last rank step on a log scale
+            top = reference[-1]
+            headroom = 1.0 - np.exp(-np.maximum(np.log1p(raw) - np.log1p(top), 0.0))
+            return (np.searchsorted(reference, raw, side="right") + 1 + headroom) / (reference.size + 2)
+
+        mean, std = self._log_stats[platform]
+        z = (np.log1p(raw) - mean) / (std or 1.0)
+        return 1.0 / (1.0 + np.exp(-z))
+
+    def score_matrix(self, counts: np.ndarray, platform: str, update_baseline: bool = True) -> np.ndarray:
+        """Score an engagement matrix, optionally folding it into the baseline"""
+        raw = self.raw_scores(counts, platform)
+        scores = self.normalize(raw, platform)
+        if update_baseline:
+            self.update_baseline(platform, raw)
+        return scores
+
+    def score_posts(self, posts: List[Dict[str, Any]], platform: str, update_baseline: bool = True) -> List[float]:
+        """Score raw platform posts; returns one float per post"""
+        if not posts:
+            return []
+        return self.score_matrix(engagement_matrix(posts, platform), platform, update_baseline).tolist()
+
+    def score_post(self, post: Dict[str, Any], platform: str, update_baseline: bool = True) -> float:
+        """Score a single post; see score_posts"""
+        return self.score_posts([post], platform, update_baseline)[0]
+
+    def stats(self) -> Dict[str, Any]:
+        return {platform: int(baseline.size) for platform, baseline in self._baselines.items()}
+
+engagement_scorer = EngagementScorer.from_env()
@@ -1,9 +1,16 @@
-from typing import Dict, List, Any, TypedDict
+from typing import Dict, List, Any, AsyncIterator, Callable, Optional, TypedDict
 from langchain_openai import ChatOpenAI
 from langchain.schema import HumanMessage, SystemMessage
 import json
 import os
 import asyncio
+import time
+from .llm_cache import LLMResponseCache
+from .compliance import get_compliance_engine
+from .stage_cache import StageCache
+from .ranking import TrendRanker
+from .metrics import WORKFLOW_SECONDS, stage_timer, observe_llm_call
+from .tools.trend_sources import collect_trends as collect_from_sources, sources_from_env
 
 class AgentState(TypedDict):
     persona: str
@@ -26,6 +33,32 @@ class SocialMediaAgent:
         except Exception as e:
             print(f"Warning: OpenAI not configured: {e}")
             self.llm = None
+        
+        # Bounds for concurrent idea generation
+        self.llm_concurrency = max(1, int(os.environ.get("AGENT_LLM_CONCURRENCY", "4")))
+        self.llm_timeout = float(os.environ.get("AGENT_LLM_TIMEOUT", "30"))
+        
+        # Persistent cache of LLM responses keyed on model and prompts
+        self.llm_cache = LLMResponseCache.from_env() if self.llm else None
+        
+        # Memoized trend stages, refreshed in the background once stale
+        self.stage_cache = StageCache.from_env()
+        
+        # Multi-signal top-k trend ranking
+        self.ranker = TrendRanker.from_env()
+        self.top_k_trends = int(os.environ.get("AGENT_TOP_K_TRENDS", "5"))
+        rank_budget = os.environ.get("AGENT_RANK_TIME_BUDGET")
+        self.rank_time_budget = float(rank_budget) if rank_budget else None
+        
+        # Live trend sources; with none configured the mock seed trends are used
+        self.trend_sources = sources_from_env()
+        self.trend_topics = [
+            topic.strip()
+            for topic in os.environ.get("AGENT_TREND_TOPICS", "#AI,#CreatorEconomy,#SocialMedia").split(",")
+            if topic.strip()
+        ]
+        self.trend_limit = int(os.environ.get("AGENT_TREND_LIMIT", "20"))
+        self.trend_deadline = float(os.environ.get("AGENT_TREND_DEADLINE", "60"))
 
     def collect_trends(self, state: AgentState) -> AgentState:
         """Collect trending content from various sources"""
@@ -64,13 +97,130 @@ class SocialMediaAgent:
         return state
 
     def rank_trends(self, state: AgentState) -> AgentState:
-        """Rank trends using score-based sorting"""
+        """Rank trends by engagement, recency and source, keeping a diverse top-k"""
         trends = state["trending_seeds"]
         
-        # Simple ranking by score
-        ranked_trends = sorted(trends, key=lambda x: x["score"], reverse=True)
+        state["trending_seeds"] = self.ranker.top_k(
+            trends,
+            k=self.top_k_trends,
+            time_budget=self.rank_time_budget
+        )
+        return state
+
+    def _build_messages(self, persona: str, brand_rules: str, trend: Dict[str, Any]) -> List[Any]:
+        """Build the LLM prompt for a single trend"""
+        system_prompt = f"""
+                    Persona: {persona}
+                    Brand rules: {brand_rules}
+
+                    Create a social media post idea based on the trending topic.
+                    Make it engaging, actionable, and aligned with the brand persona.
+                    """
+        
+        return [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=f"Create content based on this trend: {trend['text']}")
+        ]
+
+    def _cache_key(self, messages: List[Any]) -> tuple:
+        """Cache key parts for an LLM call: model, temperature and both prompts"""
+        return (self.llm.model_name, self.llm.temperature, messages[0].content, messages[1].content)
+
+    def _cached_content(self, messages: List[Any]) -> Optional[str]:
+        """Look up a previously generated response"""
+        if not self.llm_cache:
+            return None
+        try:
+            return self.llm_cache.get(*self._cache_key(messages))
+        except Exception as e:
+            print(f"LLM cache read error: {e}")
+            return None
+
+    def _cache_content(self, messages: List[Any], content: str):
+        """Store a generated response for later runs"""
+        if not self.llm_cache:
+            return
+        try:
+            self.llm_cache.set(*self._cache_key(messages), content)
+        except Exception as e:
+            print(f"LLM cache write error: {e}")
+
+    def _mock_content(self, trend: Dict[str, Any]) -> str:
+        """Fallback mock content when no LLM is configured"""
+        return f"Engaging content about {trend['topic']} - {trend['text'][:50]}..."
+
+    def _build_idea(self, index: int, trend: Dict[str, Any], generated_content: str) -> Dict[str, Any]:
+        """Build an idea from generated content"""
+        return {
+            "id": index + 1,
+            "trend_id": trend["id"],
+            "title": f"Content idea: {trend['topic']}",
+            "summary": generated_content[:200] + "...",
+            "hook": f"Transform your strategy with {trend['topic']}",
+            "caption": generated_content,
+            "hashtags": [trend["topic"], "#ContentCreation", "#SocialMedia", "#AI", "#CreatorEconomy"],
+            "ai_type": "text",
+            "status": "draft"
+        }
+
+    def _fallback_idea(self, index: int, trend: Dict[str, Any]) -> Dict[str, Any]:
+        """Build a template idea when generation fails"""
+        return {
+            "id": index + 1,
+            "trend_id": trend["id"],
+            "title": f"Content idea: {trend['topic']}",
+            "summary": f"Create engaging content about {trend['topic']} based on current trends",
+            "hook": f"Discover the power of {trend['topic']}",
+            "caption": f"Here's what you need to know about {trend['topic']}: {trend['text']}",
+            "hashtags": [trend["topic"], "#ContentCreation", "#SocialMedia"],
+            "ai_type": "text",
+            "status": "draft"
+        }
+
+    async def acollect_live_trends(self) -> List[Dict[str, Any]]:
+        """Drain the configured trend sources concurrently"""
+        return await collect_from_sources(
+            self.trend_sources, self.trend_topics, self.trend_limit, self.trend_deadline
+        )
+    
+    async def acollect_trends(self, state: AgentState) -> AgentState:
+        """Collect trends from the live sources if configured, served from the stage cache when possible"""
+        if self.trend_sources:
+            compute = self.acollect_live_trends
+            inputs = {
+                "sources": [source.name for source in self.trend_sources],
+                "topics": self.trend_topics,
+                "limit": self.trend_limit
+            }
+        else:
+            def compute() -> List[Dict[str, Any]]:
+                return self.collect_trends(self._initial_state({}))["trending_seeds"]
+            inputs = {}
+        
+        if not self.stage_cache:
+            if not self.trend_sources:
+                return self.collect_trends(state)
+            state["trending_seeds"] = await compute()
+            return state
         
-        state["trending_seeds"] = ranked_trends[:5]  # Top 5 trends
+        state["trending_seeds"] = await self.stage_cache.get("collect_trends", inputs, compute)
+        return state
+
+    async def arank_trends(self, state: AgentState) -> AgentState:
+        """Rank trends, served from the stage cache when the input trends repeat"""
+        if not self.stage_cache:
+            return self.rank_trends(state)
+        
+        trends = state["trending_seeds"]
+        
+        def compute() -> List[Dict[str, Any]]:
+            ranking_state = self._initial_state({})
+            ranking_state["trending_seeds"] = trends
+            return self.rank_trends(ranking_state)["trending_seeds"]
+        
+        # Key on trend identity and score rather than hashing every trend body
+        inputs = [(trend.get("id"), trend.get("score")) for trend in trends]
+        state["trending_seeds"] = await self.stage_cache.get("rank_trends", inputs, compute)
         return state
 
     def generate_ideas(self, state: AgentState) -> AgentState:
@@ -83,60 +233,110 @@ class SocialMediaAgent:
         
         # Generate ideas for each trend
         for i, trend in enumerate(trends):
+            started = time.monotonic()
+            outcome = "ok"
             try:
                 if self.llm:
                     # Use OpenAI to generate content
-                    system_prompt = f"""
-                    Persona: {persona}
-                    Brand rules: {brand_rules}
-
-                    Create a social media post idea based on the trending topic.
-                    Make it engaging, actionable, and aligned with the brand persona.
-                    """
-                    
-                    messages = [
-                        SystemMessage(content=system_prompt),
-                        HumanMessage(content=f"Create content based on this trend: {trend['text']}")
-                    ]
+                    messages = self._build_messages(persona, brand_rules, trend)
+                    generated_content = self._cached_content(messages)
                     
-                    response = self.llm(messages)
-                    generated_content = response.content
+                    if generated_content is None:
+                        response = self.llm(messages)
+                        generated_content = response.content
+                        self._cache_content(messages, generated_content)
+                    else:
+                        outcome = "cache_hit"
                 else:
-                    # Fallback mock content
-                    generated_content = f"Engaging content about {trend['topic']} - {trend['text'][:50]}..."
+                    generated_content = self._mock_content(trend)
                 
-                idea = {
-                    "id": i + 1,
-                    "trend_id": trend["id"],
-                    "title": f"Content idea: {trend['topic']}",
-                    "summary": generated_content[:200] + "...",
-                    "hook": f"Transform your strategy with {trend['topic']}",
-                    "caption": generated_content,
-                    "hashtags": [trend["topic"], "#ContentCreation", "#SocialMedia", "#AI", "#CreatorEconomy"],
-                    "ai_type": "text",
-                    "status": "draft"
-                }
-                ideas.append(idea)
+                ideas.append(self._build_idea(i, trend, generated_content))
                 
             except Exception as e:
+                outcome = "error"
                 print(f"Error generating idea for trend {trend['id']}: {e}")
-                # Create fallback idea
-                idea = {
-                    "id": i + 1,
-                    "trend_id": trend["id"],
-                    "title": f"Content idea: {trend['topic']}",
-                    "summary": f"Create engaging content about {trend['topic']} based on current trends",
-                    "hook": f"Discover the power of {trend['topic']}",
-                    "caption": f"Here's what you need to know about {trend['topic']}: {trend['text']}",
-                    "hashtags": [trend["topic"], "#ContentCreation", "#SocialMedia"],
-                    "ai_type": "text",
-                    "status": "draft"
-                }
-                ideas.append(idea)
+                ideas.append(self._fallback_idea(i, trend))
+            finally:
+                if self.llm:
+                    observe_llm_call(outcome, time.monotonic() - started)
         
         state["ideas"] = ideas
         return state
 
+    async def _agenerate_idea(
+        self,
+        index: int,
+        trend: Dict[str, Any],
+        persona: str,
+        brand_rules: str,
+        semaphore: asyncio.Semaphore
+    ) -> Dict[str, Any]:
+        """Generate a single idea, falling back to a template on timeout or error"""
+        async with semaphore:
+            started = time.monotonic()
+            outcome = "ok"
+            try:
+                if self.llm:
+                    messages = self._build_messages(persona, brand_rules, trend)
+                    # The cache is SQLite; keep its disk I/O off the event loop
+                    generated_content = await asyncio.to_thread(self._cached_content, messages)
+                    
+                    if generated_content is None:
+                        response = await asyncio.wait_for(
+                            self.llm.ainvoke(messages),
+                            timeout=self.llm_timeout
+                        )
+                        generated_content = response.content
+                        await asyncio.to_thread(self._cache_content, messages, generated_content)
+                    else:
+                        outcome = "cache_hit"
+                else:
+                    generated_content = self._mock_content(trend)
+                
+                return self._build_idea(index, trend, generated_content)
+                
+            except asyncio.TimeoutError:
+                outcome = "timeout"
+                print(f"Timed out generating idea for trend {trend['id']} after {self.llm_timeout}s")
+                return self._fallback_idea(index, trend)
+            except Exception as e:
+                outcome = "error"
+                print(f"Error generating idea for trend {trend['id']}: {e}")
+                return self._fallback_idea(index, trend)
+            finally:
+                if self.llm:
+                    observe_llm_call(outcome, time.monotonic() - started)
+
+    async def aiter_ideas(
+        self,
+        state: AgentState,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Yield ideas in completion order while generating them concurrently"""
+        semaphore = semaphore or asyncio.Semaphore(self.llm_concurrency)
+        
+        tasks = [
+            asyncio.ensure_future(
+                self._agenerate_idea(i, trend, state["persona"], state["brand_rules"], semaphore)
+            )
+            for i, trend in enumerate(state["trending_seeds"])
+        ]
+        
+        try:
+            for next_idea in asyncio.as_completed(tasks):
+                yield await next_idea
+        finally:
+            # Stop outstanding LLM calls if the consumer goes away
+            for task in tasks:
+                task.cancel()
+
+    async def agenerate_ideas(self, state: AgentState) -> AgentState:
+        """Generate content ideas for all trends concurrently"""
+        ideas = [idea async for idea in self.aiter_ideas(state)]
+        
+        state["ideas"] = sorted(ideas, key=lambda idea: idea["id"])
+        return state
+
     def repurpose_content(self, state: AgentState) -> AgentState:
         """Repurpose content for different platforms"""
         ideas = state["ideas"]
@@ -196,21 +396,17 @@ class SocialMediaAgent:
         brand_rules = state["brand_rules"]
         repurposed_content = state["repurposed_content"]
         
-        # Simple compliance check
-        banned_terms = ["fake", "scam", "guaranteed", "instant", "get rich quick"]
+        # Compiled once per distinct brand rules text and reused across runs
+        engine = get_compliance_engine(brand_rules)
         
         for platform, contents in repurposed_content.items():
             for content in contents:
-                caption = content.get("caption", "").lower()
-                
-                # Check for banned terms
-                has_banned_terms = any(term in caption for term in banned_terms)
+                report = engine.check(content.get("caption", ""))
                 
-                if has_banned_terms:
-                    content["compliance_status"] = "failed"
-                    content["compliance_issues"] = "Contains banned terms"
-                else:
-                    content["compliance_status"] = "passed"
+                content["compliance_status"] = report["status"]
+                if report["status"] == "failed":
+                    content["compliance_issues"] = report["issues"]
+                    content["compliance_matches"] = report["matches"]
         
         state["repurposed_content"] = repurposed_content
         return state
@@ -245,55 +441,214 @@ class SocialMediaAgent:
         state["scheduled_posts"] = scheduled_posts
         return state
 
+    def _initial_state(self, input_data: Dict[str, Any]) -> AgentState:
+        """Build the initial workflow state from request input"""
+        return AgentState(
+            persona=input_data.get("persona", "AI assistant"),
+            brand_rules=input_data.get("brand_rules", "Be helpful and accurate"),
+            platform_targets=input_data.get("platforms", ["x", "instagram", "linkedin"]),
+            trending_seeds=[],
+            ideas=[],
+            repurposed_content={},
+            scheduled_posts=[],
+            error=""
+        )
+
+    def _workflow_result(self, state: AgentState) -> Dict[str, Any]:
+        """Shape the final workflow state into a response"""
+        return {
+            "ideas": state["ideas"],
+            "repurposed_content": state["repurposed_content"],
+            "scheduled_posts": state["scheduled_posts"],
+            "trending_context": state["trending_seeds"]
+        }
+
+    def _workflow_error(self, error: Exception) -> Dict[str, Any]:
+        """Shape a workflow failure into a response"""
+        print(f"Workflow error: {error}")
+        return {
+            "error": str(error),
+            "ideas": [],
+            "repurposed_content": {},
+            "scheduled_posts": []
+        }
+
     def run_workflow(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Run the complete workflow step by step"""
+        started = time.monotonic()
         try:
             # Initialize state
-            state = AgentState(
-                persona=input_data.get("persona", "AI assistant"),
-                brand_rules=input_data.get("brand_rules", "Be helpful and accurate"),
-                platform_targets=input_data.get("platforms", ["x", "instagram", "linkedin"]),
-                trending_seeds=[],
-                ideas=[],
-                repurposed_content={},
-                scheduled_posts=[],
-                error=""
-            )
+            state = self._initial_state(input_data)
             
             # Execute workflow steps
             print("🔍 Collecting trends...")
-            state = self.collect_trends(state)
+            with stage_timer("collect_trends"):
+                state = self.collect_trends(state)
             
             print("📊 Ranking trends...")
-            state = self.rank_trends(state)
+            with stage_timer("rank_trends"):
+                state = self.rank_trends(state)
             
             print("💡 Generating ideas...")
-            state = self.generate_ideas(state)
+            with stage_timer("generate_ideas"):
+                state = self.generate_ideas(state)
             
             print("🔄 Repurposing content...")
-            state = self.repurpose_content(state)
+            with stage_timer("repurpose_content"):
+                state = self.repurpose_content(state)
             
             print("✅ Checking compliance...")
-            state = self.compliance_guard(state)
+            with stage_timer("compliance_guard"):
+                state = self.compliance_guard(state)
             
             print("📅 Suggesting schedule...")
+            with stage_timer("scheduler_suggest"):
+                state = self.scheduler_suggest(state)
+            
+            return self._workflow_result(state)
+            
+        except Exception as e:
+            return self._workflow_error(e)
+        finally:
+            WORKFLOW_SECONDS.observe(time.monotonic() - started, mode="sync")
+
+    async def astream_stages(self, state: AgentState) -> AsyncIterator[Dict[str, Any]]:
+        """Run the workflow on a state, yielding each stage's output as it is ready"""
+        print("🔍 Collecting trends...")
+        with stage_timer("collect_trends"):
+            state = await self.acollect_trends(state)
+        
+        print("📊 Ranking trends...")
+        with stage_timer("rank_trends"):
+            state = await self.arank_trends(state)
+        yield {"event": "trends", "data": state["trending_seeds"]}
+        
+        async for event in self.astream_content_stages(state):
+            yield event
+
+    async def astream_content_stages(
+        self,
+        state: AgentState,
+        semaphore: Optional[asyncio.Semaphore] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Run the stages after trend ranking on a state that already has trends"""
+        print("💡 Generating ideas...")
+        ideas = []
+        with stage_timer("generate_ideas") as clock:
+            async for idea in self.aiter_ideas(state, semaphore):
+                ideas.append(idea)
+                # Time the consumer spends on the event is not stage time
+                with clock.paused():
+                    yield {"event": "idea", "data": idea}
+        state["ideas"] = sorted(ideas, key=lambda idea: idea["id"])
+        
+        print("🔄 Repurposing content...")
+        with stage_timer("repurpose_content"):
+            state = self.repurpose_content(state)
+        
+        print("✅ Checking compliance...")
+        with stage_timer("compliance_guard"):
+            state = self.compliance_guard(state)
+        yield {"event": "repurposed_content", "data": state["repurposed_content"]}
+        
+        print("📅 Suggesting schedule...")
+        with stage_timer("scheduler_suggest"):
             state = self.scheduler_suggest(state)
+        yield {"event": "schedule", "data": state["scheduled_posts"]}
+
+    async def astream_workflow(self, input_data: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        """Run the complete workflow as a stream of stage events"""
+        started = time.monotonic()
+        try:
+            state = self._initial_state(input_data)
             
-            return {
-                "ideas": state["ideas"],
-                "repurposed_content": state["repurposed_content"],
-                "scheduled_posts": state["scheduled_posts"],
-                "trending_context": state["trending_seeds"]
+            async for event in self.astream_stages(state):
+                yield event
+            
+            yield {
+                "event": "done",
+                "data": {
+                    "ideas_generated": len(state["ideas"]),
+                    "platforms_targeted": len(state["platform_targets"]),
+                    "scheduled_posts": len(state["scheduled_posts"])
+                }
             }
             
         except Exception as e:
-            print(f"Workflow error: {e}")
+            yield {"event": "error", "data": {"error": self._workflow_error(e)["error"]}}
+        finally:
+            WORKFLOW_SECONDS.observe(time.monotonic() - started, mode="stream")
+
+    async def arun_workflow(
+        self,
+        input_data: Dict[str, Any],
+        on_event: Optional[Callable[[Dict[str, Any]], None]] = None
+    ) -> Dict[str, Any]:
+        """Run the complete workflow with concurrent idea generation"""
+        started = time.monotonic()
+        try:
+            state = self._initial_state(input_data)
+            
+            async for event in self.astream_stages(state):
+                if on_event:
+                    on_event(event)
+            
+            return self._workflow_result(state)
+            
+        except Exception as e:
+            return self._workflow_error(e)
+        finally:
+            WORKFLOW_SECONDS.observe(time.monotonic() - started, mode="async")
+
+    async def arun_batch(self, jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Run many persona jobs against a single trend collection and ranking"""
+        started = time.monotonic()
+        try:
+            shared = self._initial_state({})
+            
+            try:
+                print(f"🔍 Collecting trends for batch of {len(jobs)}...")
+                with stage_timer("collect_trends"):
+                    shared = await self.acollect_trends(shared)
+                
+                print("📊 Ranking trends...")
+                with stage_timer("rank_trends"):
+                    shared = await self.arank_trends(shared)
+                
+            except Exception as e:
+                return self._workflow_error(e)
+            
+            trends = shared["trending_seeds"]
+            
+            # One LLM budget for the whole batch rather than one per job
+            semaphore = asyncio.Semaphore(self.llm_concurrency)
+            
+            async def run_job(job: Dict[str, Any]) -> Dict[str, Any]:
+                try:
+                    state = self._initial_state(job)
+                    state["trending_seeds"] = list(trends)
+                    
+                    async for _ in self.astream_content_stages(state, semaphore):
+                        pass
+                    
+                    result = self._workflow_result(state)
+                    del result["trending_context"]
+                    return result
+                    
+                except Exception as e:
+                    return self._workflow_error(e)
+            
+            results = await asyncio.gather(*[run_job(job) for job in jobs])
+            
             return {
-                "error": str(e),
-                "ideas": [],
-                "repurposed_content": {},
-                "scheduled_posts": []
+                "results": {
+                    job.get("job_id") or str(index): result
+                    for index, (job, result) in enumerate(zip(jobs, results))
+                },
+                "trending_context": trends
             }
+        finally:
+            WORKFLOW_SECONDS.observe(time.monotonic() - started, mode="batch")
 
 # Global agent instance
 agent = SocialMediaAgent()
@@ -307,3 +662,32 @@ def generate_content_ideas(persona: str, brand_rules: str, platforms: List[str])
     }
     
     return agent.run_workflow(input_data)
+
+async def agenerate_content_ideas(
+    persona: str,
+    brand_rules: str,
+    platforms: List[str],
+    on_event: Optional[Callable[[Dict[str, Any]], None]] = None
+) -> Dict[str, Any]:
+    """Generate content ideas without blocking the event loop"""
+    input_data = {
+        "persona": persona,
+        "brand_rules": brand_rules,
+        "platforms": platforms
+    }
+    
+    return await agent.arun_workflow(input_data, on_event=on_event)
+
+def astream_content_ideas(persona: str, brand_rules: str, platforms: List[str]) -> AsyncIterator[Dict[str, Any]]:
+    """Stream content idea generation stage by stage"""
+    input_data = {
+        "persona": persona,
+        "brand_rules": brand_rules,
+        "platforms": platforms
+    }
+    
+    return agent.astream_workflow(input_data)
+
+async def agenerate_content_ideas_batch(jobs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Generate content ideas for many personas sharing one trend fetch"""
+    return await agent.arun_batch(jobs)
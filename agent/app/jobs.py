@@ -0,0 +1,180 @@
+import os
+import time
+import uuid
+import asyncio
+from typing import Dict, Any, Optional, Callable, Awaitable, List
+
+# Progress reported once each stage event has been seen
+STAGE_PROGRESS = {
+    "trends": ("generate_ideas", 20),
+    "repurposed_content": ("scheduler_suggest", 85),
+    "schedule": ("scheduler_suggest", 100),
+}
+
+WorkflowRunner = Callable[[Dict[str, Any], Callable[[Dict[str, Any]], None]], Awaitable[Dict[str, Any]]]
+
+class QueueFullError(Exception):
+    """Raised when the job queue has no room for another workflow"""
+
+class WorkflowJobManager:
+    """Runs workflows on a bounded queue with a fixed pool of async workers"""
+
+    def __init__(self, runner: WorkflowRunner, workers: int = 4, max_queue_depth: int = 100, result_ttl: float = 3600):
+        self.runner = runner
+        self.workers = workers
+        self.max_queue_depth = max_queue_depth
+        self.result_ttl = result_ttl
+        self._jobs: Dict[str, Dict[str, Any]] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @classmethod
+    def from_env(cls, runner: WorkflowRunner) -> "WorkflowJobManager":
+        """Build a job manager from environment settings"""
+        return cls(
+            runner,
+            workers=max(1, int(os.environ.get("AGENT_JOB_WORKERS", "4"))),
+            max_queue_depth=max(1, int(os.environ.get("AGENT_JOB_QUEUE_DEPTH", "100"))),
+            result_ttl=float(os.environ.get("AGENT_JOB_RESULT_TTL", "3600"))
+        )
+
+    async def start(self):
+        """Start the worker pool"""
+        if self._tasks:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue_depth)
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """Cancel the workers; queued and running jobs are abandoned"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def submit(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Queue a workflow and return its job record immediately"""
+        if self._queue is None:
+            raise RuntimeError("Job manager is not running")
+
+        self._purge_expired()
+
+        workflow_id = uuid.uuid4().hex
+        job = {
+            "workflow_id": workflow_id,
+            "status": "queued",
+            "progress": 0,
+            "current_step": "collect_trends",
+            "submitted_at": time.time(),
+            "started_at": None,
+            "finished_at": None,
+            "stages": [],
+            "results": None,
+            "result": None,
+            "input": input_data,
+        }
+
+        try:
+            self._queue.put_nowait(workflow_id)
+        except asyncio.QueueFull:
+            raise QueueFullError(f"Workflow queue is full ({self.max_queue_depth} pending)")
+
+        self._jobs[workflow_id] = job
+        return self._public(job)
+
+    def get(self, workflow_id: str) -> Optional[Dict[str, Any]]:
+        """Return the current status of a job, or None if unknown or expired"""
+        self._purge_expired()
+        job = self._jobs.get(workflow_id)
+        return self._public(job) if job else None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return queue depth and job counts by status"""
+        counts: Dict[str, int] = {}
+        for job in self._jobs.values():
+            counts[job["status"]] = counts.get(job["status"], 0) + 1
+        return {
+            "queue_depth": self._queue.qsize() if self._queue else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "workers": len(self._tasks),
+            "jobs": counts
+        }
+
+    async def _worker(self):
+        """Pull workflow ids off the queue and run them"""
+        while True:
+            workflow_id = await self._queue.get()
+            try:
+                job = self._jobs.get(workflow_id)
+                if job:
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job: Dict[str, Any]):
+        """Run one workflow, recording stage progress and the final result"""
+        job["status"] = "running"
+        job["started_at"] = time.time()
+        tracker = {"ideas_total": 0, "ideas_done": 0}
+
+        def on_event(event: Dict[str, Any]):
+            self._record_event(job, tracker, event)
+
+        try:
+            result = await self.runner(job["input"], on_event)
+
+            if "error" in result:
+                job["status"] = "failed"
+                job["error"] = result["error"]
+            else:
+                job["status"] = "completed"
+                job["progress"] = 100
+                job["result"] = result
+                job["results"] = {
+                    "ideas_generated": len(result.get("ideas", [])),
+                    "platforms_targeted": len(job["input"].get("platforms", [])),
+                    "scheduled_posts": len(result.get("scheduled_posts", []))
+                }
+        except Exception as e:
+            print(f"Workflow {job['workflow_id']} failed: {e}")
+            job["status"] = "failed"
+            job["error"] = str(e)
+        finally:
+            job["finished_at"] = time.time()
+            job["input"] = None
+
+    def _record_event(self, job: Dict[str, Any], tracker: Dict[str, int], event: Dict[str, Any]):
+        """Update a job's progress from a workflow stage event"""
+        name = event["event"]
+        now = time.time()
+
+        if name == "trends":
+            tracker["ideas_total"] = len(event["data"])
+        if name == "idea":
+            tracker["ideas_done"] += 1
+            total = max(tracker["ideas_total"], 1)
+            job["current_step"] = "generate_ideas"
+            job["progress"] = 20 + int(60 * tracker["ideas_done"] / total)
+            return
+
+        if name in STAGE_PROGRESS:
+            job["current_step"], job["progress"] = STAGE_PROGRESS[name]
+            job["stages"].append({
+                "stage": name,
+                "completed_at": now,
+                "elapsed": round(now - job["started_at"], 3)
+            })
+
+    def _purge_expired(self):
+        """Drop finished jobs older than the result TTL"""
+        cutoff = time.time() - self.result_ttl
+        expired = [
+            workflow_id for workflow_id, job in self._jobs.items()
+            if job["finished_at"] is not None and job["finished_at"] < cutoff
+        ]
+        for workflow_id in expired:
+            del self._jobs[workflow_id]
+
+    def _public(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Job record without internal fields"""
+        return {key: value for key, value in job.items() if key != "input"}
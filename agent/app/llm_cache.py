@@ -0,0 +1,139 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Any, Optional
+
+class LLMResponseCache:
+    """SQLite-backed LLM response cache with LRU and TTL eviction"""
+
+    def __init__(self, path: str, max_entries: int = 5000, ttl_seconds: float = 86400):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_responses (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_llm_responses_last_accessed ON llm_responses (last_accessed)"
+        )
+
+    @classmethod
+    def from_env(cls) -> Optional["LLMResponseCache"]:
+        """Build the cache from environment settings, or None if disabled"""
+        if os.environ.get("AGENT_LLM_CACHE_ENABLED", "true").lower() != "true":
+            return None
+
+        try:
+            return cls(
+                path=os.environ.get("AGENT_LLM_CACHE_PATH", "data/llm_cache.db"),
+                max_entries=int(os.environ.get("AGENT_LLM_CACHE_MAX_ENTRIES", "5000")),
+                ttl_seconds=float(os.environ.get("AGENT_LLM_CACHE_TTL", "86400"))
+            )
+        except Exception as e:
+            print(f"Warning: LLM response cache disabled: {e}")
+            return None
+
+    @staticmethod
+    def make_key(model: str, temperature: float, system_prompt: str, human_prompt: str) -> str:
+        """Hash the prompt inputs into a stable cache key"""
+        payload = json.dumps([model, temperature, system_prompt, human_prompt], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, model: str, temperature: float, system_prompt: str, human_prompt: str) -> Optional[str]:
+        """Return a cached response, or None on a miss or expired entry"""
+        key = self.make_key(model, temperature, system_prompt, human_prompt)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created_at = row
+            if now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM llm_responses WHERE key = ?", (key,))
+                self.misses += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE llm_responses SET last_accessed = ? WHERE key = ?", (now, key)
+            )
+            self.hits += 1
+            return response
+
+    def set(self, model: str, temperature: float, system_prompt: str, human_prompt: str, response: str):
+        """Store a response and evict expired or least recently used entries"""
+        key = self.make_key(model, temperature, system_prompt, human_prompt)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, response, created_at, last_accessed) VALUES (?, ?, ?, ?)",
+                (key, response, now, now)
+            )
+            self._evict(now)
+
+    def _evict(self, now: float):
+        """Drop expired entries, then the least recently used beyond the size cap"""
+        self._conn.execute(
+            "DELETE FROM llm_responses WHERE created_at < ?", (now - self.ttl_seconds,)
+        )
+
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE key IN "
+                "(SELECT key FROM llm_responses ORDER BY last_accessed ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def clear(self):
+        """Remove all cached responses"""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size"""
+        with self._lock:
+            (size,) = self._conn.execute("SELECT COUNT(*) FROM llm_responses").fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "size": size,
+            "max_entries": self.max_entries,
+            "ttl_seconds": self.ttl_seconds
+        }
+
+    def close(self):
+        """Close the underlying SQLite connection"""
+        with self._lock:
+            self._conn.close()
@@ -1,11 +1,100 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from typing import List, Dict, Any, AsyncIterator, Callable, Optional
+from contextlib import asynccontextmanager
+import asyncio
+import json
 import os
 from .simple_agent import generate_content_ideas
+from .jobs import WorkflowJobManager, QueueFullError
+from .metrics import registry, start_request_timing
+from .tools.http_pool import http_pool
+from .tools.token_manager import token_manager
 
-app = FastAPI(title="Social Agent Service", version="1.0.0")
+try:
+    from .tools.trend_sources import collect_trends
+except ImportError as e:
+    # Trend scoring needs numpy, which the lightweight image does not install
+    print(f"Warning: live trend sources unavailable: {e}")
+    collect_trends = None
+
+try:
+    from .graph import agent, agenerate_content_ideas, agenerate_content_ideas_batch, astream_content_ideas
+except ImportError as e:
+    # LangChain is not installed in the lightweight (requirements_simple.txt) image
+    print(f"Warning: LangGraph workflow unavailable, using simple agent: {e}")
+    agent = None
+    agenerate_content_ideas = None
+    agenerate_content_ideas_batch = None
+    astream_content_ideas = None
+
+try:
+    from .tools.browser_pool import browser_pool
+except ImportError as e:
+    # Playwright is only installed where LinkedIn scraping runs
+    print(f"Warning: browser pool unavailable: {e}")
+    browser_pool = None
+
+MAX_BATCH_JOBS = int(os.environ.get("AGENT_BATCH_MAX_JOBS", "50"))
+
+# Requests carrying this header get a per-stage timing breakdown in the response
+DEBUG_TIMING_HEADER = "x-debug-timing"
+
+async def run_workflow_job(input_data: Dict[str, Any], on_event: Callable[[Dict[str, Any]], None]) -> Dict[str, Any]:
+    """Run one queued workflow, reporting stage events when the graph is available"""
+    if agenerate_content_ideas:
+        return await agenerate_content_ideas(on_event=on_event, **input_data)
+    return await asyncio.to_thread(generate_content_ideas, **input_data)
+
+job_manager = WorkflowJobManager.from_env(run_workflow_job)
+
+def service_gauges() -> Dict[str, float]:
+    """Point-in-time queue and cache figures for /metrics"""
+    stats = job_manager.stats()
+    gauges = {
+        "agent_job_queue_depth": stats["queue_depth"],
+        "agent_job_workers": stats["workers"],
+    }
+    for status in ("queued", "running", "completed", "failed"):
+        gauges[f"agent_jobs_{status}"] = stats["jobs"].get(status, 0)
+    
+    if agent and agent.llm_cache:
+        cache = agent.llm_cache.stats()
+        gauges.update({
+            "agent_llm_cache_hits": cache["hits"],
+            "agent_llm_cache_misses": cache["misses"],
+            "agent_llm_cache_entries": cache["size"],
+        })
+    if agent and agent.stage_cache:
+        cache = agent.stage_cache.stats()
+        gauges.update({
+            "agent_stage_cache_hits": cache["hits"],
+            "agent_stage_cache_stale_hits": cache["stale_hits"],
+            "agent_stage_cache_misses": cache["misses"],
+            "agent_stage_cache_entries": cache["size"],
+        })
+    return gauges
+
+registry.register_gauges(service_gauges)
+
+def debug_timing_requested(request: Request) -> bool:
+    return request.headers.get(DEBUG_TIMING_HEADER, "").lower() in ("1", "true", "yes")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await job_manager.start()
+    token_manager.start()
+    yield
+    await job_manager.stop()
+    await token_manager.stop()
+    if browser_pool:
+        # Browsers launch lazily on first scrape; close any that did
+        await browser_pool.stop()
+    await http_pool.aclose()
+
+app = FastAPI(title="Social Agent Service", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -22,6 +111,15 @@ class GenerateIdeasRequest(BaseModel):
     platforms: List[str]
     ai_type: str = "text"
 
+class BatchJob(BaseModel):
+    job_id: Optional[str] = None
+    persona: str
+    brand_rules: str
+    platforms: List[str]
+
+class BatchGenerateIdeasRequest(BaseModel):
+    jobs: List[BatchJob]
+
 class RefreshTrendsRequest(BaseModel):
     topics: List[str] = ["#AI", "#CreatorEconomy", "#SocialMedia"]
     max_per_topic: int = 5
@@ -34,28 +132,144 @@ def read_root():
 def health_check():
     return {"status": "healthy", "service": "agent"}
 
+@app.get("/metrics")
+def metrics_endpoint():
+    """Prometheus metrics for stages, LLM calls, platform clients and queues"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
 @app.post("/generate_ideas")
-async def generate_ideas_endpoint(request: GenerateIdeasRequest):
+async def generate_ideas_endpoint(request: GenerateIdeasRequest, http_request: Request):
     """Generate content ideas using LangGraph workflow"""
+    timings = start_request_timing() if debug_timing_requested(http_request) else None
+    
     try:
-        result = generate_content_ideas(
-            persona=request.persona,
-            brand_rules=request.brand_rules,
-            platforms=request.platforms
-        )
+        if agenerate_content_ideas:
+            result = await agenerate_content_ideas(
+                persona=request.persona,
+                brand_rules=request.brand_rules,
+                platforms=request.platforms
+            )
+        else:
+            result = await asyncio.to_thread(
+                generate_content_ideas,
+                persona=request.persona,
+                brand_rules=request.brand_rules,
+                platforms=request.platforms
+            )
         
         if "error" in result:
             raise HTTPException(status_code=500, detail=result["error"])
         
+        if timings is not None:
+            result = {**result, "timings": timings}
+        
         return result
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/generate_ideas/batch")
+async def generate_ideas_batch_endpoint(request: BatchGenerateIdeasRequest, http_request: Request):
+    """Generate ideas for many personas, collecting and ranking trends once"""
+    if not request.jobs:
+        raise HTTPException(status_code=400, detail="Batch must contain at least one job")
+    if len(request.jobs) > MAX_BATCH_JOBS:
+        raise HTTPException(status_code=400, detail=f"Batch is limited to {MAX_BATCH_JOBS} jobs")
+    
+    job_ids = [job.job_id for job in request.jobs if job.job_id]
+    if len(job_ids) != len(set(job_ids)):
+        raise HTTPException(status_code=400, detail="Duplicate job_id in batch")
+    
+    jobs = [job.model_dump() for job in request.jobs]
+    timings = start_request_timing() if debug_timing_requested(http_request) else None
+    
+    if agenerate_content_ideas_batch:
+        result = await agenerate_content_ideas_batch(jobs)
+    else:
+        results = await asyncio.gather(*[
+            asyncio.to_thread(generate_content_ideas, job["persona"], job["brand_rules"], job["platforms"])
+            for job in jobs
+        ])
+        result = {
+            "results": {job["job_id"] or str(index): value for index, (job, value) in enumerate(zip(jobs, results))}
+        }
+    
+    if "error" in result:
+        raise HTTPException(status_code=500, detail=result["error"])
+    
+    if timings is not None:
+        result["timings"] = timings
+    
+    return result
+
+async def simple_workflow_events(request: GenerateIdeasRequest) -> AsyncIterator[Dict[str, Any]]:
+    """Emit the simple agent's result as stage events"""
+    try:
+        result = await asyncio.to_thread(
+            generate_content_ideas,
+            persona=request.persona,
+            brand_rules=request.brand_rules,
+            platforms=request.platforms
+        )
+    except Exception as e:
+        yield {"event": "error", "data": {"error": str(e)}}
+        return
+    
+    yield {"event": "trends", "data": result["trending_context"]}
+    for idea in result["ideas"]:
+        yield {"event": "idea", "data": idea}
+    yield {"event": "repurposed_content", "data": result["repurposed_content"]}
+    yield {"event": "schedule", "data": result["scheduled_posts"]}
+    yield {
+        "event": "done",
+        "data": {
+            "ideas_generated": len(result["ideas"]),
+            "platforms_targeted": len(request.platforms),
+            "scheduled_posts": len(result["scheduled_posts"])
+        }
+    }
+
+def format_event(event: Dict[str, Any], sse: bool) -> str:
+    """Serialize a stage event as an SSE message or an NDJSON line"""
+    if sse:
+        return f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n"
+    return json.dumps(event) + "\n"
+
+@app.post("/generate_ideas/stream")
+async def generate_ideas_stream_endpoint(request: GenerateIdeasRequest, http_request: Request):
+    """Stream each workflow stage as NDJSON, or as SSE when the client accepts text/event-stream"""
+    sse = "text/event-stream" in http_request.headers.get("accept", "")
+    
+    if astream_content_ideas:
+        events = astream_content_ideas(
+            persona=request.persona,
+            brand_rules=request.brand_rules,
+            platforms=request.platforms
+        )
+    else:
+        events = simple_workflow_events(request)
+    
+    async def body() -> AsyncIterator[str]:
+        async for event in events:
+            yield format_event(event, sse)
+    
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/refresh_trends")
 async def refresh_trends_endpoint(request: RefreshTrendsRequest = None):
     """Refresh trending content from all platforms"""
+    request = request or RefreshTrendsRequest()
     try:
+        if collect_trends and agent and agent.trend_sources:
+            trends = await collect_trends(
+                agent.trend_sources, request.topics, request.max_per_topic, agent.trend_deadline
+            )
+            return {"trends": trends}
+        
         # Mock trends data for demo
         trends = [
             {
@@ -98,20 +312,27 @@ async def refresh_trends_endpoint(request: RefreshTrendsRequest = None):
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/workflows", status_code=202)
+async def submit_workflow(request: GenerateIdeasRequest):
+    """Queue an idea generation workflow and return its id immediately"""
+    try:
+        return job_manager.submit({
+            "persona": request.persona,
+            "brand_rules": request.brand_rules,
+            "platforms": request.platforms
+        })
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+
 @app.get("/workflow_status/{workflow_id}")
 async def get_workflow_status(workflow_id: str):
     """Get the status of a running workflow"""
-    return {
-        "workflow_id": workflow_id,
-        "status": "completed",
-        "progress": 100,
-        "current_step": "scheduler_suggest",
-        "results": {
-            "ideas_generated": 2,
-            "platforms_targeted": 3,
-            "scheduled_posts": 6
-        }
-    }
+    job = job_manager.get(workflow_id)
+    
+    if job is None:
+        raise HTTPException(status_code=404, detail="Workflow not found or expired")
+    
+    return job
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,262 @@
+import math
+import time
+import functools
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Any, Callable, Optional, Sequence, Tuple
+
+# Latency buckets in seconds, from a cache hit up to a slow LLM call
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Timings collected for the current request when debug timing is on
+_request_timings: ContextVar[Optional[List[Dict[str, Any]]]] = ContextVar("request_timings", default=None)
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{value}"' for name, value in zip(labelnames, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    value = float(value)
+    if math.isnan(value):
+        return "NaN"
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(value) if value != int(value) else str(int(value))
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Gauge:
+    """Point-in-time value with labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}")
+        return lines
+
+class Histogram:
+    """Cumulative-bucket histogram with labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+                self._series[key] = series
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][index] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    labels = _format_labels(self.labelnames, key, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {series['count']}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {_format_value(series['sum'])}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {series['count']}")
+        return lines
+
+class MetricsRegistry:
+    """Holds metrics plus callbacks that report point-in-time gauges"""
+
+    def __init__(self):
+        self._metrics: List[Any] = []
+        self._gauge_collectors: List[Callable[[], Dict[str, float]]] = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        metric = Gauge(name, documentation, labelnames)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_gauges(self, collector: Callable[[], Dict[str, float]]):
+        """Register a callback returning {metric_name: value} at scrape time"""
+        self._gauge_collectors.append(collector)
+
+    def render(self) -> str:
+        """Render every metric in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._gauge_collectors:
+            try:
+                gauges = collector()
+            except Exception as e:
+                print(f"Error collecting gauges: {e}")
+                continue
+            for name, value in gauges.items():
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+WORKFLOW_SECONDS = registry.histogram(
+    "agent_workflow_duration_seconds", "End-to-end workflow latency", ["mode"]
+)
+STAGE_SECONDS = registry.histogram(
+    "agent_stage_duration_seconds", "Latency of each workflow stage", ["stage"]
+)
+STAGE_ERRORS = registry.counter(
+    "agent_stage_errors_total", "Workflow stages that raised", ["stage"]
+)
+LLM_SECONDS = registry.histogram(
+    "agent_llm_call_duration_seconds", "Latency of LLM idea generation calls", ["outcome"]
+)
+CLIENT_SECONDS = registry.histogram(
+    "agent_client_call_duration_seconds", "Latency of platform client calls", ["platform", "operation"]
+)
+CLIENT_ERRORS = registry.counter(
+    "agent_client_errors_total", "Platform client calls that failed", ["platform", "operation"]
+)
+RATE_LIMIT_TOKENS = registry.gauge(
+    "agent_rate_limit_tokens", "Requests left in each platform account's budget", ["platform", "account"]
+)
+RATE_LIMIT_CAPACITY = registry.gauge(
+    "agent_rate_limit_capacity", "Size of each platform account's request budget", ["platform", "account"]
+)
+RATE_LIMIT_WAIT_SECONDS = registry.histogram(
+    "agent_rate_limit_wait_seconds", "Time calls spent queued for a rate-limit token", ["platform"]
+)
+RATE_LIMIT_THROTTLED = registry.counter(
+    "agent_rate_limit_throttled_total", "Responses that exhausted the budget (429 or zero remaining)", ["platform"]
+)
+
+def start_request_timing() -> List[Dict[str, Any]]:
+    """Begin collecting a timing breakdown for the current request"""
+    timings: List[Dict[str, Any]] = []
+    _request_timings.set(timings)
+    return timings
+
+def record_timing(name: str, seconds: float, **labels):
+    """Add an entry to the current request's breakdown, if one is active"""
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.append({"name": name, "seconds": round(seconds, 6), **labels})
+
+class StageClock:
+    """Running time of a stage, less the spans spent paused"""
+
+    def __init__(self):
+        self.started = time.monotonic()
+        self.paused_seconds = 0.0
+
+    @contextmanager
+    def paused(self):
+        """Leave a span out of the stage time, e.g. a consumer handling a streamed event"""
+        paused_at = time.monotonic()
+        try:
+            yield
+        finally:
+            self.paused_seconds += time.monotonic() - paused_at
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started - self.paused_seconds
+
+@contextmanager
+def stage_timer(stage: str):
+    """Time a workflow stage, counting it as an error if it raises"""
+    clock = StageClock()
+    try:
+        yield clock
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        elapsed = clock.elapsed()
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        record_timing(stage, elapsed)
+
+def observe_llm_call(outcome: str, seconds: float):
+    """Record one LLM call (ok, timeout, error or cache_hit)"""
+    LLM_SECONDS.observe(seconds, outcome=outcome)
+    record_timing("llm_call", seconds, outcome=outcome)
+
+def instrument_client(platform: str, operation: Optional[str] = None):
+    """Decorate an async platform client method with latency and error tracking
+
+    Calls that raise or return an ``{"error": ...}`` dict count as errors.
+    """
+    def decorator(func):
+        name = operation or func.__name__
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            started = time.monotonic()
+            try:
+                result = await func(*args, **kwargs)
+            except Exception:
+                CLIENT_ERRORS.inc(platform=platform, operation=name)
+                raise
+            finally:
+                elapsed = time.monotonic() - started
+                CLIENT_SECONDS.observe(elapsed, platform=platform, operation=name)
+                record_timing(f"{platform}.{name}", elapsed)
+
+            if isinstance(result, dict) and "error" in result:
+                CLIENT_ERRORS.inc(platform=platform, operation=name)
+            return result
+
+        return wrapper
+
+    return decorator
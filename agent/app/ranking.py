@@ -0,0 +1,171 @@
+import os
+import math
+import time
+import heapq
+import itertools
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Iterable, Optional
+
+DEFAULT_SOURCE_WEIGHTS = {"linkedin": 1.0, "x": 1.0, "instagram": 1.0}
+
+TIMESTAMP_FIELDS = ("captured_at", "created_at", "timestamp")
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """Convert an ISO 8601 string or epoch number to epoch seconds"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        try:
+            parsed = datetime.fromisoformat(str(value))
+        except ValueError:
+            return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+def parse_weights(spec: str, defaults: Dict[str, float]) -> Dict[str, float]:
+    """Parse 'name=weight,name=weight' overrides on top of defaults"""
+    weights = dict(defaults)
+    for part in spec.split(","):
+        if "=" in part:
+            name, value = part.split("=", 1)
+            weights[name.strip()] = float(value)
+    return weights
+
+class TrendRanker:
+    """Streams trend candidates through a bounded heap and returns a diverse top-k
+
+    Each candidate is scored as a weighted sum of three signals in [0, 1]:
+    the source's normalized engagement score, exponential recency decay and a per-source
+    weight. Only the best ``k * pool_factor`` candidates are ever held, so
+    ranking n candidates costs O(n log k). The final top-k is picked greedily
+    from that pool with per-topic and per-source caps.
+    """
+
+    def __init__(
+        self,
+        engagement_weight: float = 0.6,
+        recency_weight: float = 0.25,
+        source_weight: float = 0.15,
+        half_life_hours: float = 24.0,
+        source_weights: Optional[Dict[str, float]] = None,
+        max_per_topic: int = 2,
+        max_per_source: int = 3,
+        pool_factor: int = 4
+    ):
+        self.engagement_weight = engagement_weight
+        self.recency_weight = recency_weight
+        self.source_weight = source_weight
+        self.half_life_hours = half_life_hours
+        self.source_weights = source_weights or dict(DEFAULT_SOURCE_WEIGHTS)
+        self.max_per_topic = max_per_topic
+        self.max_per_source = max_per_source
+        self.pool_factor = max(1, pool_factor)
+        self._decay = math.log(2) / (half_life_hours * 3600)
+
+    @classmethod
+    def from_env(cls) -> "TrendRanker":
+        """Build a ranker from environment settings"""
+        return cls(
+            engagement_weight=float(os.environ.get("AGENT_RANK_ENGAGEMENT_WEIGHT", "0.6")),
+            recency_weight=float(os.environ.get("AGENT_RANK_RECENCY_WEIGHT", "0.25")),
+            source_weight=float(os.environ.get("AGENT_RANK_SOURCE_WEIGHT", "0.15")),
+            half_life_hours=float(os.environ.get("AGENT_RANK_HALF_LIFE_HOURS", "24")),
+            source_weights=parse_weights(os.environ.get("AGENT_RANK_SOURCE_WEIGHTS", ""), DEFAULT_SOURCE_WEIGHTS),
+            max_per_topic=int(os.environ.get("AGENT_RANK_MAX_PER_TOPIC", "2")),
+            max_per_source=int(os.environ.get("AGENT_RANK_MAX_PER_SOURCE", "3")),
+            pool_factor=int(os.environ.get("AGENT_RANK_POOL_FACTOR", "4"))
+        )
+
+    def engagement_signal(self, trend: Dict[str, Any]) -> float:
+        """Engagement score the trend source normalized with engagement_scorer"""
+        return min(max(float(trend.get("score") or 0.0), 0.0), 1.0)
+
+    def recency_signal(self, trend: Dict[str, Any], now: float) -> float:
+        """Exponential decay by age; undated trends count as fresh"""
+        for field in TIMESTAMP_FIELDS:
+            timestamp = parse_timestamp(trend.get(field))
+            if timestamp is not None:
+                return math.exp(-self._decay * max(now - timestamp, 0.0))
+        return 1.0
+
+    def score(self, trend: Dict[str, Any], now: Optional[float] = None) -> float:
+        """Combined ranking score for one trend"""
+        now = time.time() if now is None else now
+        return (
+            self.engagement_weight * self.engagement_signal(trend)
+            + self.recency_weight * self.recency_signal(trend, now)
+            + self.source_weight * self.source_weights.get(trend.get("source"), 0.5)
+        )
+
+    def top_k(
+        self,
+        candidates: Iterable[Dict[str, Any]],
+        k: int = 5,
+        time_budget: Optional[float] = None
+    ) -> List[Dict[str, Any]]:
+        """Return the k best candidates, diversified by topic and source
+
+        With ``time_budget`` (seconds), scanning stops once the budget is
+        spent and the best candidates seen so far are returned.
+        """
+        if k <= 0:
+            return []
+
+        now = time.time()
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        pool_size = k * self.pool_factor
+        counter = itertools.count()
+        heap: List[Any] = []
+
+        for index, trend in enumerate(candidates):
+            entry = (self.score(trend, now), -next(counter), trend)
+
+            if len(heap) < pool_size:
+                heapq.heappush(heap, entry)
+            elif entry[0] > heap[0][0]:
+                heapq.heapreplace(heap, entry)
+
+            # Check the clock every 1024 candidates to keep the loop tight
+            if deadline is not None and index & 1023 == 1023 and time.monotonic() > deadline:
+                print(f"Ranking budget of {time_budget}s exhausted after {index + 1} candidates")
+                break
+
+        pool = sorted(heap, reverse=True)
+        return [
+            {**trend, "rank_score": round(score, 6)}
+            for score, _, trend in self._diversify(pool, k)
+        ]
+
+    def _diversify(self, pool: List[Any], k: int) -> List[Any]:
+        """Pick greedily under topic/source caps, then fill any gaps by score"""
+        selected = []
+        skipped = []
+        topics: Dict[Any, int] = {}
+        sources: Dict[Any, int] = {}
+
+        for entry in pool:
+            if len(selected) == k:
+                break
+            trend = entry[2]
+            topic, source = trend.get("topic"), trend.get("source")
+
+            if topics.get(topic, 0) >= self.max_per_topic or sources.get(source, 0) >= self.max_per_source:
+                skipped.append(entry)
+                continue
+
+            selected.append(entry)
+            topics[topic] = topics.get(topic, 0) + 1
+            sources[source] = sources.get(source, 0) + 1
+
+        # Not enough diversity available: relax the caps rather than return fewer
+        for entry in skipped:
+            if len(selected) == k:
+                break
+            selected.append(entry)
+
+        return sorted(selected, reverse=True)
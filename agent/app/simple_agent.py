@@ -8,11 +8,10 @@ class SocialMediaAgent:
     def __init__(self):
         self.openai_api_key = os.environ.get("OPENAI_API_KEY")
         
-    def generate_content_ideas(self, persona: str, brand_rules: str, platforms: List[str]) -> Dict[str, Any]:
-        """Generate content ideas based on persona and brand rules"""
-        
+    def collect_trends(self) -> List[Dict[str, Any]]:
+        """Collect trending seeds for idea generation"""
         # Mock trending data
-        trending_seeds = [
+        return [
             {
                 "id": 1,
                 "source": "linkedin",
@@ -41,6 +40,11 @@ class SocialMediaAgent:
                 "score": 0.78
             }
         ]
+    
+    def generate_content_ideas(self, persona: str, brand_rules: str, platforms: List[str]) -> Dict[str, Any]:
+        """Generate content ideas based on persona and brand rules"""
+        
+        trending_seeds = self.collect_trends()
         
         # Generate ideas based on trends
         ideas = []
@@ -0,0 +1,155 @@
+import os
+import copy
+import json
+import time
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional, Set
+
+class StageCache:
+    """In-process memoization of workflow stage outputs with stale-while-revalidate
+
+    Entries younger than ``ttl`` are served as-is. Entries older than ``ttl``
+    but younger than ``ttl + stale_ttl`` are served immediately while one
+    background task recomputes them. Only a missing or fully expired entry
+    makes the caller wait, and concurrent callers share that computation.
+    Every caller gets its own deep copy of the output, so mutating a result
+    never changes what the next caller sees.
+    """
+
+    def __init__(self, ttl: float = 300, stale_ttl: float = 3600, max_entries: int = 256):
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._refreshing: Set[str] = set()
+        self._background: Set[asyncio.Task] = set()
+
+    @classmethod
+    def from_env(cls) -> Optional["StageCache"]:
+        """Build the cache from environment settings, or None if disabled"""
+        if os.environ.get("AGENT_STAGE_CACHE_ENABLED", "true").lower() != "true":
+            return None
+
+        return cls(
+            ttl=float(os.environ.get("AGENT_STAGE_CACHE_TTL", "300")),
+            stale_ttl=float(os.environ.get("AGENT_STAGE_CACHE_STALE_TTL", "3600")),
+            max_entries=int(os.environ.get("AGENT_STAGE_CACHE_MAX_ENTRIES", "256"))
+        )
+
+    @staticmethod
+    def make_key(stage: str, inputs: Any) -> str:
+        """Key a stage invocation on its name and a hash of its inputs"""
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return f"{stage}:{hashlib.sha1(payload.encode('utf-8')).hexdigest()}"
+
+    async def get(self, stage: str, inputs: Any, compute: Callable[[], Any]) -> Any:
+        """Return the stage output for these inputs, computing it only when needed
+
+        ``compute`` may be a coroutine function; a plain function is run in a
+        worker thread so a slow stage never blocks the event loop.
+        """
+        key = self.make_key(stage, inputs)
+        entry = self._entries.get(key)
+        now = time.monotonic()
+
+        if entry is not None:
+            age = now - entry["computed_at"]
+
+            if age < self.ttl:
+                self.hits += 1
+                self._entries.move_to_end(key)
+                return copy.deepcopy(entry["value"])
+
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._entries.move_to_end(key)
+                self._revalidate(key, compute)
+                return copy.deepcopy(entry["value"])
+
+        self.misses += 1
+        return copy.deepcopy(await self._single_flight(key, compute))
+
+    async def _single_flight(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Compute a missing entry; concurrent misses for one key share the computation"""
+        inflight = self._inflight.get(key)
+        while inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+            # The owner was cancelled: the next waiter to wake takes over
+            inflight = self._inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await self._compute(compute)
+            self._store(key, value)
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not reported as lost
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def _revalidate(self, key: str, compute: Callable[[], Any]):
+        """Recompute a stale entry in the background, once per key"""
+        if key in self._refreshing or key in self._inflight:
+            return
+
+        self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                self._store(key, await self._compute(compute))
+            except Exception as e:
+                print(f"Background refresh failed for {key}, serving stale: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _compute(self, compute: Callable[[], Any]) -> Any:
+        if asyncio.iscoroutinefunction(compute):
+            return await compute()
+        return await asyncio.to_thread(compute)
+
+    def _store(self, key: str, value: Any):
+        """Insert or replace an entry, evicting the least recently used"""
+        self._entries[key] = {"value": value, "computed_at": time.monotonic()}
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, stage: Optional[str] = None):
+        """Drop all entries, or only those for one stage"""
+        if stage is None:
+            self._entries.clear()
+            return
+        for key in [key for key in self._entries if key.startswith(f"{stage}:")]:
+            del self._entries[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit, stale hit and miss counters"""
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "size": len(self._entries),
+            "refreshing": len(self._refreshing)
+        }
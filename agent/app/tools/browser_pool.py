@@ -0,0 +1,223 @@
+import os
+import time
+import asyncio
+from contextlib import asynccontextmanager
+from typing import List, Optional, AsyncIterator
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page, Playwright
+import psutil
+
+DEFAULT_USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
+
+class BrowserSlot:
+    """One warm Chromium instance and its reusable contexts"""
+
+    def __init__(self, browser: Browser):
+        self.browser = browser
+        self.active_pages = 0
+        self.pages_served = 0
+        self.idle_contexts: List[BrowserContext] = []
+        self.draining = False
+        self.closed = False
+
+class BrowserPool:
+    """Long-lived pool of warm Chromium browsers for scraping
+
+    Browsers are launched once and handed out page by page. Contexts are
+    recycled (cookies cleared) instead of created per call. A browser is
+    replaced after ``restart_after_pages`` pages, or when the pool's
+    Chromium processes exceed ``max_memory_mb`` in resident memory (sampled
+    in a worker thread at most every ``memory_check_interval`` seconds).
+    The replacement is launched first and the old browser drains its open
+    pages before closing, so new pages never land on a closing browser.
+    At most ``max_pages`` pages are open across the pool at any time.
+    """
+
+    def __init__(
+        self,
+        size: int = 2,
+        max_pages: int = 4,
+        restart_after_pages: int = 200,
+        max_memory_mb: Optional[float] = None,
+        memory_check_interval: float = 10.0,
+        max_idle_contexts: int = 2,
+        headless: bool = True,
+        user_agent: str = DEFAULT_USER_AGENT
+    ):
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self.restart_after_pages = restart_after_pages
+        self.max_memory_mb = max_memory_mb
+        self.memory_check_interval = memory_check_interval
+        self.max_idle_contexts = max_idle_contexts
+        self.headless = headless
+        self.user_agent = user_agent
+        self.restarts = 0
+        self._playwright: Optional[Playwright] = None
+        self._slots: List[BrowserSlot] = []
+        self._page_slots: Optional[asyncio.Semaphore] = None
+        self._lock = asyncio.Lock()
+        self._memory_mb = 0.0
+        self._memory_sampled_at: Optional[float] = None
+
+    @classmethod
+    def from_env(cls) -> "BrowserPool":
+        """Build a pool from environment settings"""
+        max_memory = os.environ.get("BROWSER_POOL_MAX_MEMORY_MB")
+        return cls(
+            size=int(os.environ.get("BROWSER_POOL_SIZE", "2")),
+            max_pages=int(os.environ.get("BROWSER_POOL_MAX_PAGES", "4")),
+            restart_after_pages=int(os.environ.get("BROWSER_POOL_RESTART_AFTER_PAGES", "200")),
+            max_memory_mb=float(max_memory) if max_memory else None,
+            memory_check_interval=float(os.environ.get("BROWSER_POOL_MEMORY_CHECK_INTERVAL", "10")),
+            headless=os.environ.get("BROWSER_POOL_HEADLESS", "true").lower() == "true"
+        )
+
+    @property
+    def started(self) -> bool:
+        # Slots are published last, so concurrent first callers wait on start()
+        return self._playwright is not None and bool(self._slots)
+
+    async def start(self):
+        """Launch the browsers; safe to call more than once"""
+        async with self._lock:
+            if self.started:
+                return
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._page_slots = asyncio.Semaphore(self.max_pages)
+            self._slots = [BrowserSlot(await self._launch()) for _ in range(self.size)]
+
+    async def stop(self):
+        """Close every context and browser and stop Playwright"""
+        async with self._lock:
+            if self._playwright is None:
+                return
+            for slot in self._slots:
+                await self._close_slot(slot)
+            self._slots = []
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _launch(self) -> Browser:
+        return await self._playwright.chromium.launch(headless=self.headless)
+
+    async def _close_slot(self, slot: BrowserSlot):
+        for context in slot.idle_contexts:
+            try:
+                await context.close()
+            except Exception as e:
+                print(f"Error closing browser context: {e}")
+        slot.idle_contexts = []
+        try:
+            await slot.browser.close()
+        except Exception as e:
+            print(f"Error closing browser: {e}")
+
+    def _pick_slot(self) -> BrowserSlot:
+        """Least-loaded connected browser; draining ones have already left the pool"""
+        candidates = [slot for slot in self._slots if slot.browser.is_connected()]
+        if not candidates:
+            # Every browser crashed; the next release relaunches them
+            candidates = self._slots
+        return min(candidates, key=lambda slot: slot.active_pages)
+
+    async def _acquire_context(self, slot: BrowserSlot) -> BrowserContext:
+        while slot.idle_contexts:
+            context = slot.idle_contexts.pop()
+            try:
+                await context.clear_cookies()
+                return context
+            except Exception:
+                # Context died with its browser; fall through to a new one
+                continue
+        return await slot.browser.new_context(user_agent=self.user_agent)
+
+    async def _release_context(self, slot: BrowserSlot, context: BrowserContext):
+        if slot.draining or len(slot.idle_contexts) >= self.max_idle_contexts:
+            await context.close()
+        else:
+            slot.idle_contexts.append(context)
+
+    def chromium_memory_mb(self) -> float:
+        """Resident memory of all Chromium processes started by this service"""
+        total = 0
+        try:
+            for child in psutil.Process().children(recursive=True):
+                try:
+                    if "chrom" in child.name().lower():
+                        total += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+        except psutil.Error as e:
+            print(f"Error reading browser memory: {e}")
+        return total / (1024 * 1024)
+
+    async def _sampled_memory_mb(self) -> float:
+        """Chromium memory, re-read in a worker thread at most every memory_check_interval"""
+        now = time.monotonic()
+        if self._memory_sampled_at is None or now - self._memory_sampled_at >= self.memory_check_interval:
+            self._memory_sampled_at = now
+            self._memory_mb = await asyncio.to_thread(self.chromium_memory_mb)
+        return self._memory_mb
+
+    async def _should_restart(self, slot: BrowserSlot) -> bool:
+        if not slot.browser.is_connected():
+            return True
+        if self.restart_after_pages and slot.pages_served >= self.restart_after_pages:
+            return True
+        if self.max_memory_mb and await self._sampled_memory_mb() > self.max_memory_mb:
+            # Recycle the browser that has done the most work since launch
+            return slot is max(self._slots, key=lambda other: other.pages_served)
+        return False
+
+    async def _recycle(self, slot: BrowserSlot):
+        """Swap in a freshly launched browser, closing the old one once its pages are back"""
+        async with self._lock:
+            if not slot.draining and self.started and slot in self._slots:
+                try:
+                    replacement = BrowserSlot(await self._launch())
+                except Exception as e:
+                    print(f"Error relaunching browser: {e}")
+                    return
+                self._slots[self._slots.index(slot)] = replacement
+                slot.draining = True
+                self.restarts += 1
+
+        if slot.draining and not slot.active_pages and not slot.closed:
+            slot.closed = True
+            await self._close_slot(slot)
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Page]:
+        """Borrow a fresh page on a warm browser"""
+        if not self.started:
+            await self.start()
+
+        async with self._page_slots:
+            slot = self._pick_slot()
+            slot.active_pages += 1
+            context = None
+            page = None
+            try:
+                context = await self._acquire_context(slot)
+                page = await context.new_page()
+                yield page
+            finally:
+                if page is not None:
+                    try:
+                        await page.close()
+                    except Exception as e:
+                        print(f"Error closing page: {e}")
+                if context is not None:
+                    try:
+                        await self._release_context(slot, context)
+                    except Exception as e:
+                        print(f"Error releasing browser context: {e}")
+                slot.active_pages -= 1
+                slot.pages_served += 1
+
+                if slot.draining or await self._should_restart(slot):
+                    await self._recycle(slot)
+
+# Shared pool, started on first use and stopped by the service lifespan
+browser_pool = BrowserPool.from_env()
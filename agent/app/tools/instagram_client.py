@@ -2,6 +2,13 @@ import os
 import httpx
 from typing import Dict, List, Any, Optional
 from tenacity import retry, stop_after_attempt, wait_exponential
+from ..metrics import instrument_client
+from ..engagement import engagement_scorer
+from .http_pool import http_pool
+from .rate_limiter import rate_limiter, rate_limited
+from .token_manager import token_manager
+from .response_cache import HTTPResponseCache
+from .instagram_publisher import InstagramPublisher
 
 class InstagramClient:
     """Instagram Graph API client for content posting and analytics"""
@@ -9,18 +16,76 @@ class InstagramClient:
     def __init__(self):
         self.app_id = os.environ.get("FB_APP_ID")
         self.app_secret = os.environ.get("FB_APP_SECRET")
-        self.base_url = "https://graph.facebook.com/v18.0"
+        self.base_url = os.environ.get("IG_GRAPH_BASE_URL", "https://graph.facebook.com/v18.0")
+        # Long-lived user token; without one the app token from client credentials is used
+        self.user_token = os.environ.get("IG_ACCESS_TOKEN")
         self.access_token = None
+        self.ig_user_id = os.environ.get("IG_USER_ID")
+        self.account_id = self.ig_user_id or self.app_id
+        self.media_fields = "id,media_type,media_url,caption,timestamp,like_count,comments_count,permalink"
+        self.response_cache = HTTPResponseCache.from_env("IG_RESPONSE_CACHE", "data/instagram_cache.db")
         
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Pooled keep-alive client for the Graph API host"""
+        return http_pool.client(self.base_url)
+    
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a Graph API request on the pooled client, feeding rate-limit headers back"""
+        params = {**kwargs.pop("params", {}), "access_token": self.access_token}
+        response = await self.http.request(method, f"{self.base_url}{path}", params=params, **kwargs)
+        rate_limiter.observe("instagram", self.account_id or "default", response)
+        if response.status_code == 401:
+            token_manager.invalidate(self.token_key)
+        # 304 answers a conditional read from the response cache, not an error
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+    
+    @rate_limited("instagram")
+    async def _paced_get(self, path: str, params: Dict[str, Any], headers: Dict[str, str]) -> httpx.Response:
+        return await self._request("GET", path, params=params, headers=headers)
+    
+    async def _cached_get(self, path: str, params: Dict[str, Any]) -> Any:
+        """GET a Graph API resource through the response cache"""
+        if not self.response_cache:
+            return (await self._paced_get(path, params, {})).json()
+        return await self.response_cache.fetch(
+            f"{self.base_url}{path}", params, lambda headers: self._paced_get(path, params, headers)
+        )
+    
+    @property
+    def token_key(self) -> str:
+        return f"instagram:{self.account_id or 'default'}"
+    
+    async def fetch_token(self) -> Dict[str, Any]:
+        """Refresh the long-lived user token, or fetch an app token"""
+        params = {"client_id": self.app_id, "client_secret": self.app_secret}
+        if self.user_token:
+            params.update({"grant_type": "fb_exchange_token", "fb_exchange_token": self.user_token})
+        else:
+            params["grant_type"] = "client_credentials"
+        
+        response = await self.http.get(f"{self.base_url}/oauth/access_token", params=params)
+        response.raise_for_status()
+        result = response.json()
+        if self.user_token:
+            # Exchange the newest token next time so the chain never lapses
+            self.user_token = result["access_token"]
+        return result
+    
     async def authenticate(self) -> bool:
-        """Authenticate with Instagram Graph API"""
+        """Authenticate with Instagram Graph API, reusing the cached access token"""
         try:
-            # In a real implementation, handle OAuth flow
-            return bool(self.app_id and self.app_secret)
+            if not (self.app_id and self.app_secret):
+                return False
+            self.access_token = await token_manager.get(self.token_key, self.fetch_token)
+            return self.access_token is not None
         except Exception as e:
             print(f"Instagram authentication error: {e}")
             return False
     
+    @instrument_client("instagram")
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def get_hashtag_media(self, hashtag: str, limit: int = 10) -> List[Dict[str, Any]]:
         """Get recent media for a hashtag"""
@@ -28,119 +93,126 @@ class InstagramClient:
             return []
             
         try:
-            # Mock Instagram posts for demo
-            mock_posts = [
-                {
-                    "id": "17841400008460056",
-                    "media_type": "IMAGE",
-                    "media_url": "https://example.com/image1.jpg",
-                    "caption": f"Amazing content about {hashtag} #instagram #content",
-                    "timestamp": "2024-01-01T12:00:00+0000",
-                    "like_count": 245,
-                    "comments_count": 18,
-                    "permalink": "https://www.instagram.com/p/ABC123/"
-                },
-                {
-                    "id": "17841400008460057",
-                    "media_type": "VIDEO",
-                    "media_url": "https://example.com/video1.mp4",
-                    "caption": f"Check out this {hashtag} content! #reels #viral",
-                    "timestamp": "2024-01-01T11:30:00+0000",
-                    "like_count": 189,
-                    "comments_count": 12,
-                    "permalink": "https://www.instagram.com/p/DEF456/"
-                }
-            ]
+            # Hashtag ids never change, so this lookup is nearly always a cache hit
+            search = await self._cached_get(
+                "/ig_hashtag_search", {"user_id": self.ig_user_id, "q": hashtag.lstrip("#")}
+            )
+            if not search.get("data"):
+                return []
             
-            return mock_posts[:limit]
+            media = await self._cached_get(
+                f"/{search['data'][0]['id']}/recent_media",
+                {"user_id": self.ig_user_id, "fields": self.media_fields, "limit": limit}
+            )
+            return media.get("data", [])[:limit]
             
         except Exception as e:
             print(f"Error getting hashtag media: {e}")
             return []
     
-    async def create_media_object(self, image_url: str, caption: str) -> Dict[str, Any]:
-        """Create a media object for posting"""
+    @instrument_client("instagram")
+    @rate_limited("instagram")
+    async def create_media_object(
+        self,
+        image_url: Optional[str],
+        caption: str = "",
+        media_type: Optional[str] = None,
+        video_url: Optional[str] = None,
+        children: Optional[List[str]] = None,
+        is_carousel_item: bool = False
+    ) -> Dict[str, Any]:
+        """Create a media container (image, reel, carousel or carousel item) for posting"""
         if not await self.authenticate():
             return {"error": "Authentication failed"}
+        
+        data: Dict[str, Any] = {}
+        if image_url:
+            data["image_url"] = image_url
+        if video_url:
+            data["video_url"] = video_url
+        if media_type:
+            data["media_type"] = media_type
+        if children:
+            data["children"] = ",".join(children)
+        if is_carousel_item:
+            # Carousel items carry no caption; the parent container does
+            data["is_carousel_item"] = "true"
+        elif caption:
+            data["caption"] = caption
             
         try:
-            # Mock media object creation
-            return {
-                "id": "17841400008460058",
-                "status": "FINISHED"
-            }
+            response = await self._request("POST", f"/{self.ig_user_id}/media", data=data)
+            return response.json()
             
         except Exception as e:
             print(f"Error creating media object: {e}")
             return {"error": str(e)}
     
+    @instrument_client("instagram")
+    @rate_limited("instagram")
+    async def get_container_statuses(self, container_ids: List[str]) -> Dict[str, str]:
+        """Processing status (FINISHED, IN_PROGRESS, ERROR, EXPIRED, PUBLISHED) of up to 50 containers in one call"""
+        if not await self.authenticate():
+            return {}
+            
+        try:
+            response = await self._request(
+                "GET", "/", params={"ids": ",".join(container_ids[:50]), "fields": "status_code"}
+            )
+            return {
+                container_id: body.get("status_code", "IN_PROGRESS")
+                for container_id, body in response.json().items()
+            }
+            
+        except Exception as e:
+            print(f"Error getting container status: {e}")
+            return {}
+    
+    @instrument_client("instagram")
+    @rate_limited("instagram")
     async def publish_media(self, creation_id: str) -> Dict[str, Any]:
         """Publish a created media object"""
         if not await self.authenticate():
             return {"error": "Authentication failed"}
+        
+        # Publishing has its own daily quota on top of the call rate
+        await rate_limiter.acquire("instagram_publish", self.account_id or "default")
             
         try:
-            # Mock successful publication
-            return {
-                "id": "17841400008460059",
-                "permalink": "https://www.instagram.com/p/GHI789/"
-            }
+            response = await self._request(
+                "POST", f"/{self.ig_user_id}/media_publish", data={"creation_id": creation_id}
+            )
+            return response.json()
             
         except Exception as e:
             print(f"Error publishing media: {e}")
             return {"error": str(e)}
     
+    @instrument_client("instagram")
     async def post_image(self, image_url: str, caption: str) -> Dict[str, Any]:
-        """Post an image to Instagram"""
-        # Create media object
-        media_result = await self.create_media_object(image_url, caption)
-        
-        if "error" in media_result:
-            return media_result
-            
-        # Publish the media
-        return await self.publish_media(media_result["id"])
+        """Post an image to Instagram, waiting for its container to finish processing"""
+        result = (await InstagramPublisher.from_env(self).publish_batch(
+            [{"type": "image", "image_url": image_url, "caption": caption}]
+        ))[0]
+        if result["status"] != "published":
+            return {"error": result.get("error", "Publishing failed")}
+        return {"id": result.get("media_id")}
     
+    @instrument_client("instagram")
     async def get_account_insights(self, metrics: List[str]) -> Dict[str, Any]:
         """Get account insights/analytics"""
         if not await self.authenticate():
             return {"error": "Authentication failed"}
             
         try:
-            # Mock insights data
-            return {
-                "data": [
-                    {
-                        "name": "impressions",
-                        "period": "day",
-                        "values": [{"value": 1250, "end_time": "2024-01-01T08:00:00+0000"}]
-                    },
-                    {
-                        "name": "reach",
-                        "period": "day", 
-                        "values": [{"value": 980, "end_time": "2024-01-01T08:00:00+0000"}]
-                    },
-                    {
-                        "name": "profile_views",
-                        "period": "day",
-                        "values": [{"value": 156, "end_time": "2024-01-01T08:00:00+0000"}]
-                    }
-                ]
-            }
+            return await self._cached_get(
+                f"/{self.ig_user_id}/insights", {"metric": ",".join(metrics), "period": "day"}
+            )
             
         except Exception as e:
             print(f"Error getting insights: {e}")
             return {"error": str(e)}
     
     def calculate_engagement_score(self, post_data: Dict[str, Any]) -> float:
-        """Calculate engagement score for an Instagram post"""
-        likes = post_data.get("like_count", 0)
-        comments = post_data.get("comments_count", 0)
-        
-        # Simple engagement calculation
-        # In real implementation, would include saves, shares, etc.
-        total_engagement = likes + (comments * 3)  # Comments weighted more
-        
-        # Normalize based on typical Instagram engagement
-        score = min(total_engagement / 1000, 1.0)
-        return score
+        """Calculate engagement score for an Instagram post against recent Instagram engagement"""
+        return engagement_scorer.score_post(post_data, "instagram")
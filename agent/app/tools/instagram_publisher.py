@@ -0,0 +1,193 @@
+import os
+import asyncio
+from typing import Dict, List, Any
+
+# Container states that will never become publishable
+FAILED_STATUSES = ("ERROR", "EXPIRED")
+
+class PublishError(Exception):
+    """A post could not be turned into a publishable container"""
+
+class InstagramPublisher:
+    """Publishes a queue of Instagram posts concurrently
+
+    Containers for every post are created in parallel (at most
+    ``concurrency`` requests at a time). Pending containers are polled
+    together, up to 50 per Graph call, with the interval doubling from
+    ``poll_interval`` to ``max_poll_interval``. Each one is published the
+    moment it reports FINISHED. The client's rate limiter paces every call
+    and holds publishes to the account's daily publishing quota.
+
+    A post is a dict with ``caption`` and one of:
+    ``{"type": "image", "image_url": ...}``,
+    ``{"type": "reel", "video_url": ...}`` or
+    ``{"type": "carousel", "items": [{"image_url": ...} or {"video_url": ...}, ...]}``.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        concurrency: int = 8,
+        poll_interval: float = 1.0,
+        max_poll_interval: float = 15.0,
+        timeout: float = 600.0
+    ):
+        self.client = client
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.timeout = timeout
+
+    @classmethod
+    def from_env(cls, client: Any) -> "InstagramPublisher":
+        """Build a publisher from environment settings"""
+        return cls(
+            client,
+            concurrency=int(os.environ.get("IG_PUBLISH_CONCURRENCY", "8")),
+            poll_interval=float(os.environ.get("IG_PUBLISH_POLL_INTERVAL", "1")),
+            max_poll_interval=float(os.environ.get("IG_PUBLISH_MAX_POLL_INTERVAL", "15")),
+            timeout=float(os.environ.get("IG_PUBLISH_TIMEOUT", "600"))
+        )
+
+    async def _create(self, semaphore: asyncio.Semaphore, **fields) -> str:
+        async with semaphore:
+            result = await self.client.create_media_object(fields.pop("image_url", None), **fields)
+        if "error" in result:
+            raise PublishError(result["error"])
+        return result["id"]
+
+    async def _wait_finished(self, container_ids: List[str], deadline: float):
+        """Block until every container is FINISHED; used for carousel video items"""
+        loop = asyncio.get_running_loop()
+        interval = self.poll_interval
+        waiting = set(container_ids)
+
+        while waiting:
+            statuses = await self.client.get_container_statuses(list(waiting))
+            for container_id, status in statuses.items():
+                if status in FAILED_STATUSES:
+                    raise PublishError(f"Carousel item {container_id} failed processing: {status}")
+                if status == "FINISHED":
+                    waiting.discard(container_id)
+            if not waiting:
+                return
+            if loop.time() + interval > deadline:
+                raise PublishError("Timed out waiting for carousel items to process")
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, self.max_poll_interval)
+
+    async def _create_container(self, post: Dict[str, Any], semaphore: asyncio.Semaphore, deadline: float) -> str:
+        """Create the container for one post and return its id"""
+        kind = post.get("type", "image")
+        caption = post.get("caption", "")
+
+        if kind == "image":
+            return await self._create(semaphore, image_url=post["image_url"], caption=caption)
+
+        if kind == "reel":
+            return await self._create(semaphore, video_url=post["video_url"], media_type="REELS", caption=caption)
+
+        if kind == "carousel":
+            items = post.get("items", [])
+            if not 2 <= len(items) <= 10:
+                raise PublishError("A carousel needs between 2 and 10 items")
+
+            children = await asyncio.gather(*[
+                self._create(
+                    semaphore,
+                    image_url=item.get("image_url"),
+                    video_url=item.get("video_url"),
+                    media_type="VIDEO" if item.get("video_url") else None,
+                    is_carousel_item=True
+                )
+                for item in items
+            ])
+            # Video items must finish processing before the parent can reference them
+            videos = [child for child, item in zip(children, items) if item.get("video_url")]
+            if videos:
+                await self._wait_finished(videos, deadline)
+            return await self._create(
+                semaphore, image_url=None, media_type="CAROUSEL", children=list(children), caption=caption
+            )
+
+        raise PublishError(f"Unknown post type: {kind}")
+
+    async def _publish(self, result: Dict[str, Any], semaphore: asyncio.Semaphore):
+        async with semaphore:
+            published = await self.client.publish_media(result["container_id"])
+        if "error" in published:
+            result.update(status="failed", error=published["error"])
+        else:
+            result.update(status="published", media_id=published["id"])
+
+    async def publish_batch(self, posts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Publish every post; returns one result per post, in order
+
+        Results have ``status`` "published" or "failed" (with ``error``),
+        plus the ``container_id`` when one was created. Posts published by
+        this call carry their ``media_id``; a container that was already
+        published elsewhere does not, since its status omits the media id.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.timeout
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results: List[Dict[str, Any]] = [{"index": index, "status": "pending"} for index in range(len(posts))]
+        pending: Dict[str, Dict[str, Any]] = {}
+        publishing: List[asyncio.Task] = []
+
+        async def create(result: Dict[str, Any], post: Dict[str, Any]):
+            try:
+                result["container_id"] = await self._create_container(post, semaphore, deadline)
+                pending[result["container_id"]] = result
+            except Exception as e:
+                result.update(status="failed", error=str(e))
+
+        creating = asyncio.ensure_future(
+            asyncio.gather(*[create(result, post) for result, post in zip(results, posts)])
+        )
+        interval = self.poll_interval
+
+        try:
+            # Poll while containers are still being created or processed
+            while (pending or not creating.done()) and loop.time() < deadline:
+                if pending:
+                    ids = list(pending)
+                    batches = [ids[start:start + 50] for start in range(0, len(ids), 50)]
+                    for statuses in await asyncio.gather(*[self.client.get_container_statuses(batch) for batch in batches]):
+                        for container_id, status in statuses.items():
+                            result = pending.get(container_id)
+                            if result is None:
+                                continue
+                            if status == "FINISHED":
+                                del pending[container_id]
+                                result["status"] = "publishing"
+                                publishing.append(asyncio.create_task(self._publish(result, semaphore)))
+                            elif status == "PUBLISHED":
+                                # Published elsewhere; the status call does not say under which media id
+                                del pending[container_id]
+                                result["status"] = "published"
+                            elif status in FAILED_STATUSES:
+                                del pending[container_id]
+                                result.update(status="failed", error=f"Container processing failed: {status}")
+
+                if pending or not creating.done():
+                    wait = min(interval, max(deadline - loop.time(), 0))
+                    if creating.done():
+                        await asyncio.sleep(wait)
+                    else:
+                        # Wake early when the last container is created
+                        await asyncio.wait([creating], timeout=wait)
+                    interval = min(interval * 2, self.max_poll_interval)
+        finally:
+            if not creating.done():
+                creating.cancel()
+            await asyncio.gather(creating, return_exceptions=True)
+
+        for result in pending.values():
+            result.update(status="failed", error="Timed out waiting for the container to finish processing")
+        for result in results:
+            if result["status"] == "pending":
+                result.update(status="failed", error="Timed out creating the container")
+
+        await asyncio.gather(*publishing)
+        return results
@@ -1,9 +1,14 @@
 import os
 import asyncio
-from typing import Dict, List, Any, Optional
-from playwright.async_api import async_playwright
+from typing import Dict, List, Any, Optional, Tuple
+from .browser_pool import browser_pool
 import httpx
 from tenacity import retry, stop_after_attempt, wait_exponential
+from ..metrics import instrument_client
+from ..engagement import engagement_scorer
+from .http_pool import http_pool
+from .rate_limiter import rate_limiter, rate_limited
+from .token_manager import token_manager
 import random
 
 class LinkedInClient:
@@ -13,20 +18,62 @@ class LinkedInClient:
         self.client_id = os.environ.get("LINKEDIN_CLIENT_ID")
         self.client_secret = os.environ.get("LINKEDIN_CLIENT_SECRET")
         self.organization_urn = os.environ.get("LINKEDIN_ORGANIZATION_URN")
+        self.account_id = self.organization_urn or self.client_id
         self.api_base_url = os.environ.get("LINKEDIN_API_BASE_URL", "https://api.linkedin.com/v2")
+        self.web_base_url = os.environ.get("LINKEDIN_WEB_BASE_URL", "https://www.linkedin.com")
+        self.token_url = os.environ.get("LINKEDIN_TOKEN_URL", "https://www.linkedin.com/oauth/v2/accessToken")
+        self.access_token = None
         self.enable_public_scan = os.environ.get("ENABLE_LINKEDIN_PUBLIC", "true").lower() == "true"
         self.public_topics = os.environ.get("LINKEDIN_PUBLIC_TOPICS", "#AI,#CreatorEconomy").split(",")
         self.public_pages = os.environ.get("LINKEDIN_PUBLIC_PAGES", "").split(",")
         self.max_per_topic = int(os.environ.get("LINKEDIN_PUBLIC_MAX_PER_TOPIC", "5"))
+        self.scrape_concurrency = int(os.environ.get("LINKEDIN_SCRAPE_CONCURRENCY", "3"))
+        self.refresh_deadline = float(os.environ.get("LINKEDIN_REFRESH_DEADLINE", "60"))
         
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Pooled keep-alive client for the LinkedIn API host"""
+        return http_pool.client(self.api_base_url)
+    
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send a LinkedIn API request on the pooled client, feeding rate-limit headers back"""
+        headers = {**kwargs.pop("headers", {}), "Authorization": f"Bearer {self.access_token}"}
+        response = await self.http.request(method, f"{self.api_base_url}{path}", headers=headers, **kwargs)
+        rate_limiter.observe("linkedin", self.account_id or "default", response)
+        if response.status_code == 401:
+            token_manager.invalidate(self.token_key)
+        response.raise_for_status()
+        return response
+    
+    @property
+    def token_key(self) -> str:
+        return f"linkedin:{self.account_id or 'default'}"
+    
+    async def fetch_token(self) -> Dict[str, Any]:
+        """Fetch an access token with the client credentials grant"""
+        response = await http_pool.client(self.token_url).post(
+            self.token_url,
+            data={
+                "grant_type": "client_credentials",
+                "client_id": self.client_id,
+                "client_secret": self.client_secret
+            }
+        )
+        response.raise_for_status()
+        return response.json()
+    
     async def authenticate_api(self) -> bool:
-        """Authenticate with LinkedIn Marketing API"""
+        """Authenticate with LinkedIn Marketing API, reusing the cached access token"""
         try:
-            return bool(self.client_id and self.client_secret)
+            if not (self.client_id and self.client_secret):
+                return False
+            self.access_token = await token_manager.get(self.token_key, self.fetch_token)
+            return self.access_token is not None
         except Exception as e:
             print(f"LinkedIn API authentication error: {e}")
             return False
     
+    @instrument_client("linkedin")
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
     async def scrape_public_posts(self, topic: str) -> List[Dict[str, Any]]:
         """Scrape public LinkedIn posts for a topic using Playwright"""
@@ -34,15 +81,10 @@ class LinkedInClient:
             return []
             
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                context = await browser.new_context(
-                    user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"
-                )
-                page = await context.new_page()
-                
+            # Borrow a page from the warm browser pool instead of launching Chromium
+            async with browser_pool.page() as page:
                 # Search for the topic
-                search_url = f"https://www.linkedin.com/search/results/content/?keywords={topic.replace('#', '%23')}"
+                search_url = f"{self.web_base_url}/search/results/content/?keywords={topic.replace('#', '%23')}"
                 await page.goto(search_url, wait_until="networkidle")
                 
                 # Wait for content to load
@@ -78,13 +120,13 @@ class LinkedInClient:
                     }
                 ]
                 
-                await browser.close()
                 return mock_posts[:self.max_per_topic]
                 
         except Exception as e:
             print(f"Error scraping LinkedIn posts for {topic}: {e}")
             return []
     
+    @instrument_client("linkedin")
     async def scrape_company_posts(self, company_url: str) -> List[Dict[str, Any]]:
         """Scrape posts from a specific company page"""
         if not self.enable_public_scan:
@@ -113,44 +155,96 @@ class LinkedInClient:
             print(f"Error scraping company posts from {company_url}: {e}")
             return []
     
-    async def get_trending_topics(self) -> Dict[str, Any]:
-        """Get trending topics from LinkedIn"""
-        topics_data = {"topics": []}
+    async def _scrape_target(self, kind: str, target: str, semaphore: asyncio.Semaphore) -> Tuple[str, str, List[Dict[str, Any]]]:
+        """Scrape one topic or company page under the shared parallelism limit"""
+        async with semaphore:
+            if kind == "topic":
+                return kind, target, await self.scrape_public_posts(target)
+            return kind, target, await self.scrape_company_posts(target)
+    
+    def _build_topic(self, topic: str, posts: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summarize a topic's scraped posts into a scored topic entry"""
+        # Topic score: mean of its posts' scores against recent LinkedIn engagement
+        scores = engagement_scorer.score_posts(posts, "linkedin")
+        # Kept on each post so consumers need not score (and count) them again
+        for post, score in zip(posts, scores):
+            post["score"] = score
         
-        for topic in self.public_topics:
-            topic = topic.strip()
-            posts = await self.scrape_public_posts(topic)
-            
-            if posts:
-                # Calculate topic score
-                total_engagement = sum(
-                    post["engagement"]["likes"] + 
-                    post["engagement"]["comments"] * 2 + 
-                    post["engagement"]["reposts"] * 3
-                    for post in posts
-                )
-                
-                avg_score = total_engagement / len(posts) / 1000  # Normalize
-                
-                topic_data = {
-                    "name": topic,
-                    "posts": posts,
-                    "why_now": f"{topic} is trending due to increased engagement and industry adoption",
-                    "idea_seeds": [
-                        f"Create educational content about {topic}",
-                        f"Share case studies related to {topic}",
-                        f"Discuss future implications of {topic}"
-                    ],
-                    "score": min(avg_score, 1.0)
-                }
+        return {
+            "name": topic,
+            "posts": posts,
+            "why_now": f"{topic} is trending due to increased engagement and industry adoption",
+            "idea_seeds": [
+                f"Create educational content about {topic}",
+                f"Share case studies related to {topic}",
+                f"Discuss future implications of {topic}"
+            ],
+            "score": sum(scores) / len(scores)
+        }
+    
+    @instrument_client("linkedin")
+    async def get_trending_topics(self, topics: Optional[List[str]] = None) -> Dict[str, Any]:
+        """Get trending topics from LinkedIn
+        
+        ``topics`` overrides LINKEDIN_PUBLIC_TOPICS for this call. Topics and
+        company pages are scraped concurrently, at most
+        ``scrape_concurrency`` at a time, and merged as each one finishes.
+        Targets that fail are listed under ``failed``; any still running at
+        ``refresh_deadline`` seconds are cancelled and listed under
+        ``timed_out``, and whatever finished is returned.
+        """
+        topics_data = {"topics": [], "company_posts": [], "failed": [], "timed_out": []}
+        
+        targets = [("topic", topic.strip()) for topic in (topics or self.public_topics) if topic.strip()]
+        targets += [("page", page.strip()) for page in self.public_pages if page.strip()]
+        
+        semaphore = asyncio.Semaphore(max(1, self.scrape_concurrency))
+        pending = {
+            asyncio.create_task(self._scrape_target(kind, target, semaphore)): target
+            for kind, target in targets
+        }
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.refresh_deadline
+        
+        try:
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
                 
-                topics_data["topics"].append(topic_data)
+                done, _ = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    target = pending.pop(task)
+                    try:
+                        kind, target, posts = task.result()
+                    except Exception as e:
+                        print(f"Error scraping LinkedIn target {target}: {e}")
+                        topics_data["failed"].append(target)
+                        continue
+                    
+                    if not posts:
+                        continue
+                    if kind == "topic":
+                        topics_data["topics"].append(self._build_topic(target, posts))
+                    else:
+                        topics_data["company_posts"].extend(posts)
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+        
+        if pending:
+            topics_data["timed_out"] = list(pending.values())
+            print(f"LinkedIn refresh deadline of {self.refresh_deadline}s hit; skipped {len(pending)} targets")
         
         # Sort by score
         topics_data["topics"].sort(key=lambda x: x["score"], reverse=True)
         
         return topics_data
     
+    @instrument_client("linkedin")
+    @rate_limited("linkedin")
     async def post_to_linkedin(self, content: str, organization_id: Optional[str] = None) -> Dict[str, Any]:
         """Post content to LinkedIn (requires API authentication)"""
         if not await self.authenticate_api():
@@ -168,6 +262,8 @@ class LinkedInClient:
             print(f"Error posting to LinkedIn: {e}")
             return {"error": str(e)}
     
+    @instrument_client("linkedin")
+    @rate_limited("linkedin")
     async def get_organization_analytics(self) -> Dict[str, Any]:
         """Get organization analytics from LinkedIn Marketing API"""
         if not await self.authenticate_api():
@@ -200,12 +296,5 @@ class LinkedInClient:
             return {"error": str(e)}
     
     def calculate_engagement_score(self, post_data: Dict[str, Any]) -> float:
-        """Calculate engagement score for a LinkedIn post"""
-        engagement = post_data.get("engagement", {})
-        likes = engagement.get("likes", 0)
-        comments = engagement.get("comments", 0)
-        reposts = engagement.get("reposts", 0)
-        
-        # LinkedIn engagement scoring
-        score = (likes * 1.0 + comments * 3.0 + reposts * 2.0) / 500
-        return min(score, 1.0)
+        """Calculate engagement score for a LinkedIn post against recent LinkedIn engagement"""
+        return engagement_scorer.score_post(post_data, "linkedin")
@@ -0,0 +1,224 @@
+import os
+import json
+import time
+import asyncio
+import functools
+from typing import Dict, Any, Optional, Tuple
+from ..metrics import RATE_LIMIT_TOKENS, RATE_LIMIT_CAPACITY, RATE_LIMIT_WAIT_SECONDS, RATE_LIMIT_THROTTLED
+
+# Requests per window (seconds) assumed until a platform reports its own budget
+DEFAULT_BUDGETS = {
+    "x": (450, 900.0),
+    "instagram": (200, 3600.0),
+    "linkedin": (100, 60.0),
+    # Instagram's content publishing quota: posts per rolling 24 hours
+    "instagram_publish": (50, 86400.0),
+}
+
+def parse_budget(spec: str, default: Tuple[int, float]) -> Tuple[int, float]:
+    """Parse a 'requests/seconds' budget such as '450/900'"""
+    if not spec:
+        return default
+    requests, _, window = spec.partition("/")
+    return int(requests), float(window or default[1])
+
+def _seconds_until(value: str, now: float) -> Optional[float]:
+    """Reset headers are either epoch seconds (X) or a delta in seconds"""
+    try:
+        reset = float(value)
+    except (TypeError, ValueError):
+        return None
+    if reset > 1e9:
+        return max(reset - now, 0.0)
+    return max(reset, 0.0)
+
+def parse_rate_limit_headers(headers: Any, status_code: int = 200) -> Dict[str, Optional[float]]:
+    """Read remaining/limit/reset from the rate-limit headers the platforms send
+
+    Understands X's ``x-rate-limit-*``, the IETF ``ratelimit-*`` draft,
+    ``Retry-After`` on a 429 and Meta's ``x-app-usage`` percentages.
+    Missing values come back as None.
+    """
+    now = time.time()
+    info: Dict[str, Optional[float]] = {"remaining": None, "limit": None, "reset_in": None, "used_pct": None}
+
+    for prefix in ("x-rate-limit-", "ratelimit-"):
+        if headers.get(f"{prefix}remaining") is not None:
+            try:
+                info["remaining"] = float(headers.get(f"{prefix}remaining"))
+                if headers.get(f"{prefix}limit") is not None:
+                    info["limit"] = float(headers.get(f"{prefix}limit"))
+            except ValueError:
+                pass
+            info["reset_in"] = _seconds_until(headers.get(f"{prefix}reset"), now)
+            break
+
+    usage = headers.get("x-app-usage")
+    if usage:
+        try:
+            values = json.loads(usage)
+            info["used_pct"] = max(float(values.get(key, 0)) for key in ("call_count", "total_time", "total_cputime"))
+        except (ValueError, AttributeError):
+            pass
+
+    if status_code == 429:
+        info["remaining"] = 0.0
+        retry_after = _seconds_until(headers.get("retry-after"), now)
+        if retry_after is not None:
+            info["reset_in"] = retry_after
+
+    return info
+
+class TokenBucket:
+    """Request budget for one platform account
+
+    Tokens refill continuously at ``capacity / window`` per second until
+    the platform reports a budget. Once headers give a remaining count and
+    a reset time, the bucket holds at most that many tokens until the reset
+    and refills to capacity then. Waiters are served in arrival order.
+    """
+
+    def __init__(self, capacity: int, window: float):
+        self.capacity = float(capacity)
+        self.window = window
+        self.tokens = float(capacity)
+        self._updated = time.monotonic()
+        self._reset_at: Optional[float] = None
+        # asyncio.Lock wakes waiters FIFO, which is what makes queuing fair
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float):
+        if self._reset_at is not None:
+            if now >= self._reset_at:
+                self.tokens = self.capacity
+                self._reset_at = None
+        else:
+            rate = self.capacity / self.window
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * rate)
+        self._updated = now
+
+    def _reserve(self) -> float:
+        """Take a token and return 0, or return how long until one is available"""
+        now = time.monotonic()
+        self._refill(now)
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        if self._reset_at is not None:
+            return self._reset_at - now
+        return (1 - self.tokens) * self.window / self.capacity
+
+    async def acquire(self) -> float:
+        """Wait for a token; returns the seconds spent waiting"""
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                wait = self._reserve()
+                if wait <= 0:
+                    return time.monotonic() - started
+                await asyncio.sleep(wait)
+
+    def update(self, remaining: Optional[float] = None, limit: Optional[float] = None, reset_in: Optional[float] = None):
+        """Lower the budget to what the platform reported
+
+        Headers only ever take tokens away: responses can arrive out of
+        order, so a higher remaining count may simply be older. A count
+        whose reset time has already passed belongs to an earlier window
+        and is ignored.
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if limit:
+            self.capacity = limit
+            self.tokens = min(self.tokens, self.capacity)
+        if remaining is None or (reset_in is not None and reset_in <= 0):
+            return
+        self.tokens = min(self.tokens, max(remaining, 0.0))
+        if reset_in is not None:
+            self._reset_at = max(self._reset_at or now, now + reset_in)
+        elif remaining <= 0 and self._reset_at is None:
+            # No reset given: wait out one window's worth of refill
+            self._reset_at = now + self.window / self.capacity
+
+class RateLimiter:
+    """Token buckets keyed by platform and account, shared by every client call"""
+
+    def __init__(self, budgets: Optional[Dict[str, Tuple[int, float]]] = None, enabled: bool = True):
+        self.budgets = budgets or dict(DEFAULT_BUDGETS)
+        self.enabled = enabled
+        self._buckets: Dict[Tuple[str, str], TokenBucket] = {}
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """Build a limiter from environment settings (RATE_LIMIT_X='450/900', ...)"""
+        budgets = {
+            platform: parse_budget(os.environ.get(f"RATE_LIMIT_{platform.upper()}", ""), default)
+            for platform, default in DEFAULT_BUDGETS.items()
+        }
+        return cls(budgets, enabled=os.environ.get("RATE_LIMIT_ENABLED", "true").lower() == "true")
+
+    def bucket(self, platform: str, account: str = "default") -> TokenBucket:
+        key = (platform, account)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            capacity, window = self.budgets.get(platform, (60, 60.0))
+            bucket = TokenBucket(capacity, window)
+            self._buckets[key] = bucket
+            RATE_LIMIT_CAPACITY.set(bucket.capacity, platform=platform, account=account)
+        return bucket
+
+    def _report(self, platform: str, account: str, bucket: TokenBucket):
+        RATE_LIMIT_TOKENS.set(round(bucket.tokens, 3), platform=platform, account=account)
+        RATE_LIMIT_CAPACITY.set(bucket.capacity, platform=platform, account=account)
+
+    async def acquire(self, platform: str, account: str = "default"):
+        """Wait for this account's next request slot"""
+        if not self.enabled:
+            return
+        bucket = self.bucket(platform, account)
+        waited = await bucket.acquire()
+        RATE_LIMIT_WAIT_SECONDS.observe(waited, platform=platform)
+        self._report(platform, account, bucket)
+
+    def observe(self, platform: str, account: str, response: Any):
+        """Feed an httpx response's rate-limit headers back into the budget"""
+        info = parse_rate_limit_headers(response.headers, response.status_code)
+        bucket = self.bucket(platform, account)
+
+        remaining = info["remaining"]
+        if remaining is None and info["used_pct"] is not None:
+            # Meta reports usage as a percentage of an undisclosed hourly budget
+            remaining = bucket.capacity * max(100.0 - info["used_pct"], 0.0) / 100.0
+            if remaining <= 0:
+                info["reset_in"] = bucket.window
+        if remaining is None:
+            return
+
+        bucket.update(remaining, info["limit"], info["reset_in"])
+        if remaining <= 0:
+            RATE_LIMIT_THROTTLED.inc(platform=platform)
+        self._report(platform, account, bucket)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            f"{platform}:{account}": {"tokens": round(bucket.tokens, 3), "capacity": bucket.capacity}
+            for (platform, account), bucket in self._buckets.items()
+        }
+
+rate_limiter = RateLimiter.from_env()
+
+def rate_limited(platform: str):
+    """Decorate an async client method so each call waits for a rate-limit token
+
+    The account is read from the client's ``account_id`` attribute. Place it
+    under ``@retry`` so every attempt is paced.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            await rate_limiter.acquire(platform, getattr(self, "account_id", None) or "default")
+            return await func(self, *args, **kwargs)
+
+        return wrapper
+
+    return decorator
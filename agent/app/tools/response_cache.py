@@ -0,0 +1,279 @@
+import os
+import json
+import time
+import zlib
+import sqlite3
+import asyncio
+import hashlib
+import threading
+from typing import Dict, Any, Awaitable, Callable, Optional, Set
+import httpx
+
+# Sends the request with the given extra (conditional) headers
+Sender = Callable[[Dict[str, str]], Awaitable[httpx.Response]]
+
+def parse_cache_control(value: Optional[str]) -> Dict[str, Any]:
+    """Parse a Cache-Control header into {directive: value or True}"""
+    directives: Dict[str, Any] = {}
+    for part in (value or "").split(","):
+        name, _, argument = part.strip().partition("=")
+        if not name:
+            continue
+        name = name.lower()
+        if argument:
+            try:
+                directives[name] = int(argument.strip('"'))
+            except ValueError:
+                directives[name] = argument.strip('"')
+        else:
+            directives[name] = True
+    return directives
+
+class HTTPResponseCache:
+    """Compressed on-disk cache of GET responses with conditional revalidation
+
+    Bodies are stored zlib-compressed in SQLite with their ETag and
+    Last-Modified validators. Freshness follows Cache-Control ``max-age``
+    (``default_ttl`` when absent); ``no-store`` responses are never kept and
+    ``no-cache`` ones are stored but revalidated on every use. Stale entries
+    within the ``stale-while-revalidate`` window (``stale_ttl`` by default)
+    are served at once while one background request revalidates them.
+    Revalidation sends If-None-Match / If-Modified-Since, so an unchanged
+    resource costs a bodiless 304. Total stored bytes are capped at
+    ``max_bytes`` by evicting the least recently used entries. SQLite and
+    zlib work runs in worker threads, off the event loop.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, default_ttl: float = 300, stale_ttl: float = 3600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.stale_ttl = stale_ttl
+        self.hits = 0
+        self.stale_hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._refreshing: Set[str] = set()
+        self._background: Set[asyncio.Task] = set()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS http_responses (
+                key TEXT PRIMARY KEY,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                max_age REAL NOT NULL,
+                stale_ttl REAL NOT NULL,
+                last_accessed REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_http_responses_last_accessed ON http_responses (last_accessed)"
+        )
+
+    @classmethod
+    def from_env(cls, prefix: str, path: str) -> Optional["HTTPResponseCache"]:
+        """Build a cache from ``<prefix>_*`` environment settings, or None if disabled"""
+        if os.environ.get(f"{prefix}_ENABLED", "true").lower() != "true":
+            return None
+
+        try:
+            return cls(
+                path=os.environ.get(f"{prefix}_PATH", path),
+                max_bytes=int(os.environ.get(f"{prefix}_MAX_BYTES", str(50 * 1024 * 1024))),
+                default_ttl=float(os.environ.get(f"{prefix}_TTL", "300")),
+                stale_ttl=float(os.environ.get(f"{prefix}_STALE_TTL", "3600"))
+            )
+        except Exception as e:
+            print(f"Warning: HTTP response cache {prefix} disabled: {e}")
+            return None
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        """Key on URL and query parameters, leaving out credentials"""
+        safe = {name: value for name, value in (params or {}).items() if name != "access_token"}
+        payload = json.dumps([url, safe], sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at, max_age, stale_ttl FROM http_responses WHERE key = ?",
+                (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._conn.execute("UPDATE http_responses SET last_accessed = ? WHERE key = ?", (time.time(), key))
+
+        body, etag, last_modified, stored_at, max_age, stale_ttl = row
+        return {
+            "body": body,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": stored_at,
+            "max_age": max_age,
+            "stale_ttl": stale_ttl
+        }
+
+    def _freshness(self, response: httpx.Response) -> Optional[Dict[str, float]]:
+        """Lifetime of a response, or None if it must not be stored"""
+        directives = parse_cache_control(response.headers.get("cache-control"))
+        if "no-store" in directives:
+            return None
+
+        if "no-cache" in directives:
+            max_age = 0.0
+        elif isinstance(directives.get("max-age"), int):
+            max_age = float(directives["max-age"])
+            age = response.headers.get("age")
+            if age and age.isdigit():
+                max_age = max(max_age - int(age), 0.0)
+        else:
+            max_age = self.default_ttl
+
+        stale = directives.get("stale-while-revalidate")
+        return {"max_age": max_age, "stale_ttl": float(stale) if isinstance(stale, int) else self.stale_ttl}
+
+    def _store(self, key: str, response: httpx.Response):
+        freshness = self._freshness(response)
+        if freshness is None:
+            self.invalidate(key)
+            return
+
+        body = zlib.compress(response.content)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO http_responses "
+                "(key, body, size, etag, last_modified, stored_at, max_age, stale_ttl, last_accessed) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key, body, len(body), response.headers.get("etag"), response.headers.get("last-modified"),
+                    now, freshness["max_age"], freshness["stale_ttl"], now
+                )
+            )
+            self._evict()
+
+    def _touch(self, key: str, response: httpx.Response):
+        """A 304 confirms the stored body; restart its freshness clock"""
+        freshness = self._freshness(response)
+        if freshness is None:
+            return
+        with self._lock:
+            self._conn.execute(
+                "UPDATE http_responses SET stored_at = ?, max_age = ?, stale_ttl = ?, "
+                "etag = COALESCE(?, etag) WHERE key = ?",
+                (time.time(), freshness["max_age"], freshness["stale_ttl"], response.headers.get("etag"), key)
+            )
+
+    def _evict(self):
+        """Drop least recently used entries until the total size fits"""
+        (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM http_responses").fetchone()
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM http_responses ORDER BY last_accessed ASC").fetchall()
+        doomed = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM http_responses WHERE key = ?", doomed)
+
+    @staticmethod
+    def _decode(body: bytes) -> Any:
+        return json.loads(zlib.decompress(body))
+
+    @staticmethod
+    def _validators(entry: Dict[str, Any]) -> Dict[str, str]:
+        headers = {}
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    async def _revalidate(self, key: str, entry: Optional[Dict[str, Any]], send: Sender) -> Any:
+        response = await send(self._validators(entry) if entry else {})
+        if response.status_code == 304 and entry is not None:
+            self.revalidated += 1
+            await asyncio.to_thread(self._touch, key, response)
+            return await asyncio.to_thread(self._decode, entry["body"])
+        await asyncio.to_thread(self._store, key, response)
+        return response.json()
+
+    def _revalidate_in_background(self, key: str, entry: Dict[str, Any], send: Sender):
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+
+        async def refresh():
+            try:
+                await self._revalidate(key, entry, send)
+            except Exception as e:
+                print(f"Background revalidation failed for {key}, serving stale: {e}")
+            finally:
+                self._refreshing.discard(key)
+
+        task = asyncio.create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def fetch(self, url: str, params: Optional[Dict[str, Any]], send: Sender) -> Any:
+        """Return the JSON body for a GET, from cache when allowed"""
+        key = self.make_key(url, params)
+        entry = await asyncio.to_thread(self._load, key)
+
+        if entry is not None:
+            age = time.time() - entry["stored_at"]
+            if age < entry["max_age"]:
+                self.hits += 1
+                return await asyncio.to_thread(self._decode, entry["body"])
+            if age < entry["max_age"] + entry["stale_ttl"] and entry["max_age"] > 0:
+                self.stale_hits += 1
+                self._revalidate_in_background(key, entry, send)
+                return await asyncio.to_thread(self._decode, entry["body"])
+        else:
+            self.misses += 1
+
+        return await self._revalidate(key, entry, send)
+
+    def invalidate(self, key: Optional[str] = None):
+        """Remove one entry by key, or everything"""
+        with self._lock:
+            if key is None:
+                self._conn.execute("DELETE FROM http_responses")
+            else:
+                self._conn.execute("DELETE FROM http_responses WHERE key = ?", (key,))
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size, stored = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM http_responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "size": size,
+            "bytes": stored,
+            "max_bytes": self.max_bytes
+        }
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
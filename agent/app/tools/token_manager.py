@@ -0,0 +1,150 @@
+import os
+import time
+import asyncio
+from typing import Dict, Any, Awaitable, Callable, Optional, Set
+
+# A fetcher returns {"access_token": str, "expires_in": seconds or None}
+TokenFetcher = Callable[[], Awaitable[Dict[str, Any]]]
+
+class TokenManager:
+    """Caches platform access tokens and refreshes them before they expire
+
+    ``get`` returns a cached token without awaiting anything when one is
+    warm. Tokens within ``refresh_margin`` seconds of expiry are still
+    served while a background task fetches a new one; only a missing or
+    expired token makes the caller wait, and concurrent callers share that
+    single fetch. ``start`` runs a loop that refreshes tokens ahead of time
+    even when nothing is asking for them.
+    """
+
+    def __init__(self, refresh_margin: float = 300, check_interval: float = 60, failure_backoff: float = 30):
+        self.refresh_margin = refresh_margin
+        self.check_interval = check_interval
+        self.failure_backoff = failure_backoff
+        self.refreshes = 0
+        self.failures = 0
+        self._tokens: Dict[str, Dict[str, Any]] = {}
+        self._fetchers: Dict[str, TokenFetcher] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._background: Set[asyncio.Task] = set()
+        self._loop_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls) -> "TokenManager":
+        """Build a token manager from environment settings"""
+        return cls(
+            refresh_margin=float(os.environ.get("TOKEN_REFRESH_MARGIN", "300")),
+            check_interval=float(os.environ.get("TOKEN_REFRESH_CHECK_INTERVAL", "60")),
+            failure_backoff=float(os.environ.get("TOKEN_REFRESH_FAILURE_BACKOFF", "30"))
+        )
+
+    def _is_usable(self, token: Dict[str, Any], now: float) -> bool:
+        return token["expires_at"] is None or now < token["expires_at"]
+
+    def _needs_refresh(self, token: Dict[str, Any], now: float) -> bool:
+        if token["expires_at"] is None or now < token.get("retry_after", 0):
+            return False
+        return now >= token["expires_at"] - self.refresh_margin
+
+    async def get(self, key: str, fetch: TokenFetcher) -> Optional[str]:
+        """Return a valid access token for ``key``, fetching one only when needed"""
+        self._fetchers[key] = fetch
+        token = self._tokens.get(key)
+        now = time.time()
+
+        if token is not None and self._is_usable(token, now):
+            if self._needs_refresh(token, now):
+                self._refresh_in_background(key)
+            return token["access_token"]
+
+        try:
+            return await self._refresh(key)
+        except Exception as e:
+            print(f"Token refresh failed for {key}: {e}")
+            return None
+
+    async def _refresh(self, key: str) -> str:
+        """Fetch a new token; concurrent callers for one key share the fetch"""
+        inflight = self._inflight.get(key)
+        while inflight is not None:
+            try:
+                return await asyncio.shield(inflight)
+            except asyncio.CancelledError:
+                if not inflight.cancelled():
+                    raise
+            # The owner was cancelled: the next waiter to wake takes over
+            inflight = self._inflight.get(key)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fetchers[key]()
+            expires_in = result.get("expires_in")
+            self._tokens[key] = {
+                "access_token": result["access_token"],
+                "expires_at": time.time() + float(expires_in) if expires_in else None
+            }
+            self.refreshes += 1
+            future.set_result(result["access_token"])
+            return result["access_token"]
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self.failures += 1
+            token = self._tokens.get(key)
+            if token is not None:
+                # Keep serving the old token and don't retry on every call
+                token["retry_after"] = time.time() + self.failure_backoff
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not reported as lost
+            future.exception()
+            raise
+        finally:
+            del self._inflight[key]
+
+    def _refresh_in_background(self, key: str):
+        if key in self._inflight:
+            return
+
+        async def refresh():
+            try:
+                await self._refresh(key)
+            except Exception as e:
+                print(f"Background token refresh failed for {key}: {e}")
+
+        task = asyncio.create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _refresh_loop(self):
+        while True:
+            await asyncio.sleep(self.check_interval)
+            now = time.time()
+            for key, token in list(self._tokens.items()):
+                if self._needs_refresh(token, now):
+                    self._refresh_in_background(key)
+
+    def start(self):
+        """Start refreshing tokens ahead of expiry in the background"""
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        tasks = list(self._background)
+        if self._loop_task is not None:
+            tasks.append(self._loop_task)
+            self._loop_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def invalidate(self, key: str):
+        """Forget a token, e.g. after the platform rejected it with a 401"""
+        self._tokens.pop(key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tokens": len(self._tokens), "refreshes": self.refreshes, "failures": self.failures}
+
+# Shared by every platform client; the service lifespan starts and stops it
+token_manager = TokenManager.from_env()
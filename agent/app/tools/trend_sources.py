@@ -0,0 +1,184 @@
+import os
+import asyncio
+from datetime import datetime, timezone
+from typing import Dict, List, Any, AsyncIterator, Optional, Protocol, runtime_checkable
+from ..engagement import engagement_scorer
+
+@runtime_checkable
+class TrendSource(Protocol):
+    """Anything that can stream normalized trend records for a set of topics
+
+    Every record has ``id``, ``source``, ``topic``, ``text``, ``author``,
+    ``url``, ``engagement`` (``likes``, ``comments``, ``shares``), ``score``
+    in (0, 1] and an ISO 8601 ``captured_at``: the shape ``collect_trends``
+    and the API's trend ingestion expect.
+    """
+
+    name: str
+
+    def stream(self, topics: List[str], limit: int) -> AsyncIterator[Dict[str, Any]]:
+        """Yield up to ``limit`` trend records per topic"""
+        ...
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+def make_trend(
+    source: str,
+    topic: str,
+    source_id: str,
+    text: str,
+    author: str,
+    url: str,
+    likes: int = 0,
+    comments: int = 0,
+    shares: int = 0,
+    score: float = 0.0,
+    captured_at: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build one normalized trend record"""
+    return {
+        "id": f"{source}:{source_id}",
+        "source": source,
+        "topic": topic,
+        "text": text,
+        "author": author,
+        "url": url,
+        "engagement": {"likes": likes or 0, "comments": comments or 0, "shares": shares or 0},
+        "score": round(score, 4),
+        "captured_at": captured_at or _now()
+    }
+
+class XTrendSource:
+    """Recent-search tweets per topic, paged lazily"""
+
+    name = "x"
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    async def stream(self, topics: List[str], limit: int) -> AsyncIterator[Dict[str, Any]]:
+        for topic in topics:
+            remaining = limit
+            pages = self.client.iter_search_pages(topic, page_size=limit, advance_cursor=True)
+            async for page in pages:
+                page = page[:remaining]
+                scores = engagement_scorer.score_posts(page, "x")
+                for tweet, score in zip(page, scores):
+                    metrics = tweet.get("public_metrics", {})
+                    yield make_trend(
+                        "x", topic, tweet["id"], tweet.get("text", ""), tweet.get("author_id", ""),
+                        f"https://x.com/i/web/status/{tweet['id']}",
+                        likes=metrics.get("like_count"),
+                        comments=metrics.get("reply_count"),
+                        shares=(metrics.get("retweet_count") or 0) + (metrics.get("quote_count") or 0),
+                        score=score,
+                        captured_at=tweet.get("created_at")
+                    )
+                remaining -= len(page)
+                if remaining <= 0:
+                    break
+
+class InstagramTrendSource:
+    """Recent hashtag media from the Graph API"""
+
+    name = "instagram"
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    async def stream(self, topics: List[str], limit: int) -> AsyncIterator[Dict[str, Any]]:
+        for topic in topics:
+            media = await self.client.get_hashtag_media(topic, limit=limit)
+            scores = engagement_scorer.score_posts(media, "instagram")
+            for item, score in zip(media, scores):
+                yield make_trend(
+                    "instagram", topic, item["id"], item.get("caption", ""), item.get("username", ""),
+                    item.get("permalink", ""),
+                    likes=item.get("like_count"),
+                    comments=item.get("comments_count"),
+                    score=score,
+                    captured_at=item.get("timestamp")
+                )
+
+class LinkedInTrendSource:
+    """Public posts scraped per topic"""
+
+    name = "linkedin"
+
+    def __init__(self, client: Any):
+        self.client = client
+
+    async def stream(self, topics: List[str], limit: int) -> AsyncIterator[Dict[str, Any]]:
+        data = await self.client.get_trending_topics(topics)
+        for topic in data.get("topics", []):
+            posts = topic.get("posts", [])[:limit]
+            # get_trending_topics already scored these into the baseline
+            for post in posts:
+                score = post.get("score")
+                if score is None:
+                    score = engagement_scorer.score_post(post, "linkedin", update_baseline=False)
+                engagement = post.get("engagement", {})
+                yield make_trend(
+                    "linkedin", topic["name"], post["url"], post.get("snippet", ""), post.get("author", ""),
+                    post["url"],
+                    likes=engagement.get("likes"),
+                    comments=engagement.get("comments"),
+                    shares=engagement.get("reposts"),
+                    score=score
+                )
+
+def build_sources(names: List[str]) -> List[TrendSource]:
+    """Instantiate the adapters for the named platforms"""
+    sources: List[TrendSource] = []
+    for name in (name.strip().lower() for name in names):
+        if name == "x":
+            from .x_client import XClient
+            sources.append(XTrendSource(XClient()))
+        elif name == "instagram":
+            from .instagram_client import InstagramClient
+            sources.append(InstagramTrendSource(InstagramClient()))
+        elif name == "linkedin":
+            # Imported lazily: scraping needs Playwright
+            from .linkedin_client import LinkedInClient
+            sources.append(LinkedInTrendSource(LinkedInClient()))
+        elif name:
+            print(f"Unknown trend source: {name}")
+    return sources
+
+def sources_from_env() -> List[TrendSource]:
+    """Sources named in AGENT_TREND_SOURCES (e.g. 'x,instagram,linkedin'); none by default"""
+    return build_sources(os.environ.get("AGENT_TREND_SOURCES", "").split(","))
+
+async def collect_trends(
+    sources: List[TrendSource],
+    topics: List[str],
+    limit: int = 20,
+    deadline: Optional[float] = None
+) -> List[Dict[str, Any]]:
+    """Drain every source concurrently into one list of trend records
+
+    A source that fails keeps whatever it yielded before failing. With
+    ``deadline`` (seconds), sources still running are cancelled and the
+    records gathered so far are returned.
+    """
+    trends: List[Dict[str, Any]] = []
+
+    async def drain(source: TrendSource):
+        try:
+            async for record in source.stream(topics, limit):
+                trends.append(record)
+        except Exception as e:
+            print(f"Trend source {source.name} failed: {e}")
+
+    tasks = [asyncio.create_task(drain(source)) for source in sources]
+    if not tasks:
+        return trends
+
+    done, pending = await asyncio.wait(tasks, timeout=deadline)
+    for task in pending:
+        task.cancel()
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+        print(f"Trend collection deadline of {deadline}s hit; cancelled {len(pending)} sources")
+    return trends
@@ -1,7 +1,12 @@
 import os
 import httpx
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, AsyncIterator, Optional
 from tenacity import retry, stop_after_attempt, wait_exponential
+from ..metrics import instrument_client
+from ..engagement import engagement_scorer
+from .http_pool import http_pool
+from .rate_limiter import rate_limiter, rate_limited
+from .token_manager import token_manager
 
 class XClient:
     """X (Twitter) API client for trend scraping and posting"""
@@ -9,20 +14,62 @@ class XClient:
     def __init__(self):
         self.client_id = os.environ.get("X_CLIENT_ID")
         self.client_secret = os.environ.get("X_CLIENT_SECRET")
-        self.base_url = "https://api.twitter.com/2"
-        self.bearer_token = None
+        self.base_url = os.environ.get("X_API_BASE_URL", "https://api.twitter.com/2")
+        self.token_url = os.environ.get("X_TOKEN_URL", "https://api.twitter.com/oauth2/token")
+        # A pre-issued app-only bearer token skips the client credentials exchange
+        self.bearer_token = os.environ.get("X_BEARER_TOKEN")
+        self.static_token = self.bearer_token is not None
+        self.account_id = os.environ.get("X_ACCOUNT_ID") or self.client_id
+        self.search_fields = "created_at,author_id,public_metrics,context_annotations"
+        # Newest tweet id seen per query, so the next refresh only asks for newer ones
+        self.since_ids: Dict[str, str] = {}
         
+    @property
+    def http(self) -> httpx.AsyncClient:
+        """Pooled keep-alive client for the X API host"""
+        return http_pool.client(self.base_url)
+    
+    async def _request(self, method: str, path: str, **kwargs) -> httpx.Response:
+        """Send an X API request on the pooled client, feeding rate-limit headers back"""
+        headers = {**kwargs.pop("headers", {}), "Authorization": f"Bearer {self.bearer_token}"}
+        response = await self.http.request(method, f"{self.base_url}{path}", headers=headers, **kwargs)
+        rate_limiter.observe("x", self.account_id or "default", response)
+        if response.status_code == 401:
+            token_manager.invalidate(self.token_key)
+        response.raise_for_status()
+        return response
+    
+    @property
+    def token_key(self) -> str:
+        return f"x:{self.account_id or 'default'}"
+    
+    async def fetch_token(self) -> Dict[str, Any]:
+        """Exchange the app credentials for an app-only bearer token"""
+        response = await http_pool.client(self.token_url).post(
+            self.token_url,
+            data={"grant_type": "client_credentials"},
+            auth=(self.client_id, self.client_secret)
+        )
+        response.raise_for_status()
+        # App-only bearer tokens do not expire, so there is no expires_in
+        return response.json()
+    
     async def authenticate(self) -> bool:
-        """Authenticate with X API using OAuth2"""
+        """Authenticate with X API using OAuth2, reusing the cached bearer token"""
         try:
-            # In a real implementation, handle OAuth2 flow
-            # For demo, return True if credentials exist
-            return bool(self.client_id and self.client_secret)
+            if self.static_token:
+                return True
+            if not (self.client_id and self.client_secret):
+                return False
+            self.bearer_token = await token_manager.get(self.token_key, self.fetch_token)
+            return self.bearer_token is not None
         except Exception as e:
             print(f"X authentication error: {e}")
             return False
     
+    @instrument_client("x")
     @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @rate_limited("x")
     async def search_recent_tweets(self, query: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """Search for recent tweets by query"""
         if not await self.authenticate():
@@ -66,6 +113,84 @@ class XClient:
             print(f"Error searching tweets: {e}")
             return []
     
+    @instrument_client("x", "search_page")
+    @retry(stop=stop_after_attempt(3), wait=wait_exponential(multiplier=1, min=4, max=10))
+    @rate_limited("x")
+    async def _fetch_search_page(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch one page of recent search results
+        
+        Authenticates on every attempt: a 401 drops the cached token, so a
+        retry exchanges the credentials again instead of resending it.
+        """
+        if not await self.authenticate():
+            raise RuntimeError("X authentication failed")
+        response = await self._request("GET", "/tweets/search/recent", params=params)
+        return response.json()
+    
+    async def iter_search_pages(
+        self,
+        query: str,
+        page_size: int = 100,
+        max_pages: Optional[int] = None,
+        since_id: Optional[str] = None,
+        advance_cursor: bool = False
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Yield recent tweets for a query one page at a time
+        
+        Pages are fetched lazily via ``next_token``, so only one page is held
+        at a time. Without an explicit ``since_id`` the newest id from the
+        previous complete pass over this query is used, and a complete pass
+        records the new newest id. A pass cut short by ``max_pages`` or by
+        the caller leaves the cursor alone so nothing in between is skipped,
+        unless ``advance_cursor`` says only the newest tweets matter.
+        """
+        if not await self.authenticate():
+            return
+        
+        params: Dict[str, Any] = {
+            "query": query,
+            # The endpoint accepts 10-100 results per page
+            "max_results": min(max(page_size, 10), 100),
+            "tweet.fields": self.search_fields
+        }
+        since_id = since_id or self.since_ids.get(query)
+        if since_id:
+            params["since_id"] = since_id
+        
+        newest_id = None
+        pages = 0
+        while True:
+            body = await self._fetch_search_page(params)
+            meta = body.get("meta", {})
+            # Results come newest first, so the first page carries the newest id
+            newest_id = newest_id or meta.get("newest_id")
+            if newest_id and advance_cursor:
+                # Record now: a caller that stops early closes us at the yield below
+                self.since_ids[query] = newest_id
+            
+            tweets = body.get("data", [])
+            if tweets:
+                yield tweets
+            
+            pages += 1
+            next_token = meta.get("next_token")
+            if not next_token:
+                break
+            if max_pages is not None and pages >= max_pages:
+                break
+            params["next_token"] = next_token
+        
+        if newest_id and not next_token:
+            self.since_ids[query] = newest_id
+    
+    async def iter_search(self, query: str, **kwargs) -> AsyncIterator[Dict[str, Any]]:
+        """Yield recent tweets for a query one at a time; see iter_search_pages"""
+        async for page in self.iter_search_pages(query, **kwargs):
+            for tweet in page:
+                yield tweet
+    
+    @instrument_client("x")
+    @rate_limited("x")
     async def get_trending_topics(self, woeid: int = 1) -> List[Dict[str, Any]]:
         """Get trending topics for a location"""
         try:
@@ -100,6 +225,8 @@ class XClient:
             print(f"Error getting trending topics: {e}")
             return []
     
+    @instrument_client("x")
+    @rate_limited("x")
     async def post_tweet(self, text: str, media_ids: Optional[List[str]] = None) -> Dict[str, Any]:
         """Post a tweet"""
         if not await self.authenticate():
@@ -125,12 +252,5 @@ class XClient:
             return {"error": str(e)}
     
     def calculate_engagement_score(self, metrics: Dict[str, int]) -> float:
-        """Calculate engagement score for a tweet"""
-        likes = metrics.get("like_count", 0)
-        retweets = metrics.get("retweet_count", 0)
-        replies = metrics.get("reply_count", 0)
-        quotes = metrics.get("quote_count", 0)
-        
-        # Weighted engagement score
-        score = (likes * 1.0 + retweets * 2.0 + replies * 1.5 + quotes * 2.5) / 100
-        return min(score, 1.0)  # Normalize to 0-1 range
+        """Calculate engagement score for a tweet against recent X engagement"""
+        return engagement_scorer.score_post(metrics, "x")
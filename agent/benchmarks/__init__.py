@@ -0,0 +1 @@
+# Agent pipeline benchmarks
@@ -0,0 +1,100 @@
+"""End-to-end trend ingestion benchmark against the local replay server
+
+Starts benchmarks.replay_server in-process, points the platform clients at
+it and drains the configured trend sources repeatedly, so the HTTP pool,
+rate limiter, token manager, response cache and scoring are all exercised
+with no network access.
+
+Usage (from the agent/ directory):
+
+    python -m benchmarks.bench_ingestion --sources x,instagram --rounds 20 --latency 0.05
+"""
+import os
+import sys
+import time
+import asyncio
+import argparse
+import tempfile
+import statistics
+from typing import List
+
+from .replay_server import DEFAULT_RECORDINGS, create_app, load_recordings
+
+def configure_env(base: str, cache_dir: str):
+    """Point every client at the replay server with throwaway credentials"""
+    os.environ.update({
+        "X_API_BASE_URL": f"{base}/2",
+        "X_TOKEN_URL": f"{base}/oauth2/token",
+        "X_CLIENT_ID": "replay",
+        "X_CLIENT_SECRET": "replay",
+        "IG_GRAPH_BASE_URL": f"{base}/v18.0",
+        "FB_APP_ID": "replay",
+        "FB_APP_SECRET": "replay",
+        "IG_USER_ID": "17841400000000000",
+        "IG_RESPONSE_CACHE_PATH": os.path.join(cache_dir, "instagram_cache.db"),
+        "LINKEDIN_WEB_BASE_URL": base,
+        "LINKEDIN_TOKEN_URL": f"{base}/oauth/v2/accessToken",
+        "LINKEDIN_CLIENT_ID": "replay",
+        "LINKEDIN_CLIENT_SECRET": "replay",
+    })
+
+async def run(args) -> int:
+    import uvicorn
+
+    app = create_app(load_recordings(args.recordings), args.latency, args.jitter, args.error_rate, args.seed)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=args.port, log_level="warning"))
+    serving = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        configure_env(f"http://127.0.0.1:{args.port}", cache_dir)
+        # Imported after configure_env: the clients read their settings on construction
+        from app.tools.http_pool import http_pool
+        from app.tools.trend_sources import build_sources, collect_trends
+
+        sources = build_sources(args.sources.split(","))
+        topics = args.topics.split(",")
+        timings, counts = [], []
+        try:
+            for _ in range(args.rounds):
+                started = time.perf_counter()
+                trends = await collect_trends(sources, topics, args.limit, args.deadline)
+                timings.append(time.perf_counter() - started)
+                counts.append(len(trends))
+        finally:
+            await http_pool.aclose()
+
+    server.should_exit = True
+    await serving
+
+    total = sum(counts)
+    print(
+        f"sources={args.sources} rounds={args.rounds} records={total} "
+        f"p50={statistics.median(timings):.4f}s max={max(timings):.4f}s "
+        f"records/s={total / sum(timings):,.0f}"
+    )
+    print(
+        f"replay served={app.state.replayer.served} unmatched={app.state.replayer.unmatched} "
+        f"injected_errors={app.state.injected_errors}"
+    )
+    return 0
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark trend ingestion against recorded responses")
+    parser.add_argument("--recordings", default=DEFAULT_RECORDINGS)
+    parser.add_argument("--sources", default="x,instagram")
+    parser.add_argument("--topics", default="#AI,#CreatorEconomy,#SocialMedia")
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--deadline", type=float, default=60.0)
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args(argv)
+    return asyncio.run(run(args))
+
+if __name__ == "__main__":
+    sys.exit(main())
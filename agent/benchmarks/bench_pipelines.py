@@ -0,0 +1,266 @@
+"""Offline throughput benchmark for the agent pipelines
+
+Runs graph.SocialMediaAgent (async and sync workflows) and
+simple_agent.SocialMediaAgent against synthetic trends, across a grid of
+trend counts, platform counts and idea counts. The graph pipelines call a
+deterministic fake LLM. The simple agent fills captions from templates and
+never calls an LLM, so its rows are marked ``"llm_comparable": false``
+and its throughput is not comparable with the graph pipelines.
+
+Usage (from the agent/ directory):
+
+    python -m benchmarks.bench_pipelines --trends 10,1000,10000 --latency 0.05
+    python -m benchmarks.bench_pipelines --compare benchmarks/results/bench-<sha>.json
+"""
+import os
+
+# Measure the pipelines themselves, not the response and stage caches
+os.environ.setdefault("AGENT_LLM_CACHE_ENABLED", "false")
+os.environ.setdefault("AGENT_STAGE_CACHE_ENABLED", "false")
+
+import io
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+import platform
+import statistics
+import subprocess
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+from typing import Dict, List, Any, Callable, Tuple
+
+from app import graph, simple_agent
+from app.metrics import start_request_timing
+from .fake_llm import FakeLLM
+
+PLATFORMS = ["x", "instagram", "linkedin"]
+PIPELINES = ["graph_async", "graph_sync", "simple"]
+
+# Pipelines that make no LLM calls; their ideas/s is not comparable with the rest
+NO_LLM_PIPELINES = {"simple"}
+
+def synthetic_trends(count: int, seed: int = 7) -> List[Dict[str, Any]]:
+    """Deterministic trend records shaped like collect_trends output"""
+    rng = random.Random(seed)
+    now = time.time()
+    topics = [f"#Topic{i}" for i in range(max(10, count // 20))]
+
+    return [
+        {
+            "id": i + 1,
+            "source": rng.choice(PLATFORMS),
+            "topic": rng.choice(topics),
+            "text": f"Synthetic trend {i + 1}: what creators are testing this week",
+            "author": f"author{rng.randint(1, 500)}",
+            "engagement": {
+                "likes": rng.randint(0, 5000),
+                "comments": rng.randint(0, 500),
+                "shares": rng.randint(0, 300)
+            },
+            "score": round(rng.random(), 4),
+            "captured_at": datetime.fromtimestamp(now - rng.uniform(0, 72 * 3600), tz=timezone.utc).isoformat()
+        }
+        for i in range(count)
+    ]
+
+class BenchGraphAgent(graph.SocialMediaAgent):
+    """Graph agent fed synthetic trends and a fake LLM"""
+
+    def __init__(self, trends: List[Dict[str, Any]], ideas: int, latency: float, concurrency: int):
+        with redirect_stdout(io.StringIO()):
+            super().__init__()
+        self.llm = FakeLLM(latency=latency)
+        self.llm_cache = None
+        self.stage_cache = None
+        self.top_k_trends = ideas
+        self.llm_concurrency = concurrency
+        self._trends = trends
+
+    def collect_trends(self, state: graph.AgentState) -> graph.AgentState:
+        state["trending_seeds"] = list(self._trends)
+        return state
+
+class BenchSimpleAgent(simple_agent.SocialMediaAgent):
+    """Simple agent fed synthetic trends; it makes one idea per trend"""
+
+    def __init__(self, trends: List[Dict[str, Any]]):
+        super().__init__()
+        self._trends = trends
+
+    def collect_trends(self) -> List[Dict[str, Any]]:
+        return list(self._trends)
+
+def build_runner(pipeline: str, trends: List[Dict[str, Any]], platforms: List[str], ideas: int, args) -> Tuple[Callable[[], Dict[str, Any]], Any]:
+    """Return a zero-argument callable running one pipeline invocation"""
+    input_data = {"persona": "Benchmark persona", "brand_rules": "Be concise.", "platforms": platforms}
+
+    if pipeline == "simple":
+        agent = BenchSimpleAgent(trends)
+        return lambda: agent.generate_content_ideas(**input_data), None
+
+    agent = BenchGraphAgent(trends, ideas, args.latency, args.concurrency)
+    if pipeline == "graph_async":
+        return lambda: asyncio.run(agent.arun_workflow(input_data)), agent.llm
+    return lambda: agent.run_workflow(input_data), agent.llm
+
+def measure(pipeline: str, trend_count: int, platform_count: int, ideas: int, args) -> Dict[str, Any]:
+    """Time repeated runs of one configuration, then take one traced run for peak memory"""
+    trends = synthetic_trends(trend_count, seed=args.seed)
+    platforms = PLATFORMS[:platform_count]
+    run, llm = build_runner(pipeline, trends, platforms, ideas, args)
+
+    walls: List[float] = []
+    stage_runs: List[Dict[str, float]] = []
+    result: Dict[str, Any] = {}
+
+    for _ in range(args.repeat):
+        timings = start_request_timing()
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            result = run()
+        walls.append(time.perf_counter() - started)
+
+        stages: Dict[str, float] = {}
+        for entry in timings:
+            stages[entry["name"]] = stages.get(entry["name"], 0.0) + entry["seconds"]
+        if not stages:
+            stages["generate_content_ideas"] = walls[-1]
+        stage_runs.append(stages)
+
+    tracemalloc.start()
+    with redirect_stdout(io.StringIO()):
+        run()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if "error" in result:
+        raise RuntimeError(f"{pipeline} failed: {result['error']}")
+
+    median_wall = statistics.median(walls)
+    ideas_generated = len(result.get("ideas", []))
+    stage_names = sorted({name for stages in stage_runs for name in stages})
+
+    return {
+        "pipeline": pipeline,
+        "trends": trend_count,
+        "platforms": platform_count,
+        "ideas_requested": ideas,
+        "ideas_generated": ideas_generated,
+        "scheduled_posts": len(result.get("scheduled_posts", [])),
+        "wall_seconds": {
+            "median": round(median_wall, 6),
+            "min": round(min(walls), 6),
+            "max": round(max(walls), 6)
+        },
+        "ideas_per_second": round(ideas_generated / median_wall, 2) if median_wall else None,
+        "llm_comparable": pipeline not in NO_LLM_PIPELINES,
+        "peak_memory_bytes": peak,
+        "stages": {
+            name: round(statistics.median(stages.get(name, 0.0) for stages in stage_runs), 6)
+            for name in stage_names
+        },
+        "llm_calls_per_run": llm.calls // (args.repeat + 1) if llm else 0
+    }
+
+def result_key(entry: Dict[str, Any]) -> Tuple:
+    return (entry["pipeline"], entry["trends"], entry["platforms"], entry["ideas_requested"])
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return "unknown"
+
+def compare(current: Dict[str, Any], baseline_path: str, threshold: float) -> bool:
+    """Print median wall-time changes against a previous run; True if none regressed"""
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+
+    previous = {result_key(entry): entry for entry in baseline["results"]}
+    ok = True
+
+    print(f"\nCompared with {baseline.get('commit', '?')} ({baseline_path}):")
+    for entry in current["results"]:
+        old = previous.get(result_key(entry))
+        if not old:
+            continue
+        before, after = old["wall_seconds"]["median"], entry["wall_seconds"]["median"]
+        change = (after - before) / before if before else 0.0
+        flag = ""
+        if change > threshold:
+            flag = "  REGRESSION"
+            ok = False
+        print(f"  {'/'.join(map(str, result_key(entry)))}: {before:.4f}s -> {after:.4f}s ({change:+.1%}){flag}")
+
+    return ok
+
+def parse_ints(value: str) -> List[int]:
+    return [int(part) for part in value.split(",") if part.strip()]
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the agent pipelines offline")
+    parser.add_argument("--pipelines", default=",".join(PIPELINES), help="comma-separated subset of " + ",".join(PIPELINES))
+    parser.add_argument("--trends", type=parse_ints, default=[10, 100, 1000, 10000])
+    parser.add_argument("--platforms", type=parse_ints, default=[1, 3])
+    parser.add_argument("--ideas", type=parse_ints, default=[5, 20])
+    parser.add_argument("--latency", type=float, default=0.02, help="fake LLM latency per call in seconds")
+    parser.add_argument("--concurrency", type=int, default=4, help="LLM concurrency for the graph pipelines")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="JSON results path (default benchmarks/results/bench-<commit>.json)")
+    parser.add_argument("--compare", help="previous results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="relative slowdown reported as a regression")
+    args = parser.parse_args(argv)
+
+    pipelines = [name.strip() for name in args.pipelines.split(",") if name.strip()]
+    unknown = set(pipelines) - set(PIPELINES)
+    if unknown:
+        parser.error(f"unknown pipelines: {', '.join(sorted(unknown))}")
+
+    results = []
+    for pipeline in pipelines:
+        for trend_count in args.trends:
+            for platform_count in args.platforms:
+                # The simple agent has no ranking step, so the idea count is the trend count
+                for ideas in ([trend_count] if pipeline == "simple" else args.ideas):
+                    entry = measure(pipeline, trend_count, min(platform_count, len(PLATFORMS)), ideas, args)
+                    results.append(entry)
+                    print(
+                        f"{pipeline:12} trends={trend_count:<6} platforms={entry['platforms']} "
+                        f"ideas={entry['ideas_generated']:<6} median={entry['wall_seconds']['median']:.4f}s "
+                        f"ideas/s={entry['ideas_per_second']} peak={entry['peak_memory_bytes'] / 1024:.0f}KiB"
+                        + ("" if entry["llm_comparable"] else "  (no LLM calls, not comparable)")
+                    )
+
+    commit = git_commit()
+    report = {
+        "commit": commit,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "config": {
+            "latency": args.latency,
+            "concurrency": args.concurrency,
+            "repeat": args.repeat,
+            "seed": args.seed
+        },
+        "results": results
+    }
+
+    output = args.output or os.path.join("benchmarks", "results", f"bench-{commit}.json")
+    os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare and not compare(report, args.compare, args.threshold):
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
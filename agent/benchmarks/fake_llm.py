@@ -0,0 +1,47 @@
+import time
+import asyncio
+import hashlib
+from typing import List, Any
+
+class FakeResponse:
+    """Mimics the LangChain message returned by ChatOpenAI"""
+
+    def __init__(self, content: str):
+        self.content = content
+
+class FakeLLM:
+    """Deterministic stand-in for ChatOpenAI with configurable latency
+
+    The response is derived from a hash of the prompts, so repeated runs
+    produce identical ideas and the benchmark measures pipeline overhead
+    rather than model variance.
+    """
+
+    def __init__(self, latency: float = 0.05, model_name: str = "fake-llm", temperature: float = 0.7):
+        self.latency = latency
+        self.model_name = model_name
+        self.temperature = temperature
+        self.calls = 0
+
+    def _respond(self, messages: List[Any]) -> FakeResponse:
+        self.calls += 1
+        prompt = "\n".join(message.content for message in messages)
+        digest = hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+        human = messages[-1].content
+        return FakeResponse(
+            f"[{digest[:8]}] {human[:160]} Here is an actionable take for your audience, "
+            f"with three concrete steps and a question to spark discussion."
+        )
+
+    def __call__(self, messages: List[Any]) -> FakeResponse:
+        if self.latency:
+            time.sleep(self.latency)
+        return self._respond(messages)
+
+    def invoke(self, messages: List[Any]) -> FakeResponse:
+        return self(messages)
+
+    async def ainvoke(self, messages: List[Any]) -> FakeResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._respond(messages)
@@ -0,0 +1,144 @@
+"""Local replay server for recorded platform API responses
+
+Serves the X, Instagram Graph and LinkedIn responses in a recordings file
+with configurable latency and error injection, so trend ingestion can be
+load-tested end to end without network access. Point the clients at it:
+
+    X_API_BASE_URL=http://127.0.0.1:8900/2
+    X_TOKEN_URL=http://127.0.0.1:8900/oauth2/token
+    IG_GRAPH_BASE_URL=http://127.0.0.1:8900/v18.0
+    LINKEDIN_WEB_BASE_URL=http://127.0.0.1:8900
+    LINKEDIN_TOKEN_URL=http://127.0.0.1:8900/oauth/v2/accessToken
+
+Usage (from the agent/ directory):
+
+    python -m benchmarks.replay_server --latency 0.05 --jitter 0.02 --error-rate 0.01
+
+A recordings file holds ``{"recordings": [...]}``. Each recording has a
+``method``, a ``path`` (glob patterns such as ``/v18.0/*/recent_media``
+are allowed), an optional ``query`` that must be a subset of the request's
+query string, a ``status``, optional ``headers`` and either a JSON ``body``
+or a raw ``text``. When several recordings match, the ones with the most
+query constraints win and are served round-robin.
+"""
+import os
+import sys
+import json
+import random
+import asyncio
+import argparse
+import itertools
+from fnmatch import fnmatchcase
+from typing import Dict, List, Any, Optional
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, Response
+
+DEFAULT_RECORDINGS = os.path.join(os.path.dirname(__file__), "recordings", "platforms.json")
+
+def load_recordings(path: str) -> List[Dict[str, Any]]:
+    with open(path) as f:
+        return json.load(f)["recordings"]
+
+class Replayer:
+    """Picks the recorded response for a request"""
+
+    def __init__(self, recordings: List[Dict[str, Any]]):
+        self.recordings = recordings
+        self._cycles: Dict[tuple, Any] = {}
+        self.served = 0
+        self.unmatched = 0
+
+    def _matches(self, recording: Dict[str, Any], method: str, path: str, query: Dict[str, str]) -> bool:
+        if recording.get("method", "GET").upper() != method:
+            return False
+        if not fnmatchcase(path, recording["path"]):
+            return False
+        return all(query.get(name) == str(value) for name, value in recording.get("query", {}).items())
+
+    def match(self, method: str, path: str, query: Dict[str, str]) -> Optional[Dict[str, Any]]:
+        candidates = [
+            index for index, recording in enumerate(self.recordings)
+            if self._matches(recording, method, path, query)
+        ]
+        if not candidates:
+            self.unmatched += 1
+            return None
+
+        specificity = max(len(self.recordings[index].get("query", {})) for index in candidates)
+        best = tuple(index for index in candidates if len(self.recordings[index].get("query", {})) == specificity)
+        if best not in self._cycles:
+            self._cycles[best] = itertools.cycle(best)
+        self.served += 1
+        return self.recordings[next(self._cycles[best])]
+
+def create_app(
+    recordings: List[Dict[str, Any]],
+    latency: float = 0.0,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    seed: Optional[int] = None
+) -> FastAPI:
+    """Build the replay app; ``error_rate`` of requests fail with a 500 or a 429"""
+    app = FastAPI(title="Platform Replay Server")
+    replayer = Replayer(recordings)
+    rng = random.Random(seed)
+    app.state.replayer = replayer
+    app.state.injected_errors = 0
+
+    @app.get("/__replay__/stats")
+    async def replay_stats():
+        return {
+            "served": replayer.served,
+            "unmatched": replayer.unmatched,
+            "injected_errors": app.state.injected_errors
+        }
+
+    @app.api_route("/{path:path}", methods=["GET", "POST", "PUT", "DELETE"])
+    async def replay(path: str, request: Request):
+        delay = latency + rng.uniform(-jitter, jitter) if jitter else latency
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if error_rate and rng.random() < error_rate:
+            app.state.injected_errors += 1
+            if rng.random() < 0.5:
+                return JSONResponse({"error": "Injected server error"}, status_code=500)
+            return JSONResponse(
+                {"error": "Injected rate limit"}, status_code=429, headers={"retry-after": "1"}
+            )
+
+        recording = replayer.match(request.method, f"/{path}", dict(request.query_params))
+        if recording is None:
+            return JSONResponse({"error": f"No recording for {request.method} /{path}"}, status_code=404)
+
+        status = recording.get("status", 200)
+        headers = recording.get("headers", {})
+        if "text" in recording:
+            return Response(
+                recording["text"], status_code=status, headers=headers,
+                media_type=recording.get("media_type", "text/html")
+            )
+        return JSONResponse(recording.get("body", {}), status_code=status, headers=headers)
+
+    return app
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded platform API responses")
+    parser.add_argument("--recordings", default=DEFAULT_RECORDINGS)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- seconds of random latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests that fail")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    app = create_app(load_recordings(args.recordings), args.latency, args.jitter, args.error_rate, args.seed)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
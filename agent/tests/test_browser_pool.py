@@ -0,0 +1,99 @@
+import asyncio
+import threading
+
+import pytest
+
+from app.tools import browser_pool
+from app.tools.browser_pool import BrowserPool
+
+class FakePage:
+    async def close(self):
+        pass
+
+class FakeContext:
+    def __init__(self, browser):
+        self.browser = browser
+
+    async def clear_cookies(self):
+        pass
+
+    async def new_page(self):
+        assert not self.browser.closed, "page opened on a closed browser"
+        return FakePage()
+
+    async def close(self):
+        pass
+
+class FakeBrowser:
+    def __init__(self):
+        self.closed = False
+
+    def is_connected(self):
+        return not self.closed
+
+    async def new_context(self, user_agent=None):
+        assert not self.closed, "context opened on a closed browser"
+        return FakeContext(self)
+
+    async def close(self):
+        self.closed = True
+
+class FakePlaywright:
+    async def start(self):
+        return self
+
+    async def stop(self):
+        pass
+
+class FakePool(BrowserPool):
+    """BrowserPool launching in-memory browsers"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.launched = []
+
+    async def _launch(self):
+        await asyncio.sleep(0.001)
+        self.launched.append(FakeBrowser())
+        return self.launched[-1]
+
+@pytest.fixture(autouse=True)
+def fake_playwright(monkeypatch):
+    monkeypatch.setattr(browser_pool, "async_playwright", FakePlaywright)
+
+def test_single_browser_pool_never_serves_a_closing_browser():
+    pool = FakePool(size=1, max_pages=4, restart_after_pages=3)
+
+    async def scrape():
+        async with pool.page():
+            await asyncio.sleep(0.001)
+
+    async def run():
+        await asyncio.gather(*(scrape() for _ in range(40)))
+        await pool.stop()
+
+    asyncio.run(run())
+
+    assert len(pool.launched) == pool.restarts + 1
+    assert pool.restarts >= 5
+    assert all(browser.closed for browser in pool.launched)
+
+def test_memory_is_sampled_off_the_loop_and_at_most_once_per_interval():
+    pool = FakePool(size=1, restart_after_pages=0, max_memory_mb=10_000, memory_check_interval=60)
+    threads = []
+
+    def chromium_memory_mb():
+        threads.append(threading.current_thread())
+        return 1.0
+    pool.chromium_memory_mb = chromium_memory_mb
+
+    async def run():
+        for _ in range(20):
+            async with pool.page():
+                pass
+
+    asyncio.run(run())
+
+    assert len(threads) == 1
+    assert threads[0] is not threading.main_thread()
+    assert pool.restarts == 0
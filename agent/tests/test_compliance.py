@@ -0,0 +1,35 @@
+from app.compliance import ComplianceEngine, get_compliance_engine, normalize_term, parse_brand_rules
+
+def spans(engine, text):
+    return [(match["term"], text[match["start"]:match["end"]]) for match in engine.scan(text)]
+
+def test_whole_words_only():
+    engine = ComplianceEngine(["scam"])
+    assert spans(engine, "Scams are not a scam, scam!") == [("scam", "scam"), ("scam", "scam")]
+
+def test_overlapping_terms_are_all_reported():
+    engine = ComplianceEngine(["rich", "get rich quick"])
+    assert sorted(spans(engine, "get rich quick")) == [("get rich quick", "get rich quick"), ("rich", "rich")]
+
+def test_whitespace_in_text_is_collapsed_like_terms():
+    engine = ComplianceEngine(["moon  shot"])
+    text = "A moon  \n shot, honestly"
+    assert spans(engine, text) == [("moon shot", "moon  \n shot")]
+
+def test_offsets_survive_characters_that_lowercase_longer():
+    engine = ComplianceEngine(["scam"])
+    text = "İİİ SCAM"
+    assert spans(engine, text) == [("scam", "SCAM")]
+
+def test_brand_rules_are_parsed_into_terms():
+    banned, required = parse_brand_rules("Banned: Crypto,  Moon   Shot. Required terms: #ad")
+    assert banned == ["crypto", "moon shot"]
+    assert required == ["#ad"]
+    assert normalize_term('  "Moon\tShot" ') == "moon shot"
+
+def test_check_reports_banned_and_missing_required():
+    engine = get_compliance_engine("Avoid: crypto\nMust include: #ad")
+    assert engine.check("Crypto is guaranteed")["issues"] == (
+        "Contains banned terms: crypto, guaranteed; Missing required terms: #ad"
+    )
+    assert engine.check("Our product #ad")["status"] == "passed"
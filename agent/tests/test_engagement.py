@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from app.engagement import ACTIONS, EngagementScorer
+
+def likes(n):
+    return {"like_count": n}
+
+@pytest.mark.parametrize("method", ["percentile", "log"])
+def test_cold_start_single_posts_are_ranked_by_engagement(method):
+    scorer = EngagementScorer(method=method)
+    scores = [scorer.score_post(likes(n), "x", update_baseline=False) for n in (0, 5, 25, 500, 50000)]
+    assert scores == sorted(scores)
+    assert len(set(scores)) == 5
+    assert 0.0 < scores[0] and scores[-1] < 1.0
+
+def test_score_post_folds_into_the_baseline():
+    scorer = EngagementScorer()
+    scorer.score_post(likes(10), "x")
+    assert scorer.stats() == {"x": 1}
+
+@pytest.mark.parametrize("method", ["percentile", "log"])
+def test_posts_above_the_baseline_keep_their_order(method):
+    scorer = EngagementScorer(method=method)
+    scorer.score_matrix(np.arange(1000, dtype=np.float64).reshape(-1, 1) * np.eye(len(ACTIONS))[0], "x")
+
+    viral = scorer.score_posts([likes(2000), likes(20000), likes(2000000)], "x", update_baseline=False)
+    assert viral == sorted(viral)
+    assert len(set(viral)) == 3
+    assert viral[-1] < 1.0
+
+def test_percentile_ranks_against_the_baseline():
+    scorer = EngagementScorer(min_baseline=1)
+    scorer.score_posts([likes(n) for n in range(99)], "x")
+    low, mid = scorer.score_posts([likes(0), likes(49)], "x", update_baseline=False)
+    assert low == pytest.approx(2 / 101)
+    assert mid == pytest.approx(51 / 101)
+
+def test_unknown_method_is_rejected():
+    with pytest.raises(ValueError):
+        EngagementScorer(method="zscore")
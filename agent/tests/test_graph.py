@@ -0,0 +1,145 @@
+import asyncio
+import threading
+
+from app.graph import SocialMediaAgent
+from benchmarks.fake_llm import FakeLLM
+
+TREND = {"id": "x:1", "topic": "#AI", "text": "Agents everywhere", "score": 0.9}
+
+class RecordingCache:
+    def __init__(self):
+        self.entries = {}
+        self.threads = []
+
+    def get(self, *key):
+        self.threads.append(threading.current_thread())
+        return self.entries.get(key)
+
+    def set(self, *args):
+        self.threads.append(threading.current_thread())
+        self.entries[args[:-1]] = args[-1]
+
+def make_agent(monkeypatch):
+    monkeypatch.setenv("AGENT_LLM_CACHE_ENABLED", "false")
+    agent = SocialMediaAgent()
+    agent.llm = FakeLLM(latency=0)
+    agent.llm_cache = RecordingCache()
+    return agent
+
+def test_llm_cache_is_used_off_the_event_loop(monkeypatch):
+    agent = make_agent(monkeypatch)
+
+    async def generate_twice():
+        semaphore = asyncio.Semaphore(1)
+        first = await agent._agenerate_idea(0, TREND, "persona", "rules", semaphore)
+        second = await agent._agenerate_idea(0, TREND, "persona", "rules", semaphore)
+        return first, second
+
+    first, second = asyncio.run(generate_twice())
+
+    assert first == second
+    assert agent.llm.calls == 1
+    assert len(agent.llm_cache.threads) == 3
+    assert threading.main_thread() not in agent.llm_cache.threads
+
+def test_ranking_is_cached_on_trend_ids_and_scores(monkeypatch):
+    agent = make_agent(monkeypatch)
+    trends = [dict(TREND, id=f"x:{n}", score=n / 10) for n in range(3)]
+
+    async def rank(seeds):
+        state = agent._initial_state({})
+        state["trending_seeds"] = seeds
+        return (await agent.arank_trends(state))["trending_seeds"]
+
+    async def run():
+        await rank(trends)
+        await rank([dict(trend, text="edited") for trend in trends])
+        await rank([dict(trend, score=0.5) for trend in trends])
+
+    asyncio.run(run())
+    assert (agent.stage_cache.hits, agent.stage_cache.misses) == (1, 2)
+
+def test_failed_batch_still_records_workflow_time(monkeypatch):
+    from app.metrics import WORKFLOW_SECONDS
+
+    agent = make_agent(monkeypatch)
+
+    async def broken_collect(state):
+        raise RuntimeError("sources down")
+    agent.acollect_trends = broken_collect
+
+    def batch_count():
+        return WORKFLOW_SECONDS._series.get(("batch",), {"count": 0})["count"]
+
+    before = batch_count()
+    result = asyncio.run(agent.arun_batch([{"persona": "p", "brand_rules": "b", "platforms": ["x"]}]))
+    assert "error" in result
+    assert batch_count() == before + 1
+
+class TrackingLLM(FakeLLM):
+    """FakeLLM recording its peak concurrency; prompts containing 'slow' hang"""
+
+    def __init__(self):
+        super().__init__(latency=0.01)
+        self.active = 0
+        self.peak = 0
+
+    async def ainvoke(self, messages):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            if "slow" in messages[-1].content:
+                await asyncio.sleep(10)
+            return await super().ainvoke(messages)
+        finally:
+            self.active -= 1
+
+def test_idea_generation_is_bounded_and_times_out_to_a_fallback(monkeypatch):
+    agent = make_agent(monkeypatch)
+    agent.llm = TrackingLLM()
+    agent.llm_cache = None
+    agent.llm_concurrency = 2
+    agent.llm_timeout = 0.05
+
+    state = agent._initial_state({"persona": "p", "brand_rules": "b", "platforms": ["x"]})
+    state["trending_seeds"] = [dict(TREND, id=f"x:{n}", text="slow" if n == 3 else f"trend {n}") for n in range(6)]
+
+    ideas = asyncio.run(agent.agenerate_ideas(state))["ideas"]
+
+    assert agent.llm.peak == 2
+    assert [idea["id"] for idea in ideas] == [1, 2, 3, 4, 5, 6]
+    assert ideas[3] == agent._fallback_idea(3, state["trending_seeds"][3])
+
+def test_batch_collects_and_ranks_trends_once_and_keys_results_by_job(monkeypatch):
+    agent = make_agent(monkeypatch)
+    agent.llm_cache = None
+    agent.stage_cache = None
+    calls = {"collect": 0, "rank": 0}
+    collect, rank = agent.acollect_trends, agent.arank_trends
+
+    async def counting_collect(state):
+        calls["collect"] += 1
+        return await collect(state)
+
+    async def counting_rank(state):
+        calls["rank"] += 1
+        return await rank(state)
+
+    agent.acollect_trends = counting_collect
+    agent.arank_trends = counting_rank
+
+    jobs = [
+        {"job_id": "founder", "persona": "Founder", "brand_rules": "b", "platforms": ["x"]},
+        {"persona": "Marketer", "brand_rules": "b", "platforms": ["linkedin"]},
+        {"job_id": "coach", "persona": "Coach", "brand_rules": "b", "platforms": ["instagram"]}
+    ]
+    result = asyncio.run(agent.arun_batch(jobs))
+
+    assert calls == {"collect": 1, "rank": 1}
+    assert list(result["results"]) == ["founder", "1", "coach"]
+    assert len(result["trending_context"]) == 3
+    for job_result in result["results"].values():
+        assert "error" not in job_result and "trending_context" not in job_result
+        assert len(job_result["ideas"]) == 3
+    # Shared trends, but each job keeps its own platforms
+    assert result["results"]["1"]["repurposed_content"].keys() == {"linkedin"}
@@ -0,0 +1,26 @@
+import os
+import asyncio
+
+import pytest
+
+from app.tools.http_pool import HTTPClientPool
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+def test_one_client_per_host():
+    pool = HTTPClientPool()
+    first = pool.client("https://api.x.com/2/tweets")
+    assert pool.client("https://api.x.com/oauth2/token") is first
+    assert pool.client("https://graph.facebook.com/v18.0") is not first
+    assert pool.stats()["hosts"] == 2
+
+    asyncio.run(pool.aclose())
+    assert first.is_closed
+    assert pool.client("https://api.x.com/2/tweets") is not first
+
+def test_api_copy_matches():
+    api_copy = os.path.join(REPO_DIR, "api", "app", "http_pool.py")
+    if not os.path.exists(api_copy):
+        pytest.skip("api service not checked out alongside the agent")
+    with open(api_copy) as api, open(os.path.join(REPO_DIR, "agent", "app", "tools", "http_pool.py")) as agent:
+        assert api.read() == agent.read()
@@ -0,0 +1,68 @@
+import asyncio
+
+from app.tools.instagram_publisher import InstagramPublisher
+
+class FakeGraphClient:
+    """Containers finish after ``polls_to_finish`` status calls"""
+
+    def __init__(self, polls_to_finish=3, statuses=None):
+        self.polls_to_finish = polls_to_finish
+        self.statuses = statuses or {}
+        self.created = 0
+        self.status_calls = 0
+        self.published = []
+
+    async def create_media_object(self, image_url, **fields):
+        self.created += 1
+        return {"id": f"c{self.created}"}
+
+    async def get_container_statuses(self, ids):
+        self.status_calls += 1
+        done = self.status_calls >= self.polls_to_finish
+        return {cid: self.statuses.get(cid, "FINISHED" if done else "IN_PROGRESS") for cid in ids}
+
+    async def publish_media(self, creation_id):
+        self.published.append(creation_id)
+        return {"id": f"m-{creation_id}"}
+
+def publish(client, posts, **kwargs):
+    publisher = InstagramPublisher(client, poll_interval=0.01, max_poll_interval=0.04, **kwargs)
+    return asyncio.run(publisher.publish_batch(posts))
+
+def test_publishes_every_post_once_finished():
+    client = FakeGraphClient(polls_to_finish=2)
+    posts = [{"type": "image", "image_url": f"https://img/{n}.jpg", "caption": "hi"} for n in range(3)]
+
+    results = publish(client, posts)
+
+    assert [result["status"] for result in results] == ["published"] * 3
+    assert [result["media_id"] for result in results] == ["m-c1", "m-c2", "m-c3"]
+    assert sorted(client.published) == ["c1", "c2", "c3"]
+
+def test_status_polling_backs_off_after_creation():
+    client = FakeGraphClient(polls_to_finish=10**9)
+    posts = [{"type": "image", "image_url": "https://img/1.jpg"}]
+
+    results = publish(client, posts, timeout=0.3)
+
+    assert results[0]["status"] == "failed"
+    # 0.01 + 0.02 + 0.04 + 0.04 ... within 0.3s is about ten polls, not a hot loop
+    assert client.status_calls <= 12
+
+def test_already_published_container_has_no_media_id():
+    client = FakeGraphClient(statuses={"c1": "PUBLISHED"})
+
+    results = publish(client, [{"type": "image", "image_url": "https://img/1.jpg"}])
+
+    assert results[0]["status"] == "published"
+    assert "media_id" not in results[0]
+    assert client.published == []
+
+def test_failed_container_and_bad_post_are_reported():
+    client = FakeGraphClient(statuses={"c1": "ERROR"})
+    posts = [{"type": "image", "image_url": "https://img/1.jpg"}, {"type": "carousel", "items": []}]
+
+    results = publish(client, posts)
+
+    assert results[0]["status"] == "failed" and "ERROR" in results[0]["error"]
+    assert results[1]["status"] == "failed" and "carousel" in results[1]["error"]
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from app.jobs import QueueFullError, WorkflowJobManager
+
+async def fake_workflow(input_data, on_event):
+    if input_data.get("fail"):
+        return {"error": "no trends"}
+    on_event({"event": "trends", "data": [1, 2]})
+    for idea in range(2):
+        await asyncio.sleep(0)
+        on_event({"event": "idea", "data": idea})
+    on_event({"event": "repurposed_content", "data": {}})
+    on_event({"event": "schedule", "data": []})
+    return {"ideas": [1, 2], "scheduled_posts": [1, 2, 3]}
+
+async def wait_finished(manager, workflow_id):
+    for _ in range(100):
+        job = manager.get(workflow_id)
+        if job["status"] in ("completed", "failed"):
+            return job
+        await asyncio.sleep(0.001)
+    raise AssertionError("job did not finish")
+
+def test_jobs_report_progress_and_results():
+    async def run():
+        manager = WorkflowJobManager(fake_workflow, workers=2)
+        await manager.start()
+        try:
+            done = manager.submit({"platforms": ["x", "instagram"]})
+            failed = manager.submit({"fail": True})
+            assert done["status"] == "queued" and "input" not in done
+            return await wait_finished(manager, done["workflow_id"]), await wait_finished(manager, failed["workflow_id"])
+        finally:
+            await manager.stop()
+
+    done, failed = asyncio.run(run())
+    assert done["status"] == "completed" and done["progress"] == 100
+    assert done["results"] == {"ideas_generated": 2, "platforms_targeted": 2, "scheduled_posts": 3}
+    assert [stage["stage"] for stage in done["stages"]] == ["trends", "repurposed_content", "schedule"]
+    assert failed["status"] == "failed" and failed["error"] == "no trends"
+
+def test_unknown_workflow_is_none():
+    assert WorkflowJobManager(fake_workflow).get("missing") is None
+
+def test_full_queue_rejects_submissions():
+    async def run():
+        manager = WorkflowJobManager(fake_workflow, workers=1, max_queue_depth=1)
+        manager._queue = asyncio.Queue(maxsize=1)
+        manager.submit({})
+        with pytest.raises(QueueFullError):
+            manager.submit({})
+        assert manager.stats()["jobs"] == {"queued": 1}
+
+    asyncio.run(run())
+
+def test_finished_jobs_expire():
+    async def run():
+        manager = WorkflowJobManager(fake_workflow, result_ttl=0)
+        await manager.start()
+        try:
+            job = manager.submit({})
+            await asyncio.sleep(0.01)
+            return manager.get(job["workflow_id"])
+        finally:
+            await manager.stop()
+
+    assert asyncio.run(run()) is None
@@ -0,0 +1,56 @@
+import asyncio
+
+from app.tools.linkedin_client import LinkedInClient
+
+class FakeScraper:
+    """Stands in for scrape_public_posts, recording its peak concurrency
+
+    '#boom' raises and '#hang' blocks past any deadline.
+    """
+
+    def __init__(self):
+        self.active = 0
+        self.peak = 0
+
+    async def __call__(self, topic):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        try:
+            await asyncio.sleep(0.01)
+            if topic == "#boom":
+                raise RuntimeError("page layout changed")
+            if topic == "#hang":
+                await asyncio.sleep(10)
+            return [{"text": f"post on {topic}", "engagement": {"likes": 10, "comments": 2, "shares": 1}}]
+        finally:
+            self.active -= 1
+
+def make_client(concurrency, deadline):
+    client = LinkedInClient()
+    client.public_pages = []
+    client.scrape_concurrency = concurrency
+    client.refresh_deadline = deadline
+    client.scrape_public_posts = FakeScraper()
+    return client
+
+def test_fan_out_is_bounded_and_reports_failed_and_timed_out_targets():
+    client = make_client(concurrency=2, deadline=0.3)
+    topics = ["#a", "#b", "#boom", "#c", "#d", "#hang"]
+
+    result = asyncio.run(client.get_trending_topics(topics))
+
+    assert client.scrape_public_posts.peak == 2
+    assert sorted(topic["name"] for topic in result["topics"]) == ["#a", "#b", "#c", "#d"]
+    assert result["failed"] == ["#boom"]
+    assert result["timed_out"] == ["#hang"]
+    assert all("score" in post for topic in result["topics"] for post in topic["posts"])
+
+def test_targets_still_queued_at_the_deadline_are_timed_out():
+    client = make_client(concurrency=1, deadline=0.1)
+
+    result = asyncio.run(client.get_trending_topics(["#hang", "#a", "#b"]))
+
+    # '#hang' holds the only slot, so the rest never start
+    assert client.scrape_public_posts.peak == 1
+    assert result["topics"] == [] and result["failed"] == []
+    assert result["timed_out"] == ["#hang", "#a", "#b"]
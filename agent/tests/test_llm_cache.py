@@ -0,0 +1,34 @@
+import time
+
+from app.llm_cache import LLMResponseCache
+
+KEY = ("gpt", 0.7, "system", "human")
+
+def test_round_trip_survives_reopening(tmp_path):
+    path = str(tmp_path / "llm.db")
+    LLMResponseCache(path).set(*KEY, "idea text")
+
+    cache = LLMResponseCache(path)
+    assert cache.get(*KEY) == "idea text"
+    assert cache.get("gpt", 0.2, "system", "human") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_expired_entries_miss(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.db"), ttl_seconds=0.01)
+    cache.set(*KEY, "idea text")
+    time.sleep(0.02)
+    assert cache.get(*KEY) is None
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = LLMResponseCache(str(tmp_path / "llm.db"), max_entries=2)
+    cache.set("m", 0.7, "s", "a", "A")
+    time.sleep(0.001)
+    cache.set("m", 0.7, "s", "b", "B")
+    time.sleep(0.001)
+    cache.get("m", 0.7, "s", "a")
+    time.sleep(0.001)
+    cache.set("m", 0.7, "s", "c", "C")
+
+    assert cache.get("m", 0.7, "s", "a") == "A"
+    assert cache.get("m", 0.7, "s", "b") is None
+    assert cache.stats()["size"] == 2
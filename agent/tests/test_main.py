@@ -0,0 +1,60 @@
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import graph
+from app.main import app
+from benchmarks.fake_llm import FakeLLM
+
+STAGES = ["trends", "idea", "idea", "idea", "repurposed_content", "schedule", "done"]
+
+REQUEST = {"persona": "Tech creator", "brand_rules": "Be helpful", "platforms": ["x", "linkedin"]}
+
+@pytest.fixture
+def client(monkeypatch):
+    # The module agent runs on the mock trends with a deterministic LLM
+    monkeypatch.setattr(graph.agent, "llm", FakeLLM(latency=0))
+    monkeypatch.setattr(graph.agent, "llm_cache", None)
+    monkeypatch.setattr(graph.agent, "stage_cache", None)
+    monkeypatch.setattr(graph.agent, "trend_sources", [])
+    return TestClient(app)
+
+def test_stream_emits_ndjson_stages_in_order(client):
+    response = client.post("/generate_ideas/stream", json=REQUEST)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["event"] for event in events] == STAGES
+    assert len(events[0]["data"]) == 3
+    assert events[-1]["data"]["ideas_generated"] == 3
+
+def test_stream_emits_sse_when_the_client_accepts_it(client):
+    response = client.post("/generate_ideas/stream", json=REQUEST, headers={"Accept": "text/event-stream"})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert response.text.endswith("\n\n")
+    messages = [message.split("\n") for message in response.text.strip().split("\n\n")]
+    assert [lines[0] for lines in messages] == [f"event: {stage}" for stage in STAGES]
+    assert all(lines[1].startswith("data: ") and len(lines) == 2 for lines in messages)
+    assert json.loads(messages[-1][1][len("data: "):])["ideas_generated"] == 3
+
+def test_batch_keys_results_by_job_id_or_index(client):
+    jobs = [dict(REQUEST, job_id="founder"), dict(REQUEST, persona="Marketer")]
+
+    response = client.post("/generate_ideas/batch", json={"jobs": jobs})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert list(body["results"]) == ["founder", "1"]
+    assert all(len(result["ideas"]) == 3 for result in body["results"].values())
+    assert len(body["trending_context"]) == 3
+
+def test_batch_rejects_duplicate_job_ids(client):
+    jobs = [dict(REQUEST, job_id="same"), dict(REQUEST, job_id="same")]
+
+    response = client.post("/generate_ideas/batch", json={"jobs": jobs})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Duplicate job_id in batch"
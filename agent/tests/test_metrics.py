@@ -0,0 +1,51 @@
+import time
+import asyncio
+
+import pytest
+
+from app.metrics import Gauge, Histogram, _format_value, stage_timer, start_request_timing
+
+def test_special_values_use_exposition_format():
+    assert [_format_value(v) for v in (float("inf"), float("-inf"), float("nan"), 3.0, 0.25)] == [
+        "+Inf", "-Inf", "NaN", "3", "0.25"
+    ]
+
+def test_gauge_exposes_infinite_values():
+    gauge = Gauge("test_gauge", "doc", ["platform"])
+    gauge.set(float("inf"), platform="x")
+    assert 'test_gauge{platform="x"} +Inf' in gauge.render()
+
+def test_histogram_sum_uses_exposition_format():
+    histogram = Histogram("test_histogram", "doc", buckets=(1.0,))
+    histogram.observe(float("inf"))
+    assert "test_histogram_sum +Inf" in histogram.render()
+
+def test_paused_spans_are_left_out_of_stage_time():
+    timings = start_request_timing()
+    with stage_timer("stage") as clock:
+        time.sleep(0.01)
+        with clock.paused():
+            time.sleep(0.1)
+    assert timings[0]["seconds"] == pytest.approx(0.01, abs=0.04)
+
+def test_streamed_idea_stage_excludes_consumer_time(monkeypatch):
+    from app.graph import SocialMediaAgent
+
+    monkeypatch.setenv("AGENT_LLM_CACHE_ENABLED", "false")
+    agent = SocialMediaAgent()
+    agent.llm = None
+    state = agent._initial_state({"persona": "p", "brand_rules": "b", "platforms": ["x"]})
+    state["trending_seeds"] = [
+        {"id": f"x:{n}", "topic": "#AI", "text": "text", "score": 0.5} for n in range(3)
+    ]
+
+    async def slow_consumer():
+        timings = start_request_timing()
+        async for event in agent.astream_content_stages(state):
+            if event["event"] == "idea":
+                await asyncio.sleep(0.1)
+        return timings
+
+    timings = asyncio.run(slow_consumer())
+    generate = next(timing for timing in timings if timing["name"] == "generate_ideas")
+    assert generate["seconds"] < 0.1
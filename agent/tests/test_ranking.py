@@ -0,0 +1,52 @@
+import time
+
+import pytest
+
+from app.ranking import TrendRanker, parse_timestamp, parse_weights
+
+NOW = time.time()
+
+def trend(n, topic="#AI", source="x", score=0.0, age_hours=0.0):
+    return {
+        "id": n, "topic": topic, "source": source,
+        "engagement": {"likes": 1000}, "score": score, "captured_at": NOW - age_hours * 3600
+    }
+
+def test_parse_helpers():
+    assert parse_timestamp("1970-01-01T00:01:00") == 60.0
+    assert parse_timestamp("yesterday") is None
+    assert parse_weights("x=2, linkedin=0.5", {"x": 1.0, "instagram": 1.0}) == {
+        "x": 2.0, "instagram": 1.0, "linkedin": 0.5
+    }
+
+def test_top_k_matches_a_full_sort_without_caps():
+    ranker = TrendRanker(max_per_topic=100, max_per_source=100)
+    candidates = [trend(n, topic=f"#{n}", score=((n * 37) % 1000) / 1000) for n in range(500)]
+
+    expected = sorted(candidates, key=lambda t: ranker.score(t, NOW), reverse=True)[:10]
+    assert [t["id"] for t in ranker.top_k(candidates, k=10)] == [t["id"] for t in expected]
+
+def test_recency_decays_by_half_life():
+    ranker = TrendRanker(half_life_hours=24)
+    assert ranker.recency_signal(trend(1, age_hours=24), NOW) == pytest.approx(0.5, rel=1e-3)
+    assert ranker.recency_signal({"id": 1}, NOW) == 1.0
+
+def test_caps_keep_the_top_k_diverse_and_relax_when_needed():
+    ranker = TrendRanker(max_per_topic=1, max_per_source=100)
+    candidates = [trend(n, topic="#AI", score=1 - n / 10) for n in range(5)] + [trend(9, topic="#Other", score=0.001)]
+
+    ranked = ranker.top_k(candidates, k=3)
+
+    # One per topic first, then the cap is relaxed to fill k
+    assert [t["id"] for t in ranked] == [0, 1, 9]
+    assert all("rank_score" in t for t in ranked)
+
+def test_engagement_signal_uses_the_normalized_score():
+    ranker = TrendRanker()
+    # Raw counts are already folded into score by engagement_scorer
+    assert ranker.engagement_signal(trend(1, score=0.3)) == 0.3
+    assert ranker.engagement_signal(trend(2, score=1.7)) == 1.0
+    assert ranker.engagement_signal({"id": 3}) == 0.0
+
+def test_non_positive_k():
+    assert TrendRanker().top_k([trend(1)], k=0) == []
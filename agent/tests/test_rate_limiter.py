@@ -0,0 +1,73 @@
+import time
+import asyncio
+
+import httpx
+import pytest
+
+from app.tools.rate_limiter import RateLimiter, TokenBucket, parse_budget, parse_rate_limit_headers
+
+def x_response(remaining, reset_in=900, status_code=200):
+    return httpx.Response(status_code, headers={
+        "x-rate-limit-remaining": str(remaining),
+        "x-rate-limit-limit": "450",
+        "x-rate-limit-reset": str(int(time.time() + reset_in)),
+    })
+
+def test_parse_budget():
+    assert parse_budget("", (450, 900.0)) == (450, 900.0)
+    assert parse_budget("100/60", (450, 900.0)) == (100, 60.0)
+    assert parse_budget("100", (450, 900.0)) == (100, 900.0)
+
+def test_parse_headers():
+    info = parse_rate_limit_headers(x_response(12).headers)
+    assert info["remaining"] == 12 and info["limit"] == 450
+    assert 890 < info["reset_in"] <= 900
+
+    throttled = parse_rate_limit_headers({"retry-after": "30"}, status_code=429)
+    assert throttled["remaining"] == 0 and throttled["reset_in"] == 30
+
+    meta = parse_rate_limit_headers({"x-app-usage": '{"call_count": 40, "total_time": 75}'})
+    assert meta["used_pct"] == 75
+
+def test_headers_lower_but_never_raise_tokens():
+    limiter = RateLimiter()
+    limiter.observe("x", "acct", x_response(100))
+    assert limiter.bucket("x", "acct").tokens == 100
+
+    # A slower, older response reporting more headroom arrives late
+    limiter.observe("x", "acct", x_response(300))
+    assert limiter.bucket("x", "acct").tokens == 100
+
+    limiter.observe("x", "acct", x_response(40))
+    assert limiter.bucket("x", "acct").tokens == 40
+
+def test_headers_from_an_ended_window_are_ignored():
+    limiter = RateLimiter()
+    limiter.observe("x", "acct", x_response(0, reset_in=-5))
+    assert limiter.bucket("x", "acct").tokens == 450
+
+def test_bucket_holds_reported_budget_until_reset():
+    bucket = TokenBucket(10, 60.0)
+    bucket.update(remaining=0, reset_in=0.05)
+
+    async def run():
+        return await bucket.acquire()
+
+    waited = asyncio.run(run())
+    assert waited == pytest.approx(0.05, abs=0.04)
+    assert bucket.tokens == 9
+
+def test_bucket_serves_waiters_in_arrival_order():
+    bucket = TokenBucket(2, 0.2)
+    bucket.tokens = 0
+    order = []
+
+    async def request(n):
+        await bucket.acquire()
+        order.append(n)
+
+    async def run():
+        await asyncio.gather(*(request(n) for n in range(4)))
+
+    asyncio.run(run())
+    assert order == [0, 1, 2, 3]
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+import httpx
+
+from app.tools.response_cache import HTTPResponseCache
+
+class Origin:
+    """Serves a JSON body, answering 304 when the client's ETag still matches"""
+
+    def __init__(self, cache_control="max-age=60"):
+        self.cache_control = cache_control
+        self.version = 1
+        self.requests = []
+
+    async def send(self, headers):
+        self.requests.append(headers)
+        etag = f'"v{self.version}"'
+        response_headers = {"etag": etag, "cache-control": self.cache_control}
+        if headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers=response_headers)
+        return httpx.Response(200, json={"version": self.version}, headers=response_headers)
+
+def fetch(cache, origin):
+    return asyncio.run(cache.fetch("https://graph/media", {"access_token": "secret", "limit": 5}, origin.send))
+
+def test_fresh_entries_skip_the_origin(tmp_path):
+    cache, origin = HTTPResponseCache(str(tmp_path / "cache.db")), Origin()
+    assert fetch(cache, origin) == {"version": 1}
+    assert fetch(cache, origin) == {"version": 1}
+    assert len(origin.requests) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_no_cache_entries_revalidate_with_their_etag(tmp_path):
+    cache, origin = HTTPResponseCache(str(tmp_path / "cache.db")), Origin("no-cache")
+    fetch(cache, origin)
+    assert fetch(cache, origin) == {"version": 1}
+    assert origin.requests[-1] == {"If-None-Match": '"v1"'}
+    assert cache.revalidated == 1
+
+    origin.version = 2
+    assert fetch(cache, origin) == {"version": 2}
+
+def test_no_store_is_never_kept(tmp_path):
+    cache, origin = HTTPResponseCache(str(tmp_path / "cache.db")), Origin("no-store")
+    fetch(cache, origin)
+    fetch(cache, origin)
+    assert origin.requests == [{}, {}]
+    assert cache.stats()["size"] == 0
+
+def test_key_leaves_out_the_access_token():
+    assert HTTPResponseCache.make_key("u", {"access_token": "a", "q": 1}) == HTTPResponseCache.make_key("u", {"q": 1})
+
+def test_storage_work_runs_off_the_event_loop(tmp_path):
+    cache, origin = HTTPResponseCache(str(tmp_path / "cache.db")), Origin()
+    threads = []
+    for name in ("_load", "_store", "_decode"):
+        method = getattr(cache, name)
+        def recorded(*args, method=method):
+            threads.append(threading.current_thread())
+            return method(*args)
+        setattr(cache, name, recorded)
+
+    fetch(cache, origin)
+    fetch(cache, origin)
+
+    assert len(threads) == 4
+    assert threading.main_thread() not in threads
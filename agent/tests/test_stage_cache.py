@@ -0,0 +1,91 @@
+import asyncio
+
+import pytest
+
+from app.stage_cache import StageCache
+
+def test_callers_get_independent_copies():
+    cache = StageCache()
+
+    async def run():
+        first = await cache.get("rank", [1], lambda: [{"id": 1}])
+        first[0]["id"] = "mutated"
+        first.append("extra")
+        return await cache.get("rank", [1], lambda: [])
+
+    assert asyncio.run(run()) == [{"id": 1}]
+
+def test_concurrent_misses_share_one_computation():
+    cache = StageCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"ranked": [1, 2]}
+
+    async def run():
+        return await asyncio.gather(*(cache.get("rank", "in", compute) for _ in range(5)))
+
+    results = asyncio.run(run())
+    assert calls == [1]
+    assert all(result == {"ranked": [1, 2]} for result in results)
+    assert len({id(result) for result in results}) == 5
+
+def test_waiters_recompute_when_the_owner_is_cancelled():
+    cache = StageCache()
+    calls = []
+
+    async def compute():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return len(calls)
+
+    async def run():
+        owner = asyncio.create_task(cache.get("rank", "in", compute))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(cache.get("rank", "in", compute)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(run()) == [2, 2, 2]
+    assert len(calls) == 2
+
+def test_cancelled_waiter_does_not_cancel_the_computation():
+    cache = StageCache()
+
+    async def compute():
+        await asyncio.sleep(0.02)
+        return "done"
+
+    async def run():
+        owner = asyncio.create_task(cache.get("rank", "in", compute))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(cache.get("rank", "in", compute))
+        await asyncio.sleep(0.005)
+        waiter.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiter
+        return await owner
+
+    assert asyncio.run(run()) == "done"
+
+def test_failures_are_not_cached():
+    cache = StageCache()
+    outcomes = iter([RuntimeError("down"), "ok"])
+
+    def compute():
+        outcome = next(outcomes)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await cache.get("collect", "in", compute)
+        return await cache.get("collect", "in", compute)
+
+    assert asyncio.run(run()) == "ok"
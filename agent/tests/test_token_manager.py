@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+
+from app.tools.token_manager import TokenManager
+
+class Issuer:
+    def __init__(self, expires_in=3600, delay=0.01, fail=False):
+        self.expires_in = expires_in
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+
+    async def fetch(self):
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("token endpoint down")
+        return {"access_token": f"token-{self.calls}", "expires_in": self.expires_in}
+
+def test_concurrent_callers_share_one_fetch():
+    manager, issuer = TokenManager(), Issuer()
+
+    async def run():
+        return await asyncio.gather(*(manager.get("x", issuer.fetch) for _ in range(10)))
+
+    assert asyncio.run(run()) == ["token-1"] * 10
+    assert issuer.calls == 1
+
+def test_warm_token_is_served_without_fetching():
+    manager, issuer = TokenManager(), Issuer()
+
+    async def run():
+        await manager.get("x", issuer.fetch)
+        return await manager.get("x", issuer.fetch)
+
+    assert asyncio.run(run()) == "token-1"
+    assert issuer.calls == 1
+
+def test_expiring_token_is_served_while_refreshing_in_background():
+    manager, issuer = TokenManager(refresh_margin=300), Issuer(expires_in=60)
+
+    async def run():
+        first = await manager.get("x", issuer.fetch)
+        second = await manager.get("x", issuer.fetch)
+        await asyncio.sleep(0.05)
+        return first, second, await manager.get("x", issuer.fetch)
+
+    assert asyncio.run(run()) == ("token-1", "token-1", "token-2")
+
+def test_invalidated_token_is_fetched_again():
+    manager, issuer = TokenManager(), Issuer()
+
+    async def run():
+        await manager.get("x", issuer.fetch)
+        manager.invalidate("x")
+        return await manager.get("x", issuer.fetch)
+
+    assert asyncio.run(run()) == "token-2"
+
+def test_failed_refresh_backs_off_and_keeps_the_old_token():
+    manager, issuer = TokenManager(refresh_margin=300, failure_backoff=60), Issuer(expires_in=60)
+
+    async def run():
+        await manager.get("x", issuer.fetch)
+        issuer.fail = True
+        await manager.get("x", issuer.fetch)
+        await asyncio.sleep(0.05)
+        tokens = [await manager.get("x", issuer.fetch) for _ in range(5)]
+        await asyncio.sleep(0.05)
+        return tokens
+
+    assert asyncio.run(run()) == ["token-1"] * 5
+    assert issuer.calls == 2
+    assert manager.stats()["failures"] == 1
+
+def test_missing_token_failure_returns_none():
+    manager = TokenManager()
+    assert asyncio.run(manager.get("x", Issuer(fail=True).fetch)) is None
+
+def test_waiters_fetch_again_when_the_owner_is_cancelled():
+    manager, issuer = TokenManager(), Issuer(delay=0.05)
+
+    async def run():
+        owner = asyncio.create_task(manager.get("x", issuer.fetch))
+        await asyncio.sleep(0)
+        waiters = [asyncio.create_task(manager.get("x", issuer.fetch)) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        owner.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await owner
+        return await asyncio.gather(*waiters)
+
+    assert asyncio.run(run()) == ["token-2"] * 3
+    assert issuer.calls == 2
@@ -0,0 +1,75 @@
+import os
+import sys
+import asyncio
+import subprocess
+
+from app.engagement import engagement_scorer
+from app.tools.trend_sources import LinkedInTrendSource, TrendSource, collect_trends, make_trend
+
+AGENT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class FakeSource:
+    def __init__(self, name, count, delay=0.0, fail_after=None):
+        self.name = name
+        self.count = count
+        self.delay = delay
+        self.fail_after = fail_after
+
+    async def stream(self, topics, limit):
+        for n in range(self.count):
+            if self.fail_after is not None and n == self.fail_after:
+                raise RuntimeError("platform down")
+            await asyncio.sleep(self.delay)
+            yield make_trend(self.name, topics[0], str(n), "text", "author", f"https://{self.name}/{n}")
+
+def test_fake_source_satisfies_protocol():
+    assert isinstance(FakeSource("x", 1), TrendSource)
+
+def test_make_trend_normalizes_missing_engagement():
+    trend = make_trend("x", "#AI", "1", "t", "a", "u", likes=None, score=0.123456)
+    assert trend["id"] == "x:1"
+    assert trend["engagement"] == {"likes": 0, "comments": 0, "shares": 0}
+    assert trend["score"] == 0.1235
+
+def test_collect_keeps_records_from_failing_source():
+    sources = [FakeSource("x", 3), FakeSource("instagram", 5, fail_after=2)]
+
+    trends = asyncio.run(collect_trends(sources, ["#AI"]))
+
+    assert sorted(trend["id"] for trend in trends) == [
+        "instagram:0", "instagram:1", "x:0", "x:1", "x:2"
+    ]
+
+def test_deadline_cancels_slow_sources():
+    sources = [FakeSource("x", 2), FakeSource("linkedin", 100, delay=0.05)]
+
+    trends = asyncio.run(collect_trends(sources, ["#AI"], deadline=0.2))
+
+    sources_seen = {trend["source"] for trend in trends}
+    assert "x" in sources_seen
+    assert len([trend for trend in trends if trend["source"] == "linkedin"]) < 100
+
+def test_service_starts_without_numpy():
+    # requirements_simple.txt has no numpy; the service must still import
+    code = "import sys; sys.modules['numpy'] = None; import app.main; print(app.main.collect_trends)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=AGENT_DIR, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip().endswith("None")
+
+class FakeLinkedInClient:
+    async def get_trending_topics(self, topics):
+        from app.tools.linkedin_client import LinkedInClient
+
+        posts = [
+            {"url": f"https://linkedin/{n}", "engagement": {"likes": n, "comments": 0, "reposts": 0}}
+            for n in range(4)
+        ]
+        return {"topics": [LinkedInClient._build_topic(self, topics[0], posts)]}
+
+def test_linkedin_posts_enter_the_baseline_once():
+    before = engagement_scorer.stats().get("linkedin", 0)
+
+    trends = asyncio.run(collect_trends([LinkedInTrendSource(FakeLinkedInClient())], ["#AI"]))
+
+    assert len(trends) == 4
+    assert engagement_scorer.stats()["linkedin"] == before + 4
@@ -0,0 +1,62 @@
+import asyncio
+
+import httpx
+from tenacity import wait_none
+
+from app.tools.http_pool import http_pool
+from app.tools.x_client import XClient
+
+def test_search_retry_after_401_uses_a_fresh_token(monkeypatch):
+    monkeypatch.setenv("X_CLIENT_ID", "retry-401")
+    monkeypatch.setenv("X_CLIENT_SECRET", "secret")
+    monkeypatch.setenv("X_API_BASE_URL", "https://x.test/2")
+    monkeypatch.setenv("X_TOKEN_URL", "https://x.test/oauth2/token")
+    monkeypatch.delenv("X_BEARER_TOKEN", raising=False)
+    monkeypatch.setattr(XClient._fetch_search_page.retry, "wait", wait_none())
+
+    issued, seen = [], []
+
+    def handler(request):
+        if request.url.path == "/oauth2/token":
+            issued.append(f"token-{len(issued) + 1}")
+            return httpx.Response(200, json={"access_token": issued[-1]})
+        seen.append(request.headers["authorization"])
+        if len(seen) == 1:
+            return httpx.Response(401, json={"title": "Unauthorized"})
+        return httpx.Response(200, json={"data": [{"id": "1", "text": "hi"}], "meta": {"newest_id": "1"}})
+
+    async def run():
+        http_pool._clients["https://x.test"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        try:
+            return [page async for page in XClient().iter_search_pages("#AI")]
+        finally:
+            await http_pool.aclose()
+
+    assert asyncio.run(run()) == [[{"id": "1", "text": "hi"}]]
+    assert seen == ["Bearer token-1", "Bearer token-2"]
+
+def test_trend_source_advances_the_cursor_when_it_stops_early(monkeypatch):
+    from app.tools.trend_sources import XTrendSource
+
+    monkeypatch.setenv("X_BEARER_TOKEN", "static")
+    monkeypatch.setenv("X_API_BASE_URL", "https://x-cursor.test/2")
+    since_ids = []
+
+    def handler(request):
+        since_ids.append(request.url.params.get("since_id"))
+        tweets = [{"id": str(n), "text": "t", "public_metrics": {"like_count": n}} for n in range(10, 0, -1)]
+        return httpx.Response(200, json={"data": tweets, "meta": {"newest_id": "10", "next_token": "more"}})
+
+    async def run():
+        http_pool._clients["https://x-cursor.test"] = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        source = XTrendSource(XClient())
+        try:
+            first = [trend async for trend in source.stream(["#AI"], limit=3)]
+            second = [trend async for trend in source.stream(["#AI"], limit=3)]
+            return first, second
+        finally:
+            await http_pool.aclose()
+
+    first, second = asyncio.run(run())
+    assert len(first) == len(second) == 3
+    assert since_ids == [None, "10"]
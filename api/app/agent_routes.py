@@ -1,23 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
-from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Dict, Any, AsyncIterator
 from . import crud, schemas
-from .dependencies import get_db
+from .dependencies import get_async_db
+from .http_pool import http_pool
 import httpx
 import asyncio
+import json
 import os
 
 router = APIRouter(prefix="/agent", tags=["agent"])
 
-async def call_agent_service(endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
+async def call_agent_service(endpoint: str, data: Dict[str, Any] = None, method: str = "POST") -> Dict[str, Any]:
     """Call the agent service"""
     agent_url = os.environ.get("AGENT_SERVICE_URL", "http://localhost:8001")
     
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.post(f"{agent_url}/{endpoint}", json=data, timeout=30.0)
-            response.raise_for_status()
-            return response.json()
+        client = http_pool.client(agent_url)
+        response = await client.request(method, f"{agent_url}/{endpoint}", json=data, timeout=30.0)
+        response.raise_for_status()
+        return response.json()
+    except httpx.HTTPStatusError as e:
+        # Keep the agent's status code so callers can relay 404/503 as-is
+        try:
+            detail = e.response.json().get("detail", e.response.text)
+        except ValueError:
+            detail = e.response.text
+        return {"error": detail, "status_code": e.response.status_code}
     except httpx.RequestError:
         # If agent service is not available, return mock data
         return await mock_agent_response(endpoint, data)
@@ -25,6 +35,85 @@ async def call_agent_service(endpoint: str, data: Dict[str, Any]) -> Dict[str, A
         print(f"Error calling agent service: {e}")
         return {"error": str(e)}
 
+def trend_url(trend: Dict[str, Any]) -> str:
+    """Url a trend is stored under; trends without a post link fall back to a platform search"""
+    return trend.get("url") or f"https://{trend['source']}.com/search?q={trend['topic']}"
+
+def format_stream_event(event: Dict[str, Any], sse: bool) -> bytes:
+    """Serialize a stage event the same way the agent service does"""
+    if sse:
+        return f"event: {event['event']}\ndata: {json.dumps(event['data'])}\n\n".encode()
+    return (json.dumps(event) + "\n").encode()
+
+async def stream_agent_service(endpoint: str, data: Dict[str, Any], sse: bool) -> AsyncIterator[bytes]:
+    """Relay a streaming agent endpoint chunk by chunk without buffering"""
+    agent_url = os.environ.get("AGENT_SERVICE_URL", "http://localhost:8001")
+    accept = "text/event-stream" if sse else "application/x-ndjson"
+    started = False
+    
+    try:
+        client = http_pool.client(agent_url)
+        # No read timeout: stages can be quiet for as long as an LLM call takes
+        async with client.stream(
+            "POST", f"{agent_url}/{endpoint}", json=data, headers={"Accept": accept},
+            timeout=httpx.Timeout(30.0, read=None)
+        ) as response:
+            response.raise_for_status()
+            async for chunk in response.aiter_raw():
+                started = True
+                yield chunk
+    except httpx.RequestError:
+        if started:
+            yield format_stream_event({"event": "error", "data": {"error": "Agent stream interrupted"}}, sse)
+            return
+        # If agent service is not available, stream mock data
+        result = await mock_agent_response(endpoint.split("/")[0], data)
+        yield format_stream_event({"event": "trends", "data": result.get("trending_context", [])}, sse)
+        for idea in result.get("ideas", []):
+            yield format_stream_event({"event": "idea", "data": idea}, sse)
+        # Same stage sequence as the agent so clients need only one code path
+        yield format_stream_event({"event": "repurposed_content", "data": result.get("repurposed_content", {})}, sse)
+        yield format_stream_event({"event": "schedule", "data": result.get("scheduled_posts", [])}, sse)
+        yield format_stream_event(
+            {
+                "event": "done",
+                "data": {
+                    "ideas_generated": len(result.get("ideas", [])),
+                    "platforms_targeted": len(data.get("platforms", [])),
+                    "scheduled_posts": len(result.get("scheduled_posts", []))
+                }
+            },
+            sse
+        )
+    except Exception as e:
+        print(f"Error streaming from agent service: {e}")
+        yield format_stream_event({"event": "error", "data": {"error": str(e)}}, sse)
+
+def idea_variants(idea_data: Dict[str, Any], repurposed_content: Dict[str, Any]) -> List[schemas.IdeaVariantCreate]:
+    """Collect an idea's per-platform versions from either agent response shape
+
+    Ideas carry ``platform_adaptations`` inline, or the graph agent returns
+    ``repurposed_content`` keyed by platform with an ``idea_id`` per entry.
+    """
+    adaptations = dict(idea_data.get("platform_adaptations") or {})
+    for platform, contents in repurposed_content.items():
+        for content in contents:
+            if content.get("idea_id") == idea_data.get("id"):
+                adaptations.setdefault(platform, content)
+    
+    return [
+        schemas.IdeaVariantCreate(
+            platform=platform,
+            caption=content.get("caption"),
+            hashtags=content.get("hashtags"),
+            meta_json={
+                key: value for key, value in content.items()
+                if key not in ("idea_id", "platform", "title", "hook", "caption", "hashtags")
+            } or None
+        )
+        for platform, content in adaptations.items()
+    ]
+
 async def mock_agent_response(endpoint: str, data: Dict[str, Any]) -> Dict[str, Any]:
     """Mock agent responses for demo purposes"""
     if endpoint == "generate_ideas":
@@ -120,6 +209,10 @@ async def mock_agent_response(endpoint: str, data: Dict[str, Any]) -> Dict[str,
             ]
         }
     
+    elif endpoint == "workflows" or endpoint.startswith("workflow_status/"):
+        # Queued workflows only exist on the agent; there is nothing to fake
+        return {"error": "Agent service unavailable", "status_code": 503}
+    
     return {"message": f"Mock response for {endpoint}"}
 
 @router.post("/generate_ideas")
@@ -129,7 +222,7 @@ async def generate_ideas(
     platforms: List[str],
     ai_type: str = "text",
     background_tasks: BackgroundTasks = None,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate content ideas using the LangGraph agent"""
     
@@ -146,31 +239,76 @@ async def generate_ideas(
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
     
-    # Store generated ideas in database
-    stored_ideas = []
-    for idea_data in result.get("ideas", []):
+    # Link ideas to stored trends by url; the agent's own trend ids are not database ids
+    trending_context = result.get("trending_context", [])
+    trend_urls = {
+        trend["id"]: trend_url(trend) for trend in trending_context
+        if trend.get("id") and (trend.get("url") or (trend.get("source") and trend.get("topic")))
+    }
+    trend_ids = await crud.get_trend_ids_by_url(db, list(trend_urls.values()))
+    
+    # Store ideas and their platform variants in one transaction
+    ideas = result.get("ideas", [])
+    idea_creates = []
+    for idea_data in ideas:
         idea_create = schemas.IdeaCreate(
             title=idea_data["title"],
             summary=idea_data["summary"],
+            hook=idea_data.get("hook"),
+            caption=idea_data.get("caption"),
+            hashtags=idea_data.get("hashtags"),
             persona=persona,
             brand_rules=brand_rules,
             ai_type=ai_type,
             status="draft",
-            platform_targets=platforms
+            platform_targets=platforms,
+            trend_id=trend_ids.get(trend_urls.get(idea_data.get("trend_id")))
         )
-        
-        stored_idea = crud.create_idea(db, idea_create)
-        stored_ideas.append(stored_idea)
+        idea_creates.append((idea_create, idea_variants(idea_data, result.get("repurposed_content", {}))))
+    
+    idea_ids = await crud.create_ideas(db, idea_creates)
     
     return {
         "message": "Ideas generated successfully",
-        "ideas": stored_ideas,
-        "trending_context": result.get("trending_context", []),
-        "count": len(stored_ideas)
+        "ideas": [
+            {
+                **idea_data,
+                "id": idea_id,
+                "trend_id": idea_create.trend_id,
+                "variants": [variant.dict() for variant in variants]
+            }
+            for idea_data, (idea_create, variants), idea_id in zip(ideas, idea_creates, idea_ids)
+        ],
+        "trending_context": trending_context,
+        "count": len(idea_ids)
     }
 
+@router.post("/generate_ideas/stream")
+async def generate_ideas_stream(
+    persona: str,
+    brand_rules: str,
+    platforms: List[str],
+    request: Request,
+    ai_type: str = "text"
+):
+    """Stream content ideas from the agent as NDJSON, or SSE for text/event-stream clients"""
+    sse = "text/event-stream" in request.headers.get("accept", "")
+    
+    agent_data = {
+        "persona": persona,
+        "brand_rules": brand_rules,
+        "platforms": platforms,
+        "ai_type": ai_type
+    }
+    
+    return StreamingResponse(
+        stream_agent_service("generate_ideas/stream", agent_data, sse),
+        media_type="text/event-stream" if sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.post("/refresh_trends")
-async def refresh_trends(db: Session = Depends(get_db)):
+async def refresh_trends(db: AsyncSession = Depends(get_async_db)):
     """Refresh trending content from all platforms"""
     
     result = await call_agent_service("refresh_trends", {})
@@ -178,13 +316,13 @@ async def refresh_trends(db: Session = Depends(get_db)):
     if "error" in result:
         raise HTTPException(status_code=500, detail=result["error"])
     
-    # Store trends in database
-    stored_trends = []
-    for trend_data in result.get("trends", []):
-        trend_create = schemas.TrendItemCreate(
+    # Store the whole batch in one upsert; re-seen urls get fresh engagement
+    trends = result.get("trends", [])
+    trend_creates = [
+        schemas.TrendItemCreate(
             source=trend_data["source"],
             topic=trend_data["topic"],
-            url=trend_data.get("url", f"https://{trend_data['source']}.com/search?q={trend_data['topic']}"),
+            url=trend_url(trend_data),
             author=trend_data["author"],
             text=trend_data["text"],
             like_count=trend_data["engagement"].get("likes", 0),
@@ -193,43 +331,64 @@ async def refresh_trends(db: Session = Depends(get_db)):
             score=trend_data["score"],
             raw_json=trend_data
         )
-        
-        stored_trend = crud.create_trend_item(db, trend_create)
-        stored_trends.append(stored_trend)
+        for trend_data in trends
+    ]
+    trend_ids = await crud.upsert_trend_items(db, trend_creates)
     
     return {
         "message": "Trends refreshed successfully",
-        "trends": stored_trends,
-        "count": len(stored_trends)
+        "trends": [
+            {**trend_data, "id": trend_id, "url": trend_create.url}
+            for trend_data, trend_create, trend_id in zip(trends, trend_creates, trend_ids)
+        ],
+        "trend_ids": trend_ids,
+        "count": len(trend_ids)
+    }
+
+@router.post("/generate_ideas/submit", status_code=202)
+async def submit_generate_ideas(
+    persona: str,
+    brand_rules: str,
+    platforms: List[str],
+    ai_type: str = "text"
+):
+    """Queue idea generation on the agent and return a workflow id to poll"""
+    agent_data = {
+        "persona": persona,
+        "brand_rules": brand_rules,
+        "platforms": platforms,
+        "ai_type": ai_type
     }
+    
+    result = await call_agent_service("workflows", agent_data)
+    
+    if "error" in result:
+        raise HTTPException(status_code=result.get("status_code", 500), detail=result["error"])
+    
+    return result
 
 @router.get("/workflow_status/{workflow_id}")
 async def get_workflow_status(workflow_id: str):
     """Get the status of a running workflow"""
-    # Mock workflow status
-    return {
-        "workflow_id": workflow_id,
-        "status": "completed",
-        "progress": 100,
-        "current_step": "scheduler_suggest",
-        "results": {
-            "ideas_generated": 2,
-            "platforms_targeted": 3,
-            "scheduled_posts": 6
-        }
-    }
+    result = await call_agent_service(f"workflow_status/{workflow_id}", method="GET")
+    
+    # A failed workflow still has a status record; only relay transport errors
+    if "error" in result and "status" not in result:
+        raise HTTPException(status_code=result.get("status_code", 500), detail=result["error"])
+    
+    return result
 
 @router.post("/approve_idea/{idea_id}")
-async def approve_idea(idea_id: int, db: Session = Depends(get_db)):
+async def approve_idea(idea_id: int, db: AsyncSession = Depends(get_async_db)):
     """Approve a generated idea"""
-    idea = db.query(crud.models.Idea).filter(crud.models.Idea.id == idea_id).first()
+    idea = await crud.get_idea(db, idea_id)
     
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
     
     idea.status = "approved"
-    db.commit()
-    db.refresh(idea)
+    await db.commit()
+    await db.refresh(idea)
     
     return {
         "message": "Idea approved successfully",
@@ -242,10 +401,10 @@ async def schedule_idea(
     platform: str,
     scheduled_for: str,
     timezone: str = "UTC",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Schedule an approved idea for publishing"""
-    idea = db.query(crud.models.Idea).filter(crud.models.Idea.id == idea_id).first()
+    idea = await crud.get_idea(db, idea_id)
     
     if not idea:
         raise HTTPException(status_code=404, detail="Idea not found")
@@ -264,7 +423,7 @@ async def schedule_idea(
     
     # In a real implementation, store in Schedule table
     idea.status = "scheduled"
-    db.commit()
+    await db.commit()
     
     return {
         "message": "Idea scheduled successfully",
@@ -1,51 +1,225 @@
-from sqlalchemy.orm import Session
+import json
+import base64
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from sqlalchemy import String, insert, select, tuple_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.dialects import postgresql, sqlite
 from . import models, schemas
 
-def get_account(db: Session, account_id: int):
-    return db.query(models.Account).filter(models.Account.id == account_id).first()
+# Columns a re-ingested trend refreshes; identity and first capture time are kept
+TREND_UPSERT_COLUMNS = ("like_count", "reshare_count", "comment_count", "score", "raw_json")
 
-def get_accounts(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Account).offset(skip).limit(limit).all()
+async def get_account(db: AsyncSession, account_id: int):
+    return await db.get(models.Account, account_id)
 
-def create_account(db: Session, account: schemas.AccountCreate):
+async def get_accounts(db: AsyncSession, skip: int = 0, limit: int = 100):
+    result = await db.scalars(select(models.Account).offset(skip).limit(limit))
+    return result.all()
+
+async def get_user_accounts(db: AsyncSession, user_id: str, platform: Optional[str] = None):
+    query = select(models.Account).where(models.Account.user_id == user_id)
+    if platform:
+        query = query.where(models.Account.platform == platform)
+    result = await db.scalars(query)
+    return result.all()
+
+async def create_account(db: AsyncSession, account: schemas.AccountCreate):
     db_account = models.Account(**account.dict())
     db.add(db_account)
-    db.commit()
-    db.refresh(db_account)
+    await db.commit()
+    await db.refresh(db_account)
     return db_account
 
-def get_trend_items(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.TrendItem).offset(skip).limit(limit).all()
+def encode_cursor(*values: Any) -> str:
+    """Opaque page cursor holding the sort key of the last row served"""
+    payload = json.dumps(values, default=str).encode("utf-8")
+    return base64.urlsafe_b64encode(payload).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Inverse of encode_cursor; raises ValueError for a malformed cursor"""
+    values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    if not isinstance(values, list) or len(values) != 2:
+        raise ValueError("Malformed cursor")
+    return values
+
+async def get_trend_items(
+    db: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    source: Optional[str] = None,
+    topic: Optional[str] = None
+) -> Tuple[List[models.TrendItem], Optional[str]]:
+    """Highest-scoring trends first, one keyset page at a time
+
+    Returns the page and the cursor for the next one (None on the last
+    page). Seeking past the cursor's (score, id) uses the composite
+    indexes, so every page costs the same however deep it is.
+    """
+    query = select(models.TrendItem)
+    if source:
+        query = query.where(models.TrendItem.source == source)
+    if topic:
+        query = query.where(models.TrendItem.topic == topic)
+    if cursor:
+        score, trend_id = decode_cursor(cursor)
+        query = query.where(tuple_(models.TrendItem.score, models.TrendItem.id) < tuple_(score, trend_id))
 
-def create_trend_item(db: Session, item: schemas.TrendItemCreate):
+    result = await db.scalars(
+        query.order_by(models.TrendItem.score.desc(), models.TrendItem.id.desc()).limit(limit + 1)
+    )
+    items = result.all()
+    if len(items) <= limit:
+        return items, None
+    last = items[limit - 1]
+    return items[:limit], encode_cursor(last.score, last.id)
+
+async def create_trend_item(db: AsyncSession, item: schemas.TrendItemCreate):
     db_item = models.TrendItem(**item.dict())
     db.add(db_item)
-    db.commit()
-    db.refresh(db_item)
+    await db.commit()
+    await db.refresh(db_item)
     return db_item
 
-def get_ideas(db: Session, skip: int = 0, limit: int = 100):
-    return db.query(models.Idea).offset(skip).limit(limit).all()
+async def upsert_trend_items(db: AsyncSession, items: List[schemas.TrendItemCreate]) -> List[int]:
+    """Insert or update a batch of trends by url in one transaction; returns ids in input order
+
+    Rows go out as multi-row INSERT ... ON CONFLICT (url) DO UPDATE ...
+    RETURNING statements, so a batch costs a handful of round trips rather
+    than one insert and one refresh per row. Within a batch the last item
+    for a url wins.
+    """
+    rows = {item.url: item.dict() for item in items}
+    if not rows:
+        return []
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("sqlite", "postgresql"):
+        upsert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+        stmt = upsert(models.TrendItem)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[models.TrendItem.url],
+            set_={column: stmt.excluded[column] for column in TREND_UPSERT_COLUMNS}
+        ).returning(models.TrendItem.id, models.TrendItem.url)
+        result = await db.execute(stmt, list(rows.values()))
+        ids = {url: trend_id for trend_id, url in result}
+    else:
+        # No portable upsert: update the urls that exist, insert the rest
+        result = await db.scalars(select(models.TrendItem).where(models.TrendItem.url.in_(list(rows))))
+        existing = {trend.url: trend for trend in result}
+        for url, row in rows.items():
+            if url in existing:
+                for column in TREND_UPSERT_COLUMNS:
+                    setattr(existing[url], column, row[column])
+            else:
+                existing[url] = models.TrendItem(**row)
+                db.add(existing[url])
+        await db.flush()
+        ids = {url: trend.id for url, trend in existing.items()}
+
+    await db.commit()
+    return [ids[item.url] for item in items]
 
-def create_idea(db: Session, idea: schemas.IdeaCreate):
+async def get_ideas(
+    db: AsyncSession,
+    limit: int = 100,
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    platform: Optional[str] = None
+) -> Tuple[List[models.Idea], Optional[str]]:
+    """Newest ideas first, one keyset page at a time; see get_trend_items"""
+    # SQLite stores the created_at default as 'YYYY-MM-DD HH:MM:SS' text while
+    # bound datetimes carry microseconds, so there the stored text is the key
+    raw_text = db.get_bind().dialect.name == "sqlite"
+    created_at = type_coerce(models.Idea.created_at, String) if raw_text else models.Idea.created_at
+
+    query = select(models.Idea, created_at.label("created_at_key"))
+    if status:
+        query = query.where(models.Idea.status == status)
+    if platform:
+        query = query.where(
+            models.Idea.variants.any(models.IdeaVariant.platform == platform)
+        )
+    if cursor:
+        created, idea_id = decode_cursor(cursor)
+        if not raw_text:
+            created = datetime.fromisoformat(created)
+        query = query.where(tuple_(created_at, models.Idea.id) < tuple_(created, idea_id))
+
+    result = await db.execute(
+        query.order_by(models.Idea.created_at.desc(), models.Idea.id.desc()).limit(limit + 1)
+    )
+    rows = result.all()
+    ideas = [idea for idea, _ in rows[:limit]]
+    if len(rows) <= limit:
+        return ideas, None
+    last, last_created = rows[limit - 1]
+    return ideas, encode_cursor(last_created, last.id)
+
+async def get_idea(db: AsyncSession, idea_id: int, with_variants: bool = False):
+    options = [selectinload(models.Idea.variants)] if with_variants else []
+    return await db.get(models.Idea, idea_id, options=options)
+
+async def create_idea(db: AsyncSession, idea: schemas.IdeaCreate):
     db_idea = models.Idea(**idea.dict())
     db.add(db_idea)
-    db.commit()
-    db.refresh(db_idea)
+    await db.commit()
+    await db.refresh(db_idea)
     return db_idea
 
-def get_brand_profile(db: Session):
-    return db.query(models.BrandProfile).first()
+async def get_trend_ids_by_url(db: AsyncSession, urls: List[str]) -> Dict[str, int]:
+    """Map stored trend urls to their ids in one query"""
+    if not urls:
+        return {}
+    result = await db.execute(
+        select(models.TrendItem.id, models.TrendItem.url).where(models.TrendItem.url.in_(set(urls)))
+    )
+    return {url: trend_id for trend_id, url in result}
+
+async def create_ideas(
+    db: AsyncSession,
+    ideas: List[Tuple[schemas.IdeaCreate, List[schemas.IdeaVariantCreate]]]
+) -> List[int]:
+    """Insert ideas and their platform variants in one transaction; returns idea ids in input order
+
+    Variants are written with one executemany insert; ideas use an ordered
+    RETURNING so each variant is attached to the right idea id.
+    """
+    if not ideas:
+        return []
+
+    # Ordered RETURNING keeps ids matched to their ideas on every backend;
+    # SQLite gets there by inserting row by row inside the one transaction
+    idea_ids = list(await db.scalars(
+        insert(models.Idea).returning(models.Idea.id, sort_by_parameter_order=True),
+        [idea.dict() for idea, _ in ideas]
+    ))
+
+    variant_rows = [
+        {"idea_id": idea_id, **variant.dict()}
+        for idea_id, (_, variants) in zip(idea_ids, ideas)
+        for variant in variants
+    ]
+    if variant_rows:
+        await db.execute(insert(models.IdeaVariant), variant_rows)
+
+    await db.commit()
+    return idea_ids
+
+async def get_brand_profile(db: AsyncSession):
+    result = await db.scalars(select(models.BrandProfile).limit(1))
+    return result.first()
 
-def create_or_update_brand_profile(db: Session, profile: schemas.BrandProfileCreate):
-    db_profile = get_brand_profile(db)
+async def create_or_update_brand_profile(db: AsyncSession, profile: schemas.BrandProfileCreate):
+    db_profile = await get_brand_profile(db)
     if db_profile:
         for key, value in profile.dict().items():
             setattr(db_profile, key, value)
     else:
         db_profile = models.BrandProfile(**profile.dict())
         db.add(db_profile)
-    db.commit()
-    db.refresh(db_profile)
+    await db.commit()
+    await db.refresh(db_profile)
     return db_profile
 
@@ -1,13 +1,57 @@
 import os
-from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from .storage import storage_profile
 
 DATABASE_URL = os.environ.get("DATABASE_URL", "sqlite:///./social_agent.db")
+# Optional replica (or read-only connection) for list queries
+DATABASE_READ_URL = os.environ.get("DATABASE_READ_URL")
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False}
+# Async drivers for the sync URLs; ASYNC_DATABASE_URL overrides the derived one
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
+def async_url(url: str) -> str:
+    """Swap a database URL's driver for its asyncio counterpart"""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    return f"{ASYNC_DRIVERS.get(dialect, scheme)}{sep}{rest}"
+
+ASYNC_DATABASE_URL = os.environ.get("ASYNC_DATABASE_URL", async_url(DATABASE_URL))
+ASYNC_DATABASE_READ_URL = os.environ.get(
+    "ASYNC_DATABASE_READ_URL", async_url(DATABASE_READ_URL) if DATABASE_READ_URL else None
 )
+
+# Sync engine: schema creation at startup and scripts
+engine = storage_profile.create_engine(DATABASE_URL)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine used by the request handlers
+async_engine = storage_profile.create_async_engine(ASYNC_DATABASE_URL)
+# Rows stay readable after commit, so handlers can serialize them without a reload
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+# Read-only list queries go to the replica when one is configured, else the primary
+async_read_engine = (
+    storage_profile.create_async_engine(ASYNC_DATABASE_READ_URL) if ASYNC_DATABASE_READ_URL else async_engine
+)
+AsyncReadSessionLocal = async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
+
+API_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def upgrade_database():
+    """Bring the schema up to the latest migration (api/migrations)"""
+    from alembic import command
+    from alembic.config import Config
+
+    config = Config(os.path.join(API_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(API_DIR, "migrations"))
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
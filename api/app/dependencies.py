@@ -1,9 +1,12 @@
-from sqlalchemy.orm import Session
-from .database import SessionLocal
+from typing import AsyncIterator
+from sqlalchemy.ext.asyncio import AsyncSession
+from .database import AsyncReadSessionLocal, AsyncSessionLocal
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    """Session for read-only queries, served by the read replica when configured"""
+    async with AsyncReadSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,83 @@
+# Identical copies live in agent/app/tools/ and api/app/: each service is
+# built from its own directory (see its Dockerfile) and they share no package.
+import os
+from typing import Dict, Any
+from urllib.parse import urlsplit
+import httpx
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    # httpx only negotiates HTTP/2 when the h2 package is installed
+    HTTP2_AVAILABLE = False
+
+class HTTPClientPool:
+    """One long-lived httpx.AsyncClient per upstream host
+
+    Clients are created on first use and keep their connections alive for
+    the life of the service, so repeated calls to the same host reuse
+    TCP and TLS sessions. HTTP/2 is negotiated where the server and the
+    installed httpx support it. The service lifespan closes every client.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive_connections: int = 20,
+        keepalive_expiry: float = 30.0,
+        timeout: float = 30.0,
+        http2: bool = True
+    ):
+        self.limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        )
+        self.timeout = httpx.Timeout(timeout)
+        self.http2 = http2 and HTTP2_AVAILABLE
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    @classmethod
+    def from_env(cls) -> "HTTPClientPool":
+        """Build a pool from environment settings"""
+        return cls(
+            max_connections=int(os.environ.get("HTTP_POOL_MAX_CONNECTIONS", "100")),
+            max_keepalive_connections=int(os.environ.get("HTTP_POOL_MAX_KEEPALIVE", "20")),
+            keepalive_expiry=float(os.environ.get("HTTP_POOL_KEEPALIVE_EXPIRY", "30")),
+            timeout=float(os.environ.get("HTTP_POOL_TIMEOUT", "30")),
+            http2=os.environ.get("HTTP_POOL_HTTP2", "true").lower() == "true"
+        )
+
+    @staticmethod
+    def host_key(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{parts.scheme}://{parts.netloc}"
+
+    def client(self, base_url: str) -> httpx.AsyncClient:
+        """Shared client for the host of ``base_url``, created on first use"""
+        key = self.host_key(base_url)
+        client = self._clients.get(key)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=self.http2,
+                limits=self.limits,
+                timeout=self.timeout
+            )
+            self._clients[key] = client
+        return client
+
+    async def aclose(self):
+        """Close every client and its connections"""
+        clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                await client.aclose()
+            except Exception as e:
+                print(f"Error closing HTTP client: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {"hosts": len(self._clients), "http2": self.http2}
+
+# Shared by every outbound call of the service, closed by its lifespan
+http_pool = HTTPClientPool.from_env()
@@ -1,18 +1,29 @@
-from fastapi import FastAPI, Depends, HTTPException
+from fastapi import FastAPI, Depends, HTTPException, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
+from contextlib import asynccontextmanager
 import os
 
-from . import crud, models, schemas
-from .database import SessionLocal, engine
-from .dependencies import get_db
+from . import crud, schemas
+from .database import async_engine, async_read_engine, upgrade_database
+from .dependencies import get_async_db, get_async_read_db
+from .storage import storage_profile
 from .oauth_routes import router as oauth_router
 from .agent_routes import router as agent_router
+from .http_pool import http_pool
 
-models.Base.metadata.create_all(bind=engine)
+upgrade_database()
 
-app = FastAPI(title="Social Agent API", version="1.0.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    await http_pool.aclose()
+    await async_engine.dispose()
+    if async_read_engine is not async_engine:
+        await async_read_engine.dispose()
+
+app = FastAPI(title="Social Agent API", version="1.0.0", lifespan=lifespan)
 
 # CORS middleware
 app.add_middleware(
@@ -21,6 +32,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Include routers
@@ -30,71 +42,110 @@ app.include_router(agent_router)
 # Dependencies imported from dependencies.py
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Social Agent API"}
 
 @app.get("/health")
-def health_check():
+async def health_check():
     return {"status": "healthy"}
 
+@app.get("/health/storage")
+async def storage_health():
+    """Storage profile and connection pool state of the primary and read engines"""
+    return {
+        "primary": storage_profile.describe(async_engine),
+        "read": storage_profile.describe(async_read_engine),
+        "read_replica": async_read_engine is not async_engine
+    }
+
 # Trends endpoints
 @app.post("/trends/refresh")
-def refresh_trends(db: Session = Depends(get_db)):
+async def refresh_trends(db: AsyncSession = Depends(get_async_db)):
     """Trigger trend scrapers"""
     # TODO: Implement trend scraping
     return {"message": "Trends refresh triggered"}
 
 @app.get("/trends/list", response_model=List[schemas.TrendItem])
-def list_trends(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get list of trending items"""
-    trends = crud.get_trend_items(db, skip=skip, limit=limit)
+async def list_trends(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    source: Optional[str] = None,
+    topic: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get list of trending items, highest score first
+    
+    Pass the X-Next-Cursor header of one page as ``cursor`` to get the next.
+    """
+    try:
+        trends, next_cursor = await crud.get_trend_items(db, limit=limit, cursor=cursor, source=source, topic=topic)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return trends
 
 # Ideas endpoints
 @app.post("/ideas/generate")
-def generate_ideas(
+async def generate_ideas(
     persona: str,
     brand_rules: str,
     platforms: List[str],
     ai_type: str = "text",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate content ideas using AI"""
     # TODO: Implement idea generation with LangGraph
     return {"message": "Ideas generation triggered", "platforms": platforms}
 
 @app.get("/ideas/list", response_model=List[schemas.Idea])
-def list_ideas(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
-    """Get list of ideas"""
-    ideas = crud.get_ideas(db, skip=skip, limit=limit)
+async def list_ideas(
+    response: Response,
+    limit: int = Query(100, ge=1, le=500),
+    cursor: Optional[str] = None,
+    status: Optional[str] = None,
+    platform: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_read_db)
+):
+    """Get list of ideas, newest first
+    
+    Pass the X-Next-Cursor header of one page as ``cursor`` to get the next.
+    """
+    try:
+        ideas, next_cursor = await crud.get_ideas(db, limit=limit, cursor=cursor, status=status, platform=platform)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return ideas
 
-@app.get("/ideas/{idea_id}", response_model=schemas.Idea)
-def get_idea(idea_id: int, db: Session = Depends(get_db)):
+@app.get("/ideas/{idea_id}", response_model=schemas.IdeaWithVariants)
+async def get_idea(idea_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get specific idea"""
-    idea = db.query(models.Idea).filter(models.Idea.id == idea_id).first()
+    idea = await crud.get_idea(db, idea_id, with_variants=True)
     if idea is None:
         raise HTTPException(status_code=404, detail="Idea not found")
     return idea
 
 @app.post("/ideas/{idea_id}/approve")
-def approve_idea(idea_id: int, db: Session = Depends(get_db)):
+async def approve_idea(idea_id: int, db: AsyncSession = Depends(get_async_db)):
     """Approve an idea"""
-    idea = db.query(models.Idea).filter(models.Idea.id == idea_id).first()
+    idea = await crud.get_idea(db, idea_id)
     if idea is None:
         raise HTTPException(status_code=404, detail="Idea not found")
     idea.status = "approved"
-    db.commit()
+    await db.commit()
     return {"message": "Idea approved"}
 
 # Schedule endpoints
 @app.post("/schedule/create")
-def create_schedule(
+async def create_schedule(
     idea_id: int,
     platform: str,
     scheduled_for: str,
     timezone: str = "UTC",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Schedule an idea for publishing"""
     # TODO: Implement scheduling logic
@@ -102,23 +153,23 @@ def create_schedule(
 
 # Publishing endpoints
 @app.post("/publish/run")
-def run_publisher(db: Session = Depends(get_db)):
+async def run_publisher(db: AsyncSession = Depends(get_async_db)):
     """Manual run for due publishing jobs"""
     # TODO: Implement publishing logic
     return {"message": "Publisher run triggered"}
 
 # Analytics endpoints
 @app.post("/analytics/refresh")
-def refresh_analytics(db: Session = Depends(get_db)):
+async def refresh_analytics(db: AsyncSession = Depends(get_async_db)):
     """Pull latest post metrics"""
     # TODO: Implement analytics refresh
     return {"message": "Analytics refresh triggered"}
 
 # Brand profile endpoints
 @app.get("/config/brand", response_model=schemas.BrandProfile)
-def get_brand_config(db: Session = Depends(get_db)):
+async def get_brand_config(db: AsyncSession = Depends(get_async_db)):
     """Get brand configuration"""
-    profile = crud.get_brand_profile(db)
+    profile = await crud.get_brand_profile(db)
     if profile is None:
         # Return default profile
         return schemas.BrandProfile(
@@ -130,42 +181,42 @@ def get_brand_config(db: Session = Depends(get_db)):
     return profile
 
 @app.put("/config/brand", response_model=schemas.BrandProfile)
-def update_brand_config(
+async def update_brand_config(
     profile: schemas.BrandProfileCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Update brand configuration"""
-    updated_profile = crud.create_or_update_brand_profile(db, profile)
+    updated_profile = await crud.create_or_update_brand_profile(db, profile)
     return updated_profile
 
 # OAuth endpoints (placeholders)
 @app.get("/auth/x/login")
-def x_login():
+async def x_login():
     """X (Twitter) OAuth login"""
     return {"auth_url": "https://twitter.com/oauth/authorize"}
 
 @app.get("/auth/x/callback")
-def x_callback(code: str):
+async def x_callback(code: str):
     """X (Twitter) OAuth callback"""
     return {"message": "X authentication successful"}
 
 @app.get("/auth/instagram/login")
-def instagram_login():
+async def instagram_login():
     """Instagram OAuth login"""
     return {"auth_url": "https://api.instagram.com/oauth/authorize"}
 
 @app.get("/auth/instagram/callback")
-def instagram_callback(code: str):
+async def instagram_callback(code: str):
     """Instagram OAuth callback"""
     return {"message": "Instagram authentication successful"}
 
 @app.get("/auth/linkedin/login")
-def linkedin_login():
+async def linkedin_login():
     """LinkedIn OAuth login"""
     return {"auth_url": "https://www.linkedin.com/oauth/v2/authorization"}
 
 @app.get("/auth/linkedin/callback")
-def linkedin_callback(code: str):
+async def linkedin_callback(code: str):
     """LinkedIn OAuth callback"""
     return {"message": "LinkedIn authentication successful"}
 
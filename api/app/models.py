@@ -8,6 +8,7 @@ from sqlalchemy import (
     ForeignKey,
     Text,
     Boolean,
+    Index,
 )
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -42,6 +43,13 @@ class TrendItem(Base):
     captured_at = Column(DateTime(timezone=True), server_default=func.now())
     raw_json = Column(JSON)
 
+    # Keyset pagination walks (score, id), optionally within one source or topic
+    __table_args__ = (
+        Index("ix_trend_items_score_id", "score", "id"),
+        Index("ix_trend_items_source_score_id", "source", "score", "id"),
+        Index("ix_trend_items_topic_score_id", "topic", "score", "id"),
+    )
+
 
 class Idea(Base):
     __tablename__ = "ideas"
@@ -50,6 +58,9 @@ class Idea(Base):
     trend_id = Column(Integer, ForeignKey("trend_items.id"), nullable=True)
     title = Column(String)
     summary = Column(Text)
+    hook = Column(Text)
+    caption = Column(Text)
+    hashtags = Column(JSON)
     persona = Column(Text)
     brand_rules = Column(Text)
     ai_type = Column(String, default="text")
@@ -60,6 +71,32 @@ class Idea(Base):
 
     trend = relationship("TrendItem")
     assets = relationship("Asset", back_populates="idea")
+    variants = relationship("IdeaVariant", back_populates="idea")
+
+    # Keyset pagination walks (created_at, id), optionally within one status
+    __table_args__ = (
+        Index("ix_ideas_created_at_id", "created_at", "id"),
+        Index("ix_ideas_status_created_at_id", "status", "created_at", "id"),
+    )
+
+
+class IdeaVariant(Base):
+    __tablename__ = "idea_variants"
+
+    id = Column(Integer, primary_key=True, index=True)
+    idea_id = Column(Integer, ForeignKey("ideas.id"), index=True)
+    platform = Column(String)
+    caption = Column(Text)
+    hashtags = Column(JSON)
+    meta_json = Column(JSON)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    idea = relationship("Idea", back_populates="variants")
+
+    # Platform filter on the ideas list: EXISTS (... platform = ? AND idea_id = ideas.id)
+    __table_args__ = (
+        Index("ix_idea_variants_platform_idea_id", "platform", "idea_id"),
+    )
 
 
 class Asset(Base):
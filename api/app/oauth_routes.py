@@ -1,8 +1,8 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Dict, Any
 from . import crud, schemas
-from .dependencies import get_db
+from .dependencies import get_async_db, get_async_read_db
 from .auth import oauth_manager
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
@@ -22,7 +22,7 @@ async def x_callback(
     code: str = Query(...),
     state: str = Query(...),
     user_id: str = "demo-user",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Handle X OAuth callback"""
     result = await oauth_manager.handle_x_callback(code, state, user_id)
@@ -38,18 +38,16 @@ async def x_callback(
     )
     
     # Check if account already exists
-    existing_account = db.query(crud.models.Account).filter(
-        crud.models.Account.user_id == user_id,
-        crud.models.Account.platform == "x"
-    ).first()
+    existing_accounts = await crud.get_user_accounts(db, user_id, "x")
     
-    if existing_account:
+    if existing_accounts:
+        existing_account = existing_accounts[0]
         existing_account.oauth_json = account_data.oauth_json
-        db.commit()
-        db.refresh(existing_account)
+        await db.commit()
+        await db.refresh(existing_account)
         account = existing_account
     else:
-        account = crud.create_account(db, account_data)
+        account = await crud.create_account(db, account_data)
     
     return {
         "message": "X authentication successful",
@@ -72,7 +70,7 @@ async def instagram_callback(
     code: str = Query(...),
     state: str = Query(...),
     user_id: str = "demo-user",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Handle Instagram OAuth callback"""
     result = await oauth_manager.handle_instagram_callback(code, state, user_id)
@@ -88,18 +86,16 @@ async def instagram_callback(
     )
     
     # Check if account already exists
-    existing_account = db.query(crud.models.Account).filter(
-        crud.models.Account.user_id == user_id,
-        crud.models.Account.platform == "instagram"
-    ).first()
+    existing_accounts = await crud.get_user_accounts(db, user_id, "instagram")
     
-    if existing_account:
+    if existing_accounts:
+        existing_account = existing_accounts[0]
         existing_account.oauth_json = account_data.oauth_json
-        db.commit()
-        db.refresh(existing_account)
+        await db.commit()
+        await db.refresh(existing_account)
         account = existing_account
     else:
-        account = crud.create_account(db, account_data)
+        account = await crud.create_account(db, account_data)
     
     return {
         "message": "Instagram authentication successful",
@@ -122,7 +118,7 @@ async def linkedin_callback(
     code: str = Query(...),
     state: str = Query(...),
     user_id: str = "demo-user",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Handle LinkedIn OAuth callback"""
     result = await oauth_manager.handle_linkedin_callback(code, state, user_id)
@@ -138,18 +134,16 @@ async def linkedin_callback(
     )
     
     # Check if account already exists
-    existing_account = db.query(crud.models.Account).filter(
-        crud.models.Account.user_id == user_id,
-        crud.models.Account.platform == "linkedin"
-    ).first()
+    existing_accounts = await crud.get_user_accounts(db, user_id, "linkedin")
     
-    if existing_account:
+    if existing_accounts:
+        existing_account = existing_accounts[0]
         existing_account.oauth_json = account_data.oauth_json
-        db.commit()
-        db.refresh(existing_account)
+        await db.commit()
+        await db.refresh(existing_account)
         account = existing_account
     else:
-        account = crud.create_account(db, account_data)
+        account = await crud.create_account(db, account_data)
     
     return {
         "message": "LinkedIn authentication successful",
@@ -160,12 +154,10 @@ async def linkedin_callback(
 @router.get("/accounts")
 async def get_connected_accounts(
     user_id: str = "demo-user",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_read_db)
 ):
     """Get all connected accounts for a user"""
-    accounts = db.query(crud.models.Account).filter(
-        crud.models.Account.user_id == user_id
-    ).all()
+    accounts = await crud.get_user_accounts(db, user_id)
     
     account_list = []
     for account in accounts:
@@ -182,18 +174,15 @@ async def get_connected_accounts(
 async def disconnect_account(
     account_id: int,
     user_id: str = "demo-user",
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Disconnect a social media account"""
-    account = db.query(crud.models.Account).filter(
-        crud.models.Account.id == account_id,
-        crud.models.Account.user_id == user_id
-    ).first()
+    account = await crud.get_account(db, account_id)
     
-    if not account:
+    if not account or account.user_id != user_id:
         raise HTTPException(status_code=404, detail="Account not found")
     
-    db.delete(account)
-    db.commit()
+    await db.delete(account)
+    await db.commit()
     
     return {"message": f"{account.platform} account disconnected successfully"}
@@ -42,6 +42,9 @@ class TrendItem(TrendItemBase):
 class IdeaBase(BaseModel):
     title: str
     summary: str
+    hook: Optional[str] = None
+    caption: Optional[str] = None
+    hashtags: Optional[List[str]] = None
     persona: str
     brand_rules: str
     ai_type: str = "text"
@@ -59,6 +62,26 @@ class Idea(IdeaBase):
     class Config:
         from_attributes = True
 
+class IdeaVariantBase(BaseModel):
+    platform: str
+    caption: Optional[str] = None
+    hashtags: Optional[List[str]] = None
+    meta_json: Optional[Dict[str, Any]] = None
+
+class IdeaVariantCreate(IdeaVariantBase):
+    pass
+
+class IdeaVariant(IdeaVariantBase):
+    id: int
+    idea_id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+class IdeaWithVariants(Idea):
+    variants: List[IdeaVariant] = []
+
 class AssetBase(BaseModel):
     idea_id: int
     kind: str
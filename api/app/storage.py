@@ -0,0 +1,136 @@
+import os
+from typing import Dict, Any
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+# "auto" tunes each engine for its backend; "off" keeps driver defaults
+PROFILES = ("auto", "off")
+
+class StorageProfile:
+    """Connection tuning applied to every engine the API creates
+
+    SQLite connections get WAL journaling (readers no longer block the
+    writer), ``synchronous=NORMAL``, a memory-mapped read window, a busy
+    timeout so writers queue instead of failing with "database is locked",
+    and a larger page cache, all set as each connection opens. Server
+    databases get a sized connection pool with overflow, pre-ping to drop
+    dead connections, and periodic recycling.
+    """
+
+    def __init__(
+        self,
+        profile: str = "auto",
+        sqlite_journal_mode: str = "WAL",
+        sqlite_synchronous: str = "NORMAL",
+        sqlite_mmap_size: int = 256 * 1024 * 1024,
+        sqlite_busy_timeout_ms: int = 5000,
+        sqlite_cache_size_kb: int = 64 * 1024,
+        pool_size: int = 10,
+        max_overflow: int = 20,
+        pool_pre_ping: bool = True,
+        pool_recycle: int = 1800,
+        pool_timeout: float = 30.0
+    ):
+        if profile not in PROFILES:
+            raise ValueError(f"Unknown storage profile {profile!r}; expected one of {PROFILES}")
+        self.profile = profile
+        self.sqlite_journal_mode = sqlite_journal_mode
+        self.sqlite_synchronous = sqlite_synchronous
+        self.sqlite_mmap_size = sqlite_mmap_size
+        self.sqlite_busy_timeout_ms = sqlite_busy_timeout_ms
+        self.sqlite_cache_size_kb = sqlite_cache_size_kb
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_pre_ping = pool_pre_ping
+        self.pool_recycle = pool_recycle
+        self.pool_timeout = pool_timeout
+
+    @classmethod
+    def from_env(cls) -> "StorageProfile":
+        """Build a profile from environment settings"""
+        return cls(
+            profile=os.environ.get("DB_STORAGE_PROFILE", "auto").lower(),
+            sqlite_journal_mode=os.environ.get("SQLITE_JOURNAL_MODE", "WAL"),
+            sqlite_synchronous=os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+            sqlite_mmap_size=int(os.environ.get("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+            sqlite_busy_timeout_ms=int(os.environ.get("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+            sqlite_cache_size_kb=int(os.environ.get("SQLITE_CACHE_SIZE_KB", str(64 * 1024))),
+            pool_size=int(os.environ.get("DB_POOL_SIZE", "10")),
+            max_overflow=int(os.environ.get("DB_MAX_OVERFLOW", "20")),
+            pool_pre_ping=os.environ.get("DB_POOL_PRE_PING", "true").lower() == "true",
+            pool_recycle=int(os.environ.get("DB_POOL_RECYCLE", "1800")),
+            pool_timeout=float(os.environ.get("DB_POOL_TIMEOUT", "30"))
+        )
+
+    def sqlite_pragmas(self) -> Dict[str, Any]:
+        # A negative cache_size is in KiB rather than pages
+        return {
+            "journal_mode": self.sqlite_journal_mode,
+            "synchronous": self.sqlite_synchronous,
+            "mmap_size": self.sqlite_mmap_size,
+            "busy_timeout": self.sqlite_busy_timeout_ms,
+            "cache_size": -self.sqlite_cache_size_kb,
+        }
+
+    def engine_kwargs(self, url: str, is_async: bool = False) -> Dict[str, Any]:
+        """create_engine arguments for this URL's backend"""
+        parsed = make_url(url)
+        kwargs: Dict[str, Any] = {}
+        if parsed.get_backend_name() == "sqlite":
+            if not is_async:
+                # Connections are handed between FastAPI's worker threads
+                kwargs["connect_args"] = {"check_same_thread": False}
+            elif self.profile == "auto" and parsed.database not in (None, "", ":memory:"):
+                # aiosqlite defaults to opening a connection per checkout; keep
+                # them so the PRAGMAs and page cache outlive a single request
+                kwargs.update(poolclass=AsyncAdaptedQueuePool, pool_size=self.pool_size, max_overflow=self.max_overflow)
+        elif self.profile == "auto":
+            kwargs.update(
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
+                pool_pre_ping=self.pool_pre_ping,
+                pool_recycle=self.pool_recycle,
+                pool_timeout=self.pool_timeout
+            )
+        return kwargs
+
+    def install(self, engine: Engine):
+        """Apply the SQLite PRAGMAs to every new connection of a sync engine"""
+        if self.profile != "auto" or engine.dialect.name != "sqlite":
+            return
+        pragmas = self.sqlite_pragmas()
+
+        @event.listens_for(engine, "connect")
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            try:
+                for name, value in pragmas.items():
+                    cursor.execute(f"PRAGMA {name}={value}")
+            finally:
+                cursor.close()
+
+    def create_engine(self, url: str) -> Engine:
+        engine = create_engine(url, **self.engine_kwargs(url))
+        self.install(engine)
+        return engine
+
+    def create_async_engine(self, url: str) -> AsyncEngine:
+        engine = create_async_engine(url, **self.engine_kwargs(url, is_async=True))
+        self.install(engine.sync_engine)
+        return engine
+
+    def describe(self, engine: Any) -> Dict[str, Any]:
+        """Effective settings and pool state of an engine, for health checks"""
+        sync_engine = getattr(engine, "sync_engine", engine)
+        info: Dict[str, Any] = {
+            "profile": self.profile,
+            "backend": sync_engine.dialect.name,
+            "pool": sync_engine.pool.status()
+        }
+        if self.profile == "auto" and sync_engine.dialect.name == "sqlite":
+            info["pragmas"] = self.sqlite_pragmas()
+        return info
+
+storage_profile = StorageProfile.from_env()
@@ -0,0 +1,34 @@
+import os
+import sys
+from logging.config import fileConfig
+from alembic import context
+from sqlalchemy import create_engine
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.database import DATABASE_URL, Base  # noqa: E402
+from app import models  # noqa: E402,F401
+
+config = context.config
+target_metadata = Base.metadata
+
+def run_migrations(connection):
+    context.configure(
+        connection=connection,
+        target_metadata=target_metadata,
+        # SQLite can only alter tables by copying them
+        render_as_batch=connection.dialect.name == "sqlite"
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+# app.database.upgrade_database hands over a connection; the CLI does not
+connection = config.attributes.get("connection")
+if connection is not None:
+    run_migrations(connection)
+else:
+    if config.config_file_name is not None:
+        fileConfig(config.config_file_name)
+    engine = create_engine(DATABASE_URL)
+    with engine.connect() as connection:
+        run_migrations(connection)
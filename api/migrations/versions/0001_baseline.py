@@ -0,0 +1,134 @@
+"""Baseline schema
+
+Databases created by Base.metadata.create_all before migrations existed
+already have these tables, so only missing ones are created.
+
+Revision ID: 0001
+Revises:
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def _id_column():
+    return sa.Column("id", sa.Integer(), primary_key=True, nullable=False)
+
+
+TABLES = {
+    "accounts": lambda: op.create_table(
+        "accounts",
+        _id_column(),
+        sa.Column("user_id", sa.String()),
+        sa.Column("platform", sa.String()),
+        sa.Column("oauth_json", sa.JSON()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    ),
+    "trend_items": lambda: op.create_table(
+        "trend_items",
+        _id_column(),
+        sa.Column("source", sa.String()),
+        sa.Column("topic", sa.String()),
+        sa.Column("url", sa.String(), unique=True),
+        sa.Column("author", sa.String()),
+        sa.Column("text", sa.Text()),
+        sa.Column("media_url", sa.String()),
+        sa.Column("like_count", sa.Integer()),
+        sa.Column("reshare_count", sa.Integer()),
+        sa.Column("comment_count", sa.Integer()),
+        sa.Column("score", sa.Float()),
+        sa.Column("captured_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("raw_json", sa.JSON()),
+    ),
+    "ideas": lambda: op.create_table(
+        "ideas",
+        _id_column(),
+        sa.Column("trend_id", sa.Integer(), sa.ForeignKey("trend_items.id")),
+        sa.Column("title", sa.String()),
+        sa.Column("summary", sa.Text()),
+        sa.Column("persona", sa.Text()),
+        sa.Column("brand_rules", sa.Text()),
+        sa.Column("ai_type", sa.String()),
+        sa.Column("status", sa.String()),
+        sa.Column("platform_targets", sa.JSON()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    ),
+    "assets": lambda: op.create_table(
+        "assets",
+        _id_column(),
+        sa.Column("idea_id", sa.Integer(), sa.ForeignKey("ideas.id")),
+        sa.Column("kind", sa.String()),
+        sa.Column("uri", sa.String()),
+        sa.Column("meta_json", sa.JSON()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    ),
+    "posts": lambda: op.create_table(
+        "posts",
+        _id_column(),
+        sa.Column("idea_id", sa.Integer(), sa.ForeignKey("ideas.id")),
+        sa.Column("platform", sa.String()),
+        sa.Column("external_id", sa.String(), unique=True),
+        sa.Column("permalink", sa.String()),
+        sa.Column("posted_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("metrics_json", sa.JSON()),
+    ),
+    "schedule": lambda: op.create_table(
+        "schedule",
+        _id_column(),
+        sa.Column("idea_id", sa.Integer(), sa.ForeignKey("ideas.id")),
+        sa.Column("platform", sa.String()),
+        sa.Column("scheduled_for", sa.DateTime(timezone=True)),
+        sa.Column("timezone", sa.String()),
+        sa.Column("status", sa.String()),
+        sa.Column("post_id", sa.Integer(), sa.ForeignKey("posts.id")),
+        sa.Column("error", sa.Text()),
+    ),
+    "metrics_snapshots": lambda: op.create_table(
+        "metrics_snapshots",
+        _id_column(),
+        sa.Column("platform", sa.String()),
+        sa.Column("external_id", sa.String()),
+        sa.Column("snapshot_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("metrics_json", sa.JSON()),
+    ),
+    "brand_profile": lambda: op.create_table(
+        "brand_profile",
+        _id_column(),
+        sa.Column("persona", sa.Text()),
+        sa.Column("brand_rules", sa.Text()),
+        sa.Column("default_hashtags", sa.Text()),
+    ),
+}
+
+# Single-column indexes the models declare with index=True
+INDEXES = {
+    "accounts": ["id", "user_id", "platform"],
+    "trend_items": ["id", "source", "topic"],
+    "ideas": ["id", "status"],
+    "assets": ["id"],
+    "posts": ["id"],
+    "schedule": ["id", "status"],
+    "metrics_snapshots": ["id"],
+    "brand_profile": ["id"],
+}
+
+
+def upgrade():
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+    for table, create in TABLES.items():
+        if table in existing:
+            continue
+        create()
+        for column in INDEXES[table]:
+            op.create_index(f"ix_{table}_{column}", table, [column])
+
+
+def downgrade():
+    for table in reversed(list(TABLES)):
+        op.drop_table(table)
@@ -0,0 +1,40 @@
+"""Keep generated idea content and per-platform variants
+
+Revision ID: 0002
+Revises: 0001
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("ideas") as batch:
+        batch.add_column(sa.Column("hook", sa.Text()))
+        batch.add_column(sa.Column("caption", sa.Text()))
+        batch.add_column(sa.Column("hashtags", sa.JSON()))
+
+    op.create_table(
+        "idea_variants",
+        sa.Column("id", sa.Integer(), primary_key=True, nullable=False),
+        sa.Column("idea_id", sa.Integer(), sa.ForeignKey("ideas.id")),
+        sa.Column("platform", sa.String()),
+        sa.Column("caption", sa.Text()),
+        sa.Column("hashtags", sa.JSON()),
+        sa.Column("meta_json", sa.JSON()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_idea_variants_id", "idea_variants", ["id"])
+    op.create_index("ix_idea_variants_idea_id", "idea_variants", ["idea_id"])
+
+
+def downgrade():
+    op.drop_table("idea_variants")
+    with op.batch_alter_table("ideas") as batch:
+        batch.drop_column("hashtags")
+        batch.drop_column("caption")
+        batch.drop_column("hook")
@@ -0,0 +1,30 @@
+"""Composite indexes for keyset pagination of trends and ideas
+
+Revision ID: 0003
+Revises: 0002
+"""
+from alembic import op
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ("ix_trend_items_score_id", "trend_items", ["score", "id"]),
+    ("ix_trend_items_source_score_id", "trend_items", ["source", "score", "id"]),
+    ("ix_trend_items_topic_score_id", "trend_items", ["topic", "score", "id"]),
+    ("ix_ideas_created_at_id", "ideas", ["created_at", "id"]),
+    ("ix_ideas_status_created_at_id", "ideas", ["status", "created_at", "id"]),
+    ("ix_idea_variants_platform_idea_id", "idea_variants", ["platform", "idea_id"]),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
@@ -0,0 +1,25 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The engines are built at import time, so point them at a scratch database first
+_scratch = tempfile.mkdtemp(prefix="social-agent-api-tests-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_scratch, 'test.db')}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ.pop("DATABASE_READ_URL", None)
+os.environ.pop("ASYNC_DATABASE_READ_URL", None)
+# Agent calls fail fast and fall back to the mock responses
+os.environ["AGENT_SERVICE_URL"] = "http://127.0.0.1:9"
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    import asyncio
+    from app.database import async_engine, upgrade_database
+    upgrade_database()
+    yield
+    # Pooled aiosqlite connections run on non-daemon threads
+    asyncio.run(async_engine.dispose())
@@ -0,0 +1,58 @@
+import json
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.http_pool import http_pool
+from app.main import app
+
+PARAMS = {"persona": "Tech creator", "brand_rules": "Be helpful"}
+PLATFORMS = ["x", "linkedin"]
+
+def test_stream_relays_agent_chunks_unchanged(monkeypatch):
+    # Deliberately not the API's own framing, so any re-encoding shows up
+    chunks = [b'{"event":"trends","data":[]}\n', b'{"event":"idea",', b'"data":{"id":1}}\n', b'{"event":"done"}\n']
+    seen = {}
+
+    def handler(request):
+        seen["url"] = str(request.url)
+        seen["accept"] = request.headers["accept"]
+        seen["body"] = json.loads(request.content)
+        return httpx.Response(200, stream=httpx.ByteStream(b"".join(chunks)))
+
+    monkeypatch.setenv("AGENT_SERVICE_URL", "http://agent.test")
+    monkeypatch.setitem(http_pool._clients, "http://agent.test", httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+
+    response = TestClient(app).post("/agent/generate_ideas/stream", params=PARAMS, json=PLATFORMS)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.content == b"".join(chunks)
+    assert seen == {
+        "url": "http://agent.test/generate_ideas/stream",
+        "accept": "application/x-ndjson",
+        "body": {**PARAMS, "platforms": PLATFORMS, "ai_type": "text"}
+    }
+
+def test_stream_falls_back_to_mock_ndjson_when_the_agent_is_unreachable():
+    response = TestClient(app).post("/agent/generate_ideas/stream", params=PARAMS, json=PLATFORMS)
+
+    events = [json.loads(line) for line in response.text.splitlines()]
+    ideas = [event for event in events if event["event"] == "idea"]
+    assert ideas
+    assert [event["event"] for event in events] == (
+        ["trends"] + ["idea"] * len(ideas) + ["repurposed_content", "schedule", "done"]
+    )
+    assert events[-1]["data"]["ideas_generated"] == len(ideas)
+
+def test_stream_falls_back_to_mock_sse_when_the_agent_is_unreachable():
+    response = TestClient(app).post(
+        "/agent/generate_ideas/stream", params=PARAMS, json=PLATFORMS, headers={"Accept": "text/event-stream"}
+    )
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    messages = [message.split("\n") for message in response.text.strip().split("\n\n")]
+    names = [lines[0][len("event: "):] for lines in messages]
+    assert names[0] == "trends" and names[-3:] == ["repurposed_content", "schedule", "done"]
+    assert set(names[1:-3]) == {"idea"}
+    assert all(lines[1].startswith("data: ") and len(lines) == 2 for lines in messages)
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import agent_routes, crud, schemas
+from app.database import AsyncSessionLocal
+from app.main import app
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        yield client
+
+def idea(title):
+    return schemas.IdeaCreate(title=title, summary="s", persona="p", brand_rules="b", platform_targets=["x"])
+
+async def stored_ideas(ideas):
+    async with AsyncSessionLocal() as db:
+        ids = await crud.create_ideas(db, ideas)
+        stored = [await crud.get_idea(db, idea_id, with_variants=True) for idea_id in ids]
+        return [(row.title, sorted(variant.caption for variant in row.variants)) for row in stored]
+
+def test_create_ideas_keeps_variants_with_their_idea(client):
+    ideas = [
+        (idea(f"idea {n}"), [schemas.IdeaVariantCreate(platform=p, caption=f"{n}/{p}") for p in ["x", "linkedin"][: n % 3]])
+        for n in range(30)
+    ]
+    assert asyncio.run(stored_ideas(ideas)) == [
+        (f"idea {n}", sorted(f"{n}/{p}" for p in ["x", "linkedin"][: n % 3])) for n in range(30)
+    ]
+
+async def store_trend(url):
+    async with AsyncSessionLocal() as db:
+        ids = await crud.upsert_trend_items(db, [schemas.TrendItemCreate(
+            source="x", topic="#Linked", url=url, author="a", text="t", score=0.5, raw_json={}
+        )])
+        return ids[0]
+
+def test_generated_ideas_link_to_trends_without_a_post_url(client, monkeypatch):
+    trend_id = asyncio.run(store_trend("https://x.com/search?q=#Linked"))
+
+    async def fake_agent(endpoint, data=None, method="POST"):
+        return {
+            "trending_context": [{"id": "agent-1", "source": "x", "topic": "#Linked"}],
+            "ideas": [{"id": "i1", "title": "t", "summary": "s", "trend_id": "agent-1"}]
+        }
+    monkeypatch.setattr(agent_routes, "call_agent_service", fake_agent)
+
+    response = client.post(
+        "/agent/generate_ideas", params={"persona": "p", "brand_rules": "b"}, json=["x"]
+    )
+    assert response.status_code == 200
+    assert response.json()["ideas"][0]["trend_id"] == trend_id
@@ -0,0 +1,37 @@
+import os
+
+import sqlalchemy as sa
+from alembic import command
+from alembic.config import Config
+
+from app.database import API_DIR
+
+def upgrade(url, revision="head"):
+    config = Config(os.path.join(API_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(API_DIR, "migrations"))
+    engine = sa.create_engine(url)
+    with engine.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, revision)
+    return engine
+
+def test_fresh_database_gets_full_schema(tmp_path):
+    engine = upgrade(f"sqlite:///{tmp_path / 'fresh.db'}")
+    inspector = sa.inspect(engine)
+
+    assert "idea_variants" in inspector.get_table_names()
+    assert {"hook", "caption", "hashtags"} <= {column["name"] for column in inspector.get_columns("ideas")}
+
+def test_pre_migration_database_is_upgraded_in_place(tmp_path):
+    url = f"sqlite:///{tmp_path / 'legacy.db'}"
+    # A database from before migrations: baseline tables, no alembic_version
+    engine = upgrade(url, "0001")
+    with engine.begin() as connection:
+        connection.execute(sa.text("DROP TABLE alembic_version"))
+        connection.execute(sa.text("INSERT INTO ideas (title, status) VALUES ('kept', 'draft')"))
+
+    engine = upgrade(url)
+
+    with engine.connect() as connection:
+        assert connection.execute(sa.text("SELECT title, hook FROM ideas")).all() == [("kept", None)]
+        assert connection.execute(sa.text("SELECT version_num FROM alembic_version")).scalar() is not None
@@ -0,0 +1,87 @@
+import asyncio
+
+import pytest
+import sqlalchemy as sa
+from fastapi.testclient import TestClient
+
+from app import crud, schemas
+from app.database import AsyncSessionLocal, engine
+from app.main import app
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as client:
+        with engine.begin() as connection:
+            for table in ("idea_variants", "ideas", "trend_items"):
+                connection.execute(sa.text(f"DELETE FROM {table}"))
+        asyncio.run(seed())
+        yield client
+
+async def seed():
+    async with AsyncSessionLocal() as db:
+        await crud.upsert_trend_items(db, [
+            schemas.TrendItemCreate(
+                source=["x", "instagram"][n % 2], topic="#AI", url=f"https://t/{n}",
+                author="a", text="t", score=(n % 7) / 7, raw_json={}
+            )
+            for n in range(250)
+        ])
+        # Same-second created_at for every idea: ties must break on id
+        await crud.create_ideas(db, [
+            (
+                schemas.IdeaCreate(
+                    title=f"idea {n}", summary="s", persona="p", brand_rules="b",
+                    platform_targets=["x"], status=["draft", "approved"][n % 2]
+                ),
+                [schemas.IdeaVariantCreate(platform="linkedin" if n % 3 == 0 else "x")]
+            )
+            for n in range(250)
+        ])
+
+def walk(client, path, **params):
+    ids, cursor = [], None
+    while True:
+        response = client.get(path, params=dict(params, limit=40, **({"cursor": cursor} if cursor else {})))
+        assert response.status_code == 200
+        ids += [row["id"] for row in response.json()]
+        cursor = response.headers.get("x-next-cursor")
+        if not cursor:
+            return ids
+
+def test_trends_walk_every_row_once_in_score_order(client):
+    ids = walk(client, "/trends/list")
+    assert len(ids) == len(set(ids)) == 250
+
+    scores = [row["score"] for row in client.get("/trends/list", params={"limit": 250}).json()]
+    assert scores == sorted(scores, reverse=True)
+
+def test_trend_filters(client):
+    assert len(walk(client, "/trends/list", source="x")) == 125
+    assert walk(client, "/trends/list", topic="#missing") == []
+
+def test_ideas_walk_every_row_once_despite_equal_timestamps(client):
+    ids = walk(client, "/ideas/list")
+    assert len(ids) == len(set(ids)) == 250
+    assert ids == sorted(ids, reverse=True)
+
+def test_idea_filters(client):
+    expected = len([n for n in range(250) if n % 2 == 1 and n % 3 == 0])
+    assert len(walk(client, "/ideas/list", status="approved", platform="linkedin")) == expected
+
+def test_malformed_cursor_is_rejected(client):
+    assert client.get("/ideas/list", params={"cursor": "not-a-cursor!"}).status_code == 400
+    assert client.get("/trends/list", params={"cursor": crud.encode_cursor(1)}).status_code == 400
+
+def test_out_of_range_limit_is_rejected(client):
+    for path in ("/trends/list", "/ideas/list"):
+        for limit in (0, -1, 501):
+            assert client.get(path, params={"limit": limit}).status_code == 422
+        assert client.get(path, params={"limit": 500}).status_code == 200
+
+def test_filtered_pages_use_the_composite_indexes(client):
+    with engine.connect() as connection:
+        plan = connection.execute(sa.text(
+            "EXPLAIN QUERY PLAN SELECT id FROM trend_items WHERE source = 'x' AND (score, id) < (0.5, 10) "
+            "ORDER BY score DESC, id DESC LIMIT 10"
+        )).all()
+    assert "ix_trend_items_source_score_id" in str(plan)
@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy import text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.storage import StorageProfile
+
+def test_sqlite_connections_get_the_pragmas(tmp_path):
+    engine = StorageProfile(sqlite_busy_timeout_ms=1234).create_engine(f"sqlite:///{tmp_path / 'p.db'}")
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert connection.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+    engine.dispose()
+
+def test_off_profile_keeps_driver_defaults(tmp_path):
+    engine = StorageProfile(profile="off").create_engine(f"sqlite:///{tmp_path / 'p.db'}")
+    with engine.connect() as connection:
+        assert connection.execute(text("PRAGMA journal_mode")).scalar() == "delete"
+    engine.dispose()
+
+def test_engine_kwargs_per_backend():
+    profile = StorageProfile(pool_size=7)
+    assert profile.engine_kwargs("sqlite:///x.db") == {"connect_args": {"check_same_thread": False}}
+    assert profile.engine_kwargs("sqlite+aiosqlite:///x.db", is_async=True)["poolclass"] is AsyncAdaptedQueuePool
+    assert profile.engine_kwargs("sqlite+aiosqlite://", is_async=True) == {}
+    assert profile.engine_kwargs("postgresql://db/app")["pool_size"] == 7
+    assert StorageProfile(profile="off").engine_kwargs("postgresql://db/app") == {}
+
+def test_unknown_profile_is_rejected():
+    with pytest.raises(ValueError):
+        StorageProfile(profile="fast")
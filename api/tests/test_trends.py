@@ -0,0 +1,40 @@
+import asyncio
+
+from sqlalchemy import select
+
+from app import crud, models, schemas
+from app.database import AsyncSessionLocal
+
+def trend(url, likes=0, score=0.1):
+    return schemas.TrendItemCreate(
+        source="x", topic="#Upsert", url=url, author="a", text=f"text {likes}",
+        like_count=likes, score=score, raw_json={"likes": likes}
+    )
+
+async def upsert(items):
+    async with AsyncSessionLocal() as db:
+        return await crud.upsert_trend_items(db, items)
+
+async def stored(url):
+    async with AsyncSessionLocal() as db:
+        rows = (await db.scalars(select(models.TrendItem).where(models.TrendItem.url == url))).all()
+        return [(row.like_count, row.score, row.raw_json) for row in rows]
+
+def test_upsert_returns_ids_in_input_order():
+    first = asyncio.run(upsert([trend("https://u/a"), trend("https://u/b")]))
+    again = asyncio.run(upsert([trend("https://u/c"), trend("https://u/b"), trend("https://u/a")]))
+    assert again[1:] == [first[1], first[0]]
+    assert len(set(again)) == 3
+
+def test_upsert_refreshes_engagement_of_seen_urls():
+    asyncio.run(upsert([trend("https://u/refresh", likes=1, score=0.1)]))
+    asyncio.run(upsert([trend("https://u/refresh", likes=50, score=0.9)]))
+    assert asyncio.run(stored("https://u/refresh")) == [(50, 0.9, {"likes": 50})]
+
+def test_last_item_wins_within_a_batch():
+    ids = asyncio.run(upsert([trend("https://u/dup", likes=1), trend("https://u/dup", likes=2)]))
+    assert ids[0] == ids[1]
+    assert asyncio.run(stored("https://u/dup")) == [(2, 0.1, {"likes": 2})]
+
+def test_empty_batch():
+    assert asyncio.run(upsert([])) == []
@@ -0,0 +1,15 @@
+from fastapi.testclient import TestClient
+
+from app.main import app
+
+def test_workflow_status_is_unavailable_without_the_agent():
+    with TestClient(app) as client:
+        response = client.get("/agent/workflow_status/anything")
+    assert response.status_code == 503
+
+def test_submitting_a_workflow_is_unavailable_without_the_agent():
+    with TestClient(app) as client:
+        response = client.post(
+            "/agent/generate_ideas/submit", params={"persona": "p", "brand_rules": "b"}, json=["x"]
+        )
+    assert response.status_code == 503